@@ -1,790 +1,4443 @@
-"""
-Author : Lakshan Jayasinghe
-Date: 23.04.2023
-Project: FASTA processor
-Inputs: Single, multiple or a multi-fasta file depending on the method.
-Outputs: Single, multiple or a multi-fasta file depending on the method.
-  Description:    This program is designed with a simple GUI and methods
-            to do the common day-to-day tasks needed by Bio-informaticians c
-            while working with FASTA sequences.
-"""
-# import necessary packages
-import tkinter as tk
-from tkinter import filedialog
-# import tkinter.filedialog as fdg
-import os
-from tkinter import messagebox
-
-
-class Fasta:
-
-    def __init__(self):
-        self.file_name = ""
-        self.file_names = ""
-        self.sequence_dictionary = {}
-
-    """------------------------------------------------- basic methods -----------------------------------------"""
-
-    def select_file(self):
-        """   method to select a fasta file       """
-
-        # Clear the output on the label
-        label1.config(text="")
-
-        self.file_name = filedialog.askopenfilename()
-
-        if self.file_name == "":
-            return "invalid"
-        elif self.file_name.split(".")[-1] != "fasta":
-            return "invalid"
-
-    def select_files(self):
-        """    method to select multiple fasta files   """
-
-        # Clear the output on the label
-        label1.config(text="")
-
-        self.file_names = filedialog.askopenfilenames()
-
-        if self.file_names == "":
-            return "invalid"
-        for file_name in self.file_names:
-            if file_name.split(".")[-1] != "fasta":
-                return "invalid"
-        """If the user has chosen only one sequence,
-                ask user to select multiple files """
-        if len(self.file_names) == 1:
-            messagebox.showerror("Input Error", "Please select more than one fasta file")
-            return "invalid"
-
-    def separate_header_and_sequence(self, file_name):
-        """
-        This method reads the given fasta file.
-        Separates all headers and sequences and
-        add them to the sequence dictionary.
-        """
-
-        # create necessary variables
-        Header = ""
-        sequence = ""
-
-        # reading the multi fasta file
-        with open(file_name, "r") as file:
-            for line in file:
-                # if the line not empty
-                if line != "\n":
-                    line = line.strip()
-                    # separating header and sequence
-                    if ">" in line:
-                        Header = line
-                        sequence = ""
-                    else:
-                        sequence += line
-                    # inserting every fasta  header and sequence(uppercase) into sequence_dictionary.
-                    self.sequence_dictionary[Header] = sequence.upper()
-
-    def create_fasta_file_name(self, Header):
-        """ Headers with ">" and ":" cause errors when tried to create files including them.
-            This method removes >,: and split the header using whitespaces.
-            This method splits filepaths using "/".
-            Then it creates the output path and fasta file's name.
-            """
-
-        if "/" in Header:
-            # This means the parameter passed by the name
-            # of Header is a filepath. It contains "/" to indicate directories
-
-            # splitting the header using forward slash.
-            new_file_name = Header.split("/")
-
-            # using only the accession number as file name
-            fasta_file_name = "Output/" + new_file_name[-1]
-        else:
-            # If "/" is not found, this parameter passed by the name
-            # of Header is actually a fasta header.
-            # remove ">" from header
-            Head = Header.strip(">")
-            # remove any colons
-            Head = Head.replace(":", " ")
-
-            # splitting the header using whitespaces
-            new_file_name = Head.split(" ")
-
-            # using only the accession number as file name
-            fasta_file_name = "Output/" + new_file_name[0] + ".fasta"
-
-        return fasta_file_name
-
-    def get_sequence_type(self, sequence):
-        """
-        This method checks whether the given
-        sequence in sequence dictionary is protein, RNA or DNA.
-        """
-
-        amino_acids = ["K", "N", "R", "S", "I", "M", "Q", "H", "P", "R", "L", "E", "D", "V", "Y", "S", "W", "F"]
-        # sequence_type = ""
-
-        # checking a base in sequence
-        for base in sequence:
-
-            """ If the base is in amino acids list, it is a protein."""
-            if base in amino_acids:
-                sequence_type = "protein"
-                return sequence_type
-
-            elif base == "U":
-                """ If the base is U, it is mRNA."""
-                sequence_type = "RNA"
-                return sequence_type
-
-            else:
-                """ If both above conditions aren't met, it is DNA."""
-                sequence_type = "DNA"
-                return sequence_type
-
-    """  -------------------------------------  main methods ------------------------------------------------ """
-
-    def split_multi_Fasta_file(self):
-        """
-        This method splits a given single multi-Fasta file into separate fasta files
-         containing one sequence in each.
-        """
-
-        # call the select file method but, abort running te method if returns invalid.
-        if self.select_file() == "invalid":
-            return
-
-        # calling the separate_header_and_sequence method to read the fasta file.
-        self.separate_header_and_sequence(self.file_name)
-
-        # writing Fasta sequences in dictionary to separate files.
-        for Header in self.sequence_dictionary:
-            """ get the fasta file name"""
-            fasta_file_name = self.create_fasta_file_name(Header)
-
-            with open(fasta_file_name, "w") as file:
-                # writing the header and sequence.
-                file.writelines(Header + "\n")
-                file.writelines(self.sequence_dictionary[Header] + "\n")
-
-        """ display a confirmation message about the task completion"""
-        messagebox.showinfo("Task completed!", "Please check Output folder")
-
-    def number_of_Fasta_sequences(self):
-        """
-        This method calculates the number of fasta sequences
-        in a given multi fasta file.
-        """
-        # call the select file method but, abort running te method if returns invalid.
-        if self.select_file() == "invalid":
-            return
-
-        # calling the separate_header_and_sequence method to read the fasta file.
-        self.separate_header_and_sequence(self.file_name)
-
-        # Display the number of fasta sequences on the label
-        number_of_fasta_sequences = len(self.sequence_dictionary)
-        label1.config(text="Number of fasta sequences: " + str(number_of_fasta_sequences))
-
-    def combine_multiple_Fasta_files(self):
-        """
-        This method reads a multiple fasta files  and
-        combine the sequences into a multi-fasta file.
-        """
-        # call the files selecting method but, abort running method if returns invalid.
-        if self.select_files() == "invalid":
-            return
-
-        # access the selected file list
-        for filepath in self.file_names:
-            # select one file at a time
-            # calling the separate_header_and_sequence method to read the fasta file.
-            self.separate_header_and_sequence(filepath)
-
-        # create a new fasta file.
-        with open("Output/multifasta file.fasta", "w") as file:
-
-            # writing all fasta headers and sequences to the multi-fasta file.
-            for Header in self.sequence_dictionary:
-                file.writelines(Header + "\n")
-                file.writelines(self.sequence_dictionary[Header] + "\n")
-
-        """ display a confirmation message about the task completion"""
-        messagebox.showinfo("Task completed!", "Please check Output folder")
-
-
-class Sequence(Fasta):
-
-    def remove_unwanted_from_nucleotide(self):
-        """
-        This method removes unwanted characters from fasta nucleotide sequences
-        and write them into separate fasta files.
-        """
-        bases = ["A", "T", "G", "C", "U"]
-        cleansequence = ""
-
-        # call the select file method but, abort running te method if returns invalid.
-        if self.select_file() == "invalid":
-            return
-
-        # calling the separate_header_and_sequence method to read the fasta file.
-        self.separate_header_and_sequence(self.file_name)
-
-        # select the header of one sequence
-        for Header in self.sequence_dictionary:
-            sequence = self.sequence_dictionary[Header]
-
-            # checking sequence base by base for unknown characters
-            for base in sequence:
-                if base in bases:
-                    cleansequence += base
-                else:
-                    cleansequence += ""
-
-            """ get the fasta file name"""
-            fasta_file_name = self.create_fasta_file_name(Header)
-
-            # writing the clean sequence with its header to a fasta file.
-            with open(fasta_file_name, "w") as file:
-                file.writelines(Header + "\n")
-                file.writelines(cleansequence + "\n")
-
-        """ display a confirmation message about the task completion"""
-        messagebox.showinfo("Task completed!", "Please check Output folder")
-
-    def remove_unwanted_from_protein(self):
-        """
-        This method removes unwanted characters from fasta protein sequences
-        and write them into separate fasta files.
-        """
-        # call the select file method but, abort running te method if returns invalid.
-        if self.select_file() == "invalid":
-            return
-
-        # calling the separate_header_and_sequence method to read the fasta file.
-        self.separate_header_and_sequence(self.file_name)
-
-        # select the header of a sequence
-        for Header in self.sequence_dictionary:
-            sequence = self.sequence_dictionary[Header]
-            # replace unknown characters
-            sequence = sequence.replace("X", "")
-
-            """ get the fasta file name"""
-            fasta_file_name = self.create_fasta_file_name(Header)
-
-            # writing the clean sequence with its header to a fasta file.
-            with open(fasta_file_name, "w") as file:
-                file.writelines(Header + "\n")
-                file.writelines(sequence + "\n")
-
-        """ display a confirmation message about the task completion"""
-        messagebox.showinfo("Task completed!", "Please check Output folder")
-
-    def add_sequence_length_to_header(self):
-
-        """
-        This method to calculates and append the length
-        of an input FASTA sequence to its FASTA header.
-        """
-        # call the select file method but, abort running te method if returns invalid.
-        if self.select_file() == "invalid":
-            return
-
-        # calling the separate_header_and_sequence method to read the fasta file.
-        self.separate_header_and_sequence(self.file_name)
-
-        # select the header of a sequence
-        for Header in self.sequence_dictionary:
-            sequence = self.sequence_dictionary[Header]
-
-            # calculating sequence length
-            length = len(sequence)
-
-            # set up unit of length based on the sequence type
-            if self.get_sequence_type(sequence) == "protein":
-                unit = " aa"
-            else:
-                unit = " bp"
-
-            """ get the fasta file name"""
-            fasta_file_name = self.create_fasta_file_name(Header)
-
-            # writing the sequence length appended header and sequence to a fasta file
-            with open(fasta_file_name, "w") as file:
-                file.writelines(Header + ", sequence length " + str(length) + unit + "\n")
-                file.writelines(sequence + "\n")
-
-        """ display a confirmation message about the task completion"""
-        messagebox.showinfo("Task completed!", "Please check Output folder")
-
-    def add_sequence_lengths_to_headers(self):
-
-        """
-        This method uses a multi-fasta file as the input,
-        calculates and appends the length of each sequence to the respective FASTA header
-         and write them into a new multi-fasta file.
-        """
-
-        sequence_length_dictionary = {}
-
-        # call the select file method but, abort running te method if returns invalid.
-        if self.select_file() == "invalid":
-            return
-
-        # calling the separate_header_and_sequence method to read the fasta file.
-        self.separate_header_and_sequence(self.file_name)
-
-        # select the header of a sequence
-        for Header in self.sequence_dictionary:
-            sequence = self.sequence_dictionary[Header]
-
-            # calculating sequence length
-            length = len(sequence)
-
-            # set up unit of length based on the sequence type
-            if self.get_sequence_type(sequence) == "protein":
-                unit = " aa"
-            else:
-                unit = " bp"
-
-            # creating new header with the sequence length
-            new_header = Header + ", sequence length " + str(length) + unit
-
-            # insert new headers and sequences to a dictionary.
-            sequence_length_dictionary[new_header] = sequence
-
-        """ get the fasta file name"""
-        fasta_file_name = self.create_fasta_file_name(self.file_name)
-
-        # writing the sequence length appended header and sequence to a multi-fasta file
-        with open(fasta_file_name, "w") as file:
-
-            # write one sequence at a time
-            for new_header in sequence_length_dictionary:
-                file.writelines(new_header + "\n")
-                file.writelines(sequence_length_dictionary[new_header] + "\n")
-
-        """ display a confirmation message about the task completion"""
-        messagebox.showinfo("Task completed!", "Please check Output folder")
-
-    def get_AT_content(self):
-        """
-        This method calculates the AT content of a given nucleotide sequence.
-        Then, writes the AT content added header, and sequence to a new fasta file.
-        """
-        bases = ["A", "T", "U"]
-        AT_count = 0
-        count = 0
-
-        # call the select file method but, abort running te method if returns invalid.
-        if self.select_file() == "invalid":
-            return
-
-        # calling the separate_header_and_sequence method to read the fasta file.
-        self.separate_header_and_sequence(self.file_name)
-
-        # checking whether the file has more than one sequence.
-        number_of_sequences = len(self.sequence_dictionary)
-        if number_of_sequences > 1:
-            messagebox.showerror("Sequence Number Error", "Please select one nucleotide sequence to calculate AT "
-                                                          "content")
-            return
-        else:
-            # selecting one header
-            for Header in self.sequence_dictionary:
-                sequence = self.sequence_dictionary[Header]
-                # if the sequence is a protein,
-                # display a sequence type error and exit the method.
-                if self.get_sequence_type(sequence) == "protein":
-                    messagebox.showerror("Sequence Type Error", "Please select a nucleotide sequence to calculate AT "
-                                                                "content")
-                    return
-
-                else:
-                    # counting sequence length
-                    for base in sequence:
-                        count += 1
-                        # counting AT count
-                        if base in bases:
-                            AT_count += 1
-                    """ calculate the AT content"""
-                    AT_content = AT_count / count
-
-                    # Display the output on the label
-                    label1.config(text="AT content: " + str(round(AT_content, 2)))
-
-    def get_GC_content(self):
-        """
-        This method calculates the GC content of a given fasta nucleotide sequence.
-        Then, writes the GC content added header, and sequence to a new fasta file.
-        """
-
-        bases = ["G", "C"]
-        GC_count = 0
-        count = 0
-
-        # call the select file method but, abort running te method if returns invalid.
-        if self.select_file() == "invalid":
-            return
-
-        # calling the separate_header_and_sequence method to read the fasta file.
-        self.separate_header_and_sequence(self.file_name)
-
-        # checking whether the file has more than one sequence.
-        number_of_sequences = len(self.sequence_dictionary)
-        if number_of_sequences > 1:
-            messagebox.showerror("Sequence Number Error", "Please select one nucleotide sequence to calculate GC "
-                                                          "content")
-            return
-        else:
-            # selecting one header
-            for Header in self.sequence_dictionary:
-                sequence = self.sequence_dictionary[Header]
-                # if the sequence is a protein,
-                # display a sequence type error and exit the method.
-                if self.get_sequence_type(sequence) == "protein":
-                    messagebox.showerror("Sequence Type Error", "Please select a nucleotide sequence to calculate GC "
-                                                                "content")
-                    return
-
-                else:
-                    # counting sequence length
-                    for base in self.sequence_dictionary[Header]:
-                        count += 1
-                        # counting AT count
-                        if base in bases:
-                            GC_count += 1
-                    """ calculate the GC content"""
-                    GC_content = GC_count / count
-
-                    # Display the output on the label
-                    label1.config(text="GC content: " + str(round(GC_content, 2)))
-
-    def add_content_to_header_and_write(self, content_type, sequence_type):
-        """
-        This method calculates and append the AT or GC content of an input DNA or RNA FASTA sequence
-         and append it to the FASTA header.
-         Then write it to a new fasta file.
-        """
-        # declare the necessary variables
-        bases = []
-        content_name = ""
-
-        # call the select file method but, abort running te method if returns invalid.
-        if self.select_file() == "invalid":
-            return
-
-        # calling the separate_header_and_sequence method to read the fasta file.
-        self.separate_header_and_sequence(self.file_name)
-
-        # adjust bases list according to the content type and sequence type
-        if content_type.get() == "AT" and sequence_type.get() == "DNA":
-            bases.extend(["A", "T"])
-            content_name = "AT content: "
-
-        elif content_type.get() == "GC" and (sequence_type.get() == "DNA" or sequence_type.get() == "RNA"):
-            bases.extend(["G", "C"])
-            content_name = "GC content: "
-
-        elif content_type.get() == "AT" and sequence_type.get() == "RNA":
-            bases.extend(["A", "U"])
-            content_name = "AT content: "
-
-        for Header in self.sequence_dictionary:
-            # if the sequence is a protein,
-            # display a sequence type error and exit the method.
-            if self.get_sequence_type(self.sequence_dictionary[Header]) == "protein":
-                messagebox.showerror("Sequence Type Error", "Please select nucleotide sequences to calculate AT/GC "
-                                                            "content")
-                return
-
-            else:
-                count = 0
-                content_count = 0
-                for base in self.sequence_dictionary[Header]:
-                    # calculate the sequence length
-                    count += 1
-                    # counting content count
-                    if base in bases:
-                        content_count += 1
-
-                """ calculate the AT content"""
-                content = content_count / count
-
-                """ get the fasta file name"""
-                fasta_file_name = self.create_fasta_file_name(Header)
-
-                # writing the sequence length appended header and sequence to a fasta file
-                with open(fasta_file_name, "w") as file:
-                    file.writelines(Header + ", " + content_name + str(round(content, 2)) + "\n")
-                    file.writelines(self.sequence_dictionary[Header] + "\n")
-
-        """ display a confirmation message about the task completion"""
-        messagebox.showinfo("Task completed!", "Please check Output folder")
-
-    def add_contents_to_headers_and_write(self, content_type, sequence_type):
-        """
-        This method uses a multi-fasta file to calculate and append the AT or GC content of each sequence
-        to the relevant fasta header and write them to a new multi-fasta file.
-        """
-        # declare the necessary variables
-        bases = []
-        content_name = ""
-
-        # create a new dictionary
-        content_sequence_dictionary = {}
-
-        # call the select file method but, abort running te method if returns invalid.
-        if self.select_file() == "invalid":
-            return
-
-        # calling the separate_header_and_sequence method to read the fasta file.
-        self.separate_header_and_sequence(self.file_name)
-
-        # adjust bases list according to the content type and sequence type
-        if content_type.get() == "AT" and sequence_type.get() == "DNA":
-            bases.extend(["A", "T"])
-            content_name = "AT content: "
-
-        elif content_type.get() == "GC" and (sequence_type.get() == "DNA" or sequence_type.get() == "RNA"):
-            bases.extend(["G", "C"])
-            content_name = "GC content: "
-
-        elif content_type.get() == "AT" and sequence_type.get() == "RNA":
-            bases.extend(["A", "U"])
-            content_name = "AT content: "
-
-        for Header in self.sequence_dictionary:
-
-            # if the sequence is a protein,
-            # display a sequence type error and exit the method.
-            nucleotide_sequence = self.sequence_dictionary[Header]
-            if self.get_sequence_type(nucleotide_sequence) == "protein":
-                messagebox.showerror("Sequence Type Error", "Please select nucleotide sequences to calculate AT/GC "
-                                                            "content")
-                return
-
-            else:
-                count = 0
-                content_count = 0
-                for base in self.sequence_dictionary[Header]:
-                    # calculate the sequence length
-                    count += 1
-                    # counting content count
-                    if base in bases:
-                        content_count += 1
-
-                """ calculate the AT/GC content"""
-                content = content_count / count
-
-                # create new header
-                new_header = Header + ", " + content_name + str(round(content, 2))
-
-                """ Enter the newheader and sequence to a dictionary"""
-                content_sequence_dictionary[new_header] = nucleotide_sequence
-
-        """ get the fasta file name"""
-        fasta_file_name = self.create_fasta_file_name(self.file_name)
-
-        # writing the sequence length appended header and sequence to a multi-fasta file
-        with open(fasta_file_name, "w") as file:
-
-            for new_header in content_sequence_dictionary:
-                file.writelines(str(new_header) + "\n")
-                file.writelines(content_sequence_dictionary[new_header] + "\n")
-
-        """ display a confirmation message about the task completion"""
-        messagebox.showinfo("Task completed!", "Please check Output folder")
-
-
-if __name__ == "__main__":
-    # Create a tkinter window object
-    window = tk.Tk()
-
-    # Set the dimensions of the window
-    window.geometry("1000x700")
-
-    # Set the title of the window
-    window.title("Fasta Processor")
-    # disable window resizable
-    window.resizable(False, False)
-
-    # making a directory to store output files.
-    Dir = "Output"
-    if not os.path.exists(Dir):
-        os.mkdir("Output")
-
-    """ ------------set background color using a canvas  -------------------  """
-
-    canvas = tk.Canvas(window, width=1000, height=700)
-    canvas.config(background="#4ce44c")
-    canvas.pack(fill="both", expand=True)
-
-    """-------------------------buttons and labels---------------------------------------------"""
-    # Button background color and font
-    bttn_bg_color = "#000000"
-    bttn_font_size = "Calibri 13"
-
-    # welcome message label
-    label = tk.Label(canvas, text="Welcome to Fasta Processor!", font="Helvetica 35 bold", bg="#4ce44c",
-                     foreground="white")
-
-    # GUI buttons
-    button1 = tk.Button(canvas, text="Split multi-fasta file \n into separate files"
-                        , command=lambda: Fasta().split_multi_Fasta_file(), foreground=bttn_bg_color,
-                        font=bttn_font_size, height=2, width=24)
-
-    button2 = tk.Button(canvas, text="Calculate the number of \n fasta sequences in a file"
-                        , command=lambda: Fasta().number_of_Fasta_sequences(), foreground=bttn_bg_color,
-                        font=bttn_font_size, height=2, width=24)
-
-    button3 = tk.Button(canvas, text="Combine multiple fasta files \n into a single multi-fasta file"
-                        , command=lambda: Fasta().combine_multiple_Fasta_files(), foreground=bttn_bg_color,
-                        font=bttn_font_size, height=2, width=24)
-
-    button4 = tk.Button(canvas, text="Remove unwanted characters \n from a nucleotide sequence"
-                        , command=lambda: Sequence().remove_unwanted_from_nucleotide(), foreground=bttn_bg_color,
-                        font=bttn_font_size, height=2, width=24)
-
-    button5 = tk.Button(canvas, text="Remove unwanted characters \n from a protein sequence"
-                        , command=lambda: Sequence().remove_unwanted_from_protein(), foreground=bttn_bg_color,
-                        font=bttn_font_size, height=2, width=24)
-
-    button6 = tk.Button(canvas, text="Add sequence length \n to the fasta header"
-                        , command=lambda: Sequence().add_sequence_length_to_header(), foreground=bttn_bg_color,
-                        font=bttn_font_size, height=2, width=24)
-
-    button7 = tk.Button(canvas, text="Add sequence lengths \n to respective fasta headers"
-                        , command=lambda: Sequence().add_sequence_lengths_to_headers(), foreground=bttn_bg_color,
-                        font=bttn_font_size, height=2, width=24)
-
-    button8 = tk.Button(canvas, text="Get AT content"
-                        , command=lambda: Sequence().get_AT_content(), foreground=bttn_bg_color,
-                        font=bttn_font_size, height=2, width=24)
-
-    button9 = tk.Button(canvas, text="Get GC content"
-                        , command=lambda: Sequence().get_GC_content(), foreground=bttn_bg_color,
-                        font=bttn_font_size, height=2, width=24)
-
-    # This is the output label
-    label1 = tk.Label(canvas, text="", font="Calibri 25 bold", height=1, width=30, background="white",
-                      foreground="#4ce44c")
-
-    # Use the grid geometry manager to align the labels and radio buttons
-    label.grid(row=0, column=0, columnspan=4, padx=5)
-    button1.grid(row=1, column=0, padx=10)
-    button2.grid(row=1, column=1, padx=10)
-    button3.grid(row=1, column=2, padx=10)
-    button4.grid(row=1, column=3, padx=10)
-    button5.grid(row=2, column=0, padx=10)
-    button6.grid(row=2, column=1, padx=10)
-    button7.grid(row=2, column=2, padx=10)
-    button8.grid(row=2, column=3, padx=10)
-    button9.grid(row=3, column=0, padx=10)
-    label1.grid(row=4, column=0, columnspan=4, padx=10)
-
-    # use grid_column and row configure to place
-    # the buttons equally spaced.
-    canvas.grid_columnconfigure(0, minsize=115, weight=1)
-    canvas.grid_columnconfigure(1, minsize=115, weight=1)
-    canvas.grid_columnconfigure(2, minsize=115, weight=1)
-    canvas.grid_columnconfigure(3, minsize=115, weight=1)
-
-    canvas.grid_rowconfigure(0, minsize=110, weight=1)
-    canvas.grid_rowconfigure(1, minsize=110, weight=1)
-    canvas.grid_rowconfigure(2, minsize=110, weight=1)
-    canvas.grid_rowconfigure(3, minsize=110, weight=1)
-    canvas.grid_rowconfigure(4, minsize=110, weight=1)
-
-    """ ---------- Frame 1 contains  add_content_to_header_and_write method and its two radio buttons. ----------"""
-    frame1 = tk.Frame(canvas, borderwidth=2, relief="solid", background="#4ce44c")
-    frame1.grid(row=3, column=1)
-    # select content type
-    label2 = tk.Label(frame1, text="Select content type", font="Calibri 12", background="#4ce44c")
-
-    # using tkinter StringVar to select content type
-    content_type_1 = tk.StringVar()
-    content_type_1.set("AT")  # set the default value to AT content
-
-    radio1 = tk.Radiobutton(frame1, text="AT content", variable=content_type_1, value="AT", background="#4ce44c"
-                            , font="Calibri 12")
-
-    radio2 = tk.Radiobutton(frame1, text="GC content", variable=content_type_1, value="GC", background="#4ce44c"
-                            , font="Calibri 12")
-
-    # select sequence type
-    label3 = tk.Label(frame1, text="Select sequence type", font="Calibri 12", background="#4ce44c")
-
-    # using tkinter StringVar to select sequence type
-    sequence_type_1 = tk.StringVar()
-    sequence_type_1.set("DNA")  # set the default value to DNA sequence type
-
-    radio3 = tk.Radiobutton(frame1, text="DNA", variable=sequence_type_1, value="DNA", background="#4ce44c"
-                            , font="Calibri 12")
-
-    radio4 = tk.Radiobutton(frame1, text="RNA", variable=sequence_type_1, value="RNA", background="#4ce44c"
-                            , font="Calibri 12")
-
-    button10 = tk.Button(frame1, text="Add content to header"
-                         , command=lambda: Sequence().add_content_to_header_and_write(content_type_1, sequence_type_1)
-                         , foreground=bttn_bg_color,
-                         font=bttn_font_size, height=1, width=21)
-
-    # Use the grid geometry manager to align the labels and radio buttons
-    label2.grid(row=0, column=0, columnspan=2)
-    radio1.grid(row=1, column=0, sticky="W")
-    radio2.grid(row=1, column=1, sticky="W")
-
-    label3.grid(row=2, column=0, columnspan=2)
-    radio3.grid(row=3, column=0, sticky="W")
-    radio4.grid(row=3, column=1, sticky="W")
-    button10.grid(row=4, column=0, columnspan=2)
-
-    """ ---------- Frame 2 contains  add_contents_to_headers_and_write method and its two radio buttons. ----"""
-    frame2 = tk.Frame(canvas, borderwidth=2, relief="solid", background="#4ce44c")
-    frame2.grid(row=3, column=2)
-    # select content type
-    label4 = tk.Label(frame2, text="Select content type", font="Calibri 12", background="#4ce44c")
-
-    # using tkinter StringVar to select content type
-    content_type_2 = tk.StringVar()
-    content_type_2.set("AT")  # set the default value to AT content
-
-    radio5 = tk.Radiobutton(frame2, text="AT content", variable=content_type_2, value="AT", background="#4ce44c"
-                            , font="Calibri 12")
-
-    radio6 = tk.Radiobutton(frame2, text="GC content", variable=content_type_2, value="GC", background="#4ce44c"
-                            , font="Calibri 12")
-
-    # select sequence type
-    label5 = tk.Label(frame2, text="Select sequence type", font="Calibri 12", background="#4ce44c")
-
-    # using tkinter StringVar to select sequence type
-    sequence_type_2 = tk.StringVar()
-    sequence_type_2.set("DNA")  # set the default value to DNA sequence type
-
-    radio7 = tk.Radiobutton(frame2, text="DNA", variable=sequence_type_2, value="DNA", background="#4ce44c"
-                            , font="Calibri 12")
-
-    radio8 = tk.Radiobutton(frame2, text="RNA", variable=sequence_type_2, value="RNA", background="#4ce44c"
-                            , font="Calibri 12")
-
-    button11 = tk.Button(frame2, text=" Add contents to headers "
-                         , command=lambda: Sequence().add_contents_to_headers_and_write(content_type_2, sequence_type_2)
-                         , foreground=bttn_bg_color,
-                         font=bttn_font_size, height=1, width=21)
-
-    # Use the grid geometry manager to align the labels and radio buttons
-    label4.grid(row=0, column=0, columnspan=2)
-    radio5.grid(row=1, column=0, sticky="W")
-    radio6.grid(row=1, column=1, sticky="W")
-
-    label5.grid(row=2, column=0, columnspan=2)
-    radio7.grid(row=3, column=0, sticky="W")
-    radio8.grid(row=3, column=1, sticky="W")
-    button11.grid(row=4, column=0, columnspan=2)
-
-    """ ----------------------last code line    ------------------"""
-    # Run the tkinter event loop
-    window.mainloop()
+"""
+Author : Lakshan Jayasinghe
+Date: 23.04.2023
+Project: FASTA processor
+Inputs: Single, multiple or a multi-fasta file depending on the method.
+Outputs: Single, multiple or a multi-fasta file depending on the method.
+  Description:    This program is designed with a simple GUI and methods
+            to do the common day-to-day tasks needed by Bio-informaticians c
+            while working with FASTA sequences.
+"""
+# import necessary packages
+# tkinter is imported only when the GUI is used, so the command line runs without a display.
+import io
+import os
+import sys
+import time
+import mmap
+import shutil
+import struct
+import hashlib
+import itertools
+import contextlib
+import collections
+
+from bgzf import BgzfReader, BgzfWriter
+from digests import DigestSet
+from npz import NpzWriter
+from packed import PackedFasta, PackedFastaStream, PackedFastaWriter
+
+
+def make_class_table():
+    """
+    This function creates a bytes.translate table that maps every byte to its class for the sequence classifier:
+    "c" for A, C, G, T, U and N, "a" for the other IUPAC nucleotide ambiguity codes,
+    "p" for letters used only in protein sequences and "o" for everything else.
+    """
+
+    classes = bytearray(b"o" * 256)
+    for letters, letter_class in [("ACGTUN", b"c"), ("RYSWKMBDHV", b"a"), ("EFIJLOPQXZ", b"p")]:
+        for letter in letters + letters.lower():
+            classes[ord(letter)] = letter_class[0]
+    return bytes(classes)
+
+
+class OperationCancelled(Exception):
+    """ Raised inside a running operation when the user cancels it."""
+
+
+class SequenceTypeError(Exception):
+    """ Raised inside a pipeline when a stage can not process the type of a sequence."""
+
+
+class FastaIndexError(Exception):
+    """ Raised when a fasta file can not be indexed, e.g. a record with lines of different widths."""
+
+
+class FastqFormatError(ValueError):
+    """ Raised while a FASTQ file is read when a record is not a header, sequence, "+" and quality line."""
+
+
+class StageTimer:
+    """ Context manager that adds the wall time and CPU time of a block to one stage of a run report."""
+
+    def __init__(self, stage):
+        self.stage = stage
+
+    def __enter__(self):
+        self.wall_time = time.perf_counter()
+        self.cpu_time = time.process_time()
+
+    def __exit__(self, *exception):
+        self.stage["wall_seconds"] += time.perf_counter() - self.wall_time
+        self.stage["cpu_seconds"] += time.process_time() - self.cpu_time
+        self.stage["calls"] += 1
+
+
+# used instead of a StageTimer when the running operation is not instrumented
+no_measurement = contextlib.nullcontext()
+
+
+def get_compression(file_name):
+    """
+    This function detects the compression of a file from its first bytes, whatever its extension is.
+    It returns "bgzf" for blocked gzip, "gzip" for other gzip files, "packed" for packed sequence files
+    and None for uncompressed files.
+    """
+
+    with open(file_name, "rb") as file:
+        header = file.read(18)
+    if header[:4] == b"FA2B":
+        return "packed"
+    if header[:2] != b"\x1f\x8b":
+        return None
+    # a BGZF block is a gzip member with an extra field "BC" holding the size of the block
+    if len(header) == 18 and header[3] & 4 and header[12:14] == b"BC":
+        return "bgzf"
+    return "gzip"
+
+
+def write_id_index(file_name, index, size):
+    """
+    This function writes the ID index of a fasta file from its ".fai" index, see IdIndex.
+    The size of the fasta file is kept in the header to check the index later.
+    """
+
+    import array
+
+    names = [entry[0].encode() for entry in index]
+    order = sorted(range(len(names)), key=names.__getitem__)
+
+    entries = array.array("Q", itertools.chain.from_iterable((offset, length, line_bases, line_width)
+                                                             for name, length, offset, line_bases, line_width in index))
+    numbers = array.array("Q", order)
+    sorted_names = b"".join(names[number] + b"\n" for number in order)
+    name_offsets = array.array("Q", itertools.accumulate((len(names[number]) + 1 for number in order), initial=0))
+
+    with open(file_name, "wb") as file:
+        file.write(struct.pack("<4sIQQ", b"FIDX", IdIndex.version, len(names), size))
+        for values in [entries, numbers, name_offsets]:
+            if sys.byteorder == "big":
+                values.byteswap()
+            file.write(values.tobytes())
+        file.write(sorted_names)
+
+
+class IdIndex:
+    """
+    Finds the records of a fasta file by their names (the first word of the header) in an index file
+    that is memory-mapped, so a lookup reads only a few pages of it.
+    All numbers are little-endian. After a header with "FIDX", the version as a 32-bit integer,
+    and the number of records and the size of the fasta file as 64-bit integers, the file has
+    the sequence offset, length, bases per line and bytes per line of every record in file order,
+    the record numbers sorted by name, the offsets of the sorted names, and the sorted names,
+    each followed by a newline. All numbers after the header are 64-bit integers.
+    """
+
+    version = 1
+
+    def __init__(self, file_name):
+        self.file = open(file_name, "rb")
+        try:
+            self.mapped_file = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self.file.close()
+            raise ValueError("Not an ID index: " + file_name)
+        magic, version, self.number_of_records, self.size = struct.unpack_from("<4sIQQ", self.mapped_file)
+        if magic != b"FIDX" or version != self.version:
+            self.close()
+            raise ValueError("Not an ID index: " + file_name)
+
+        # where the parts of the index start
+        self.entries = 24
+        self.numbers = self.entries + 32 * self.number_of_records
+        self.name_offsets = self.numbers + 8 * self.number_of_records
+        self.names = self.name_offsets + 8 * (self.number_of_records + 1)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exception):
+        self.close()
+
+    def close(self):
+        self.mapped_file.close()
+        self.file.close()
+
+    def get_entry(self, number):
+        """ This method returns the sequence offset, length, bases per line and bytes per line of a record."""
+
+        return struct.unpack_from("<4Q", self.mapped_file, self.entries + 32 * number)
+
+    def get_sorted_name(self, position):
+        """ This method returns the name in a position of the sorted names."""
+
+        start, end = struct.unpack_from("<2Q", self.mapped_file, self.name_offsets + 8 * position)
+        return self.mapped_file[self.names + start:self.names + end - 1]
+
+    def get_sorted_number(self, position):
+        """ This method returns the record number of the name in a position of the sorted names."""
+
+        return struct.unpack_from("<Q", self.mapped_file, self.numbers + 8 * position)[0]
+
+    def find(self, name):
+        """ This method returns the numbers of the records with the given name, found by a binary search."""
+
+        name = name.encode()
+        low, high = 0, self.number_of_records
+        while low < high:
+            middle = (low + high) // 2
+            if self.get_sorted_name(middle) < name:
+                low = middle + 1
+            else:
+                high = middle
+
+        # records with the same name are next to each other
+        numbers = []
+        while low < self.number_of_records and self.get_sorted_name(low) == name:
+            numbers.append(self.get_sorted_number(low))
+            low += 1
+        return numbers
+
+    def search(self, pattern):
+        """ This method returns the numbers of the records whose names match a regular expression."""
+
+        import re
+
+        expression = re.compile(pattern.encode())
+        names = self.mapped_file[self.names:].split(b"\n")
+        return [self.get_sorted_number(position) for position, name in enumerate(names[:self.number_of_records])
+                if expression.search(name)]
+
+
+class StatsCache:
+    """
+    Keeps the length, base counts and sequence type of every record of the fasta files read before,
+    in an SQLite database in the output directory.
+    The entry of a file is found by its path, and it is valid only while the size, the modification time
+    and a hash of the first and last megabyte of the file are the same.
+    When the database grows over its size limit, the least recently used files are removed from it.
+    """
+
+    # statistics kept for every record
+    columns = ["length", "A", "C", "G", "T", "U", "N", "type", "confidence"]
+
+    def __init__(self, database_file_name, size_limit=256 * 1024 * 1024):
+        import sqlite3
+        self.size_limit = size_limit
+        # transactions are started and ended explicitly
+        self.connection = sqlite3.connect(database_file_name, isolation_level=None)
+        # the cache can always be rebuilt, so it does not need to survive a crash
+        self.connection.execute("PRAGMA synchronous = OFF")
+        self.connection.execute("PRAGMA auto_vacuum = INCREMENTAL")
+        self.connection.execute("CREATE TABLE IF NOT EXISTS files (id INTEGER PRIMARY KEY, path TEXT UNIQUE, "
+                                "size INTEGER, mtime_ns INTEGER, content_hash TEXT, last_used REAL)")
+        self.connection.execute("CREATE TABLE IF NOT EXISTS records (file_id INTEGER, record INTEGER, length INTEGER, "
+                                "A INTEGER, C INTEGER, G INTEGER, T INTEGER, U INTEGER, N INTEGER, type TEXT, "
+                                "confidence REAL, PRIMARY KEY (file_id, record)) WITHOUT ROWID")
+        # the file being added and its records waiting to be inserted
+        self.file_id = None
+        self.rows = []
+        self.number_of_rows = 0
+
+    def get_fingerprint(self, file_name):
+        """ This method returns the size, modification time and a hash of the first and last megabyte of a file."""
+
+        status = os.stat(file_name)
+        content_hash = hashlib.blake2b(digest_size=16)
+        with open(file_name, "rb") as file:
+            content_hash.update(file.read(1024 * 1024))
+            if status.st_size > 1024 * 1024:
+                file.seek(max(1024 * 1024, status.st_size - 1024 * 1024))
+                content_hash.update(file.read())
+        return status.st_size, status.st_mtime_ns, content_hash.hexdigest()
+
+    def read(self, file_name):
+        """
+        This method returns the statistics of the records of a file in file order, as dictionaries,
+        or None if the cache has no valid entry for the file.
+        An entry that no longer matches its file is removed.
+        """
+
+        entry = self.connection.execute("SELECT id, size, mtime_ns, content_hash FROM files WHERE path = ?",
+                                        (file_name,)).fetchone()
+        if entry is None:
+            return None
+        if tuple(entry[1:]) != self.get_fingerprint(file_name):
+            self.remove_file(entry[0])
+            return None
+
+        self.connection.execute("UPDATE files SET last_used = ? WHERE id = ?", (time.time(), entry[0]))
+        cursor = self.connection.execute("SELECT " + ", ".join(self.columns) + " FROM records WHERE file_id = ? "
+                                         "ORDER BY record", (entry[0],))
+        return (dict(zip(self.columns, row)) for row in cursor)
+
+    def begin_file(self, file_name):
+        """
+        This method starts adding the statistics of a file, replacing any entry it had.
+        The file is fingerprinted now, before it is read.
+        """
+
+        fingerprint = self.get_fingerprint(file_name)
+        self.connection.execute("BEGIN")
+        entry = self.connection.execute("SELECT id FROM files WHERE path = ?", (file_name,)).fetchone()
+        if entry is not None:
+            self.connection.execute("DELETE FROM records WHERE file_id = ?", (entry[0],))
+            self.connection.execute("DELETE FROM files WHERE id = ?", (entry[0],))
+        self.file_id = self.connection.execute("INSERT INTO files (path, size, mtime_ns, content_hash, last_used) "
+                                               "VALUES (?, ?, ?, ?, ?)", (file_name,) + fingerprint +
+                                               (time.time(),)).lastrowid
+        self.rows = []
+        self.number_of_rows = 0
+
+    def add(self, stats):
+        """ This method adds the statistics of the next record of the file being added."""
+
+        self.add_rows([tuple(stats[column] for column in self.columns)])
+
+    def add_rows(self, rows):
+        """ This method adds the statistics of the next records of the file being added, as tuples of the columns."""
+
+        for row in rows:
+            self.rows.append((self.file_id, self.number_of_rows) + row)
+            self.number_of_rows += 1
+        # inserting the rows in batches keeps the memory small for files with many records
+        if len(self.rows) >= 10000:
+            self.insert_rows()
+
+    def insert_rows(self):
+        """ This method inserts the rows waiting to be inserted."""
+
+        self.connection.executemany("INSERT INTO records VALUES (" + ", ".join(["?"] * 11) + ")", self.rows)
+        self.rows = []
+
+    def commit_file(self):
+        """ This method saves the entry of the file being added and removes old entries if the cache is too large."""
+
+        self.insert_rows()
+        self.connection.execute("COMMIT")
+        self.file_id = None
+        self.evict()
+
+    def rollback_file(self):
+        """ This method discards the file being added, e.g. when the operation is cancelled before the end."""
+
+        if self.file_id is not None:
+            self.connection.execute("ROLLBACK")
+            self.file_id = None
+            self.rows = []
+
+    def remove_file(self, file_id):
+        """ This method removes a file and its records from the cache."""
+
+        self.connection.execute("BEGIN")
+        self.connection.execute("DELETE FROM records WHERE file_id = ?", (file_id,))
+        self.connection.execute("DELETE FROM files WHERE id = ?", (file_id,))
+        self.connection.execute("COMMIT")
+
+    def get_size(self):
+        """ This method returns the number of bytes used by the database."""
+
+        page_size = self.connection.execute("PRAGMA page_size").fetchone()[0]
+        page_count = self.connection.execute("PRAGMA page_count").fetchone()[0]
+        free_pages = self.connection.execute("PRAGMA freelist_count").fetchone()[0]
+        return (page_count - free_pages) * page_size
+
+    def evict(self):
+        """ This method removes the least recently used files until the cache is within its size limit."""
+
+        evicted = False
+        while self.get_size() > self.size_limit:
+            # the most recently used file is kept even if it is larger than the limit on its own
+            entries = self.connection.execute("SELECT id FROM files ORDER BY last_used LIMIT 2").fetchall()
+            if len(entries) < 2:
+                break
+            self.remove_file(entries[0][0])
+            evicted = True
+
+        # giving the freed pages back to the file system
+        if evicted:
+            self.connection.execute("PRAGMA incremental_vacuum")
+
+    def close(self):
+        self.rollback_file()
+        self.connection.close()
+
+
+class Fasta:
+
+    # byte classes of the sequence classifier
+    sequence_classes = make_class_table()
+
+    # stages of an operation measured by a run report
+    report_stages = ["parse", "classify", "compute", "write"]
+
+    # extensions of fasta files, of gzip or BGZF compressed fasta files and of packed sequence files
+    fasta_extensions = (".fasta", ".fa", ".fna", ".faa")
+    compressed_fasta_extensions = tuple(extension + ".gz" for extension in fasta_extensions)
+    packed_fasta_extensions = (".fa2b",)
+    fastq_extensions = (".fastq", ".fq")
+    compressed_fastq_extensions = tuple(extension + ".gz" for extension in fastq_extensions)
+
+    def __init__(self, label=None, output_directory="Output"):
+        self.file_name = ""
+        self.file_names = ""
+        # the output label of the GUI. Without a label, results are printed to the terminal.
+        self.label = label
+        self.output_directory = output_directory
+        self.failed = False
+
+        # When the GUI runs an operation on a worker thread, messages are put on this queue
+        # and shown by the main thread.
+        self.messages = None
+        # progress of the running operation, and the cancel request from the GUI
+        self.bytes_read = 0
+        self.records_read = 0
+        self.cancelled = False
+        # output files written by the running operation, removed again if it is cancelled
+        self.output_files = []
+
+        # the last classified sequence and its type, so a record is classified only once
+        self.classified_sequence = None
+        self.classification = None
+
+        # the run report of an instrumented operation, see start_report
+        self.report = None
+
+        # output files are written as BGZF if compress_output is set.
+        # threads is the number of threads that decompress and compress BGZF blocks.
+        self.compress_output = False
+        self.threads = min(4, os.cpu_count() or 1)
+
+        # the statistics cache in the output directory, opened when it is first used
+        self.use_stats_cache = True
+        self.stats_cache_size = 256 * 1024 * 1024
+        self.stats_cache = None
+
+    """------------------------------------------------- basic methods -----------------------------------------"""
+
+    def show_result(self, text):
+        """   method to display a result on the output label, or print it without the GUI   """
+
+        if self.messages is not None:
+            self.messages.put(("result", text))
+        elif self.label is not None:
+            self.label.config(text=text)
+        elif text:
+            print(text)
+
+    def show_info(self, title, message):
+        """   method to display an information message box, or print the message without the GUI   """
+
+        if self.messages is not None:
+            self.messages.put(("info", title, message))
+        elif self.label is not None:
+            from tkinter import messagebox
+            messagebox.showinfo(title, message)
+        else:
+            print(title, message)
+
+    def show_error(self, title, message):
+        """   method to display an error message box, or print the error without the GUI   """
+
+        self.failed = True
+        if self.messages is not None:
+            self.messages.put(("error", title, message))
+        elif self.label is not None:
+            from tkinter import messagebox
+            messagebox.showerror(title, message)
+        else:
+            print(title + ": " + message, file=sys.stderr)
+
+    def count_progress(self, number_of_bytes, number_of_records=1):
+        """
+        This method counts the bytes and records read by the running operation.
+        It stops the operation if the user has cancelled it.
+        """
+
+        self.bytes_read += number_of_bytes
+        self.records_read += number_of_records
+        if self.cancelled:
+            raise OperationCancelled()
+
+    def open_output_file(self, file_name, buffer_size=-1, compress=None):
+        """   method to open an output file for writing and remember it in case the operation is cancelled.
+              The file is compressed if outputs are compressed, unless compress is False.   """
+
+        # only an operation running in the GUI can be cancelled, and a run report counts the bytes written
+        if self.messages is not None or self.report is not None:
+            self.output_files.append(file_name)
+        if self.compress_output and compress is not False:
+            # the BGZF writer buffers whole blocks itself
+            return BgzfWriter(file_name, self.threads)
+        return open(file_name, "wb", buffering=buffer_size)
+
+    def finish_output_file(self, temporary_file_name, file_name):
+        """   method to rename a completely written temporary file to its output file name in one step   """
+
+        os.replace(temporary_file_name, file_name)
+        # the block index of a BGZF file follows its file
+        if os.path.exists(temporary_file_name + ".gzi"):
+            os.replace(temporary_file_name + ".gzi", file_name + ".gzi")
+        if self.messages is not None or self.report is not None:
+            self.output_files.append(file_name)
+
+    def remove_output_files(self):
+        """   method to remove the output files of a cancelled or failed operation   """
+
+        for file_name in self.output_files:
+            for output_file_name in [file_name, file_name + ".gzi"]:
+                if os.path.exists(output_file_name):
+                    os.remove(output_file_name)
+        self.output_files = []
+
+    def output_file_name(self, file_name):
+        """   method to add the ".gz" extension to an output file name if outputs are compressed, or remove it   """
+
+        # the outputs of a packed sequence file are fasta files
+        if file_name.endswith(self.packed_fasta_extensions):
+            file_name = os.path.splitext(file_name)[0] + ".fasta"
+        if file_name.endswith(".gz"):
+            file_name = file_name[:-len(".gz")]
+        if self.compress_output:
+            file_name += ".gz"
+        return file_name
+
+    def open_input_file(self, file_name):
+        """
+        This method opens a fasta file for reading bytes. Gzip and BGZF files are decompressed while they are read,
+        BGZF blocks in parallel on a thread pool. Packed sequence files are read as the fasta text they were made from.
+        """
+
+        compression = get_compression(file_name)
+        if compression == "packed":
+            return io.BufferedReader(PackedFastaStream(file_name, self.format_record), 1024 * 1024)
+        elif compression == "bgzf":
+            return io.BufferedReader(BgzfReader(file_name, self.threads), 1024 * 1024)
+        elif compression == "gzip":
+            import gzip
+            return gzip.open(file_name, "rb")
+        return open(file_name, "rb")
+
+    def start_report(self, operation, trace_memory=True):
+        """
+        This method switches on the instrumentation of the next operation.
+        The wall time and CPU time of its parse, classify, compute and write stages are added up,
+        and with trace_memory the peak of the memory allocated by Python is traced with tracemalloc.
+        """
+
+        self.report = {
+            "operation": operation,
+            "started": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "stages": {stage: {"wall_seconds": 0.0, "cpu_seconds": 0.0, "calls": 0} for stage in self.report_stages},
+        }
+        self.report_start_times = (time.perf_counter(), time.process_time(), os.times())
+        self.bytes_read = 0
+        self.records_read = 0
+        self.output_files = []
+
+        if trace_memory:
+            import tracemalloc
+            tracemalloc.start()
+
+    def measure(self, stage):
+        """
+        This method returns a context manager that measures a block as part of the given stage.
+        Without a run report it measures nothing and costs almost nothing.
+        """
+
+        if self.report is None:
+            return no_measurement
+        return StageTimer(self.report["stages"][stage])
+
+    def measure_records(self, records):
+        """ This method measures the time spent reading every record of a stream as the parse stage."""
+
+        records = iter(records)
+        while True:
+            with self.measure("parse"):
+                record = next(records, None)
+            if record is None:
+                return
+            yield record
+
+    def merge_report(self, report):
+        """ This method adds the stages and counts of the run report of a worker process to this run report."""
+
+        for stage in self.report_stages:
+            for key in ["wall_seconds", "cpu_seconds", "calls"]:
+                self.report["stages"][stage][key] += report["stages"][stage][key]
+        self.bytes_read += report["bytes_in"]
+        self.records_read += report["records"]
+
+    def finish_report(self, report_file_name=None):
+        """
+        This method switches off the instrumentation and completes the run report with the totals of the run.
+        The report is written as JSON to the given file, or printed if the file name is "-".
+        It returns the report.
+        """
+
+        report = self.report
+        self.report = None
+        wall_time, cpu_time, times = self.report_start_times
+        end_times = os.times()
+
+        report["wall_seconds"] = time.perf_counter() - wall_time
+        report["cpu_seconds"] = time.process_time() - cpu_time
+        # CPU time of the worker processes that have finished during the run
+        report["worker_cpu_seconds"] = (end_times.children_user - times.children_user +
+                                        end_times.children_system - times.children_system)
+        report["input_files"] = list(self.file_names) if self.file_names else [self.file_name]
+        report["bytes_in"] = self.bytes_read
+        output_files = sorted(set(file_name for file_name in self.output_files if os.path.exists(file_name)))
+        report["output_files"] = len(output_files)
+        report["bytes_out"] = sum(os.path.getsize(file_name) for file_name in output_files)
+        report["records"] = self.records_read
+        report["failed"] = self.failed
+        report["cancelled"] = self.cancelled
+
+        import tracemalloc
+        if tracemalloc.is_tracing():
+            report["peak_traced_memory_bytes"] = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+        if report_file_name is not None:
+            import json
+            if report_file_name == "-":
+                print(json.dumps(report, indent=2))
+            else:
+                with open(report_file_name, "w") as file:
+                    json.dump(report, file, indent=2)
+
+        return report
+
+    def run_operation(self, operation, run, report_file_name=None, profile_file_name=None):
+        """
+        This method runs an operation, given as a function without arguments, and instruments it.
+        With a report file name, a JSON run report of the operation is written to that file.
+        With a profile file name, the operation runs under cProfile and the statistics are dumped to that file,
+        to be read with the pstats module or a viewer like snakeviz.
+        """
+
+        if report_file_name is not None:
+            self.start_report(operation)
+
+        profiler = None
+        if profile_file_name is not None:
+            import cProfile
+            profiler = cProfile.Profile()
+
+        try:
+            if profiler is not None:
+                profiler.enable()
+            run()
+        finally:
+            # the report and the profile are written even if the operation fails or is cancelled
+            if profiler is not None:
+                profiler.disable()
+                profiler.dump_stats(profile_file_name)
+            if report_file_name is not None:
+                self.finish_report(report_file_name)
+
+    def check_file_name(self, file_name):
+        """   method to check that a file name given from the command line is an existing fasta file   """
+
+        if self.label is None and not os.path.isfile(file_name):
+            self.show_error("Input Error", "No such file: " + file_name)
+            return "invalid"
+        elif not file_name.endswith(self.fasta_extensions + self.compressed_fasta_extensions +
+                                    self.packed_fasta_extensions + self.fastq_extensions +
+                                    self.compressed_fastq_extensions):
+            if self.label is None:
+                self.show_error("Input Error", "Not a fasta or FASTQ file: " + file_name)
+            return "invalid"
+
+    def is_fastq(self, file_name):
+        """   method to check whether a file is a FASTQ file from its extension   """
+
+        return file_name.endswith(self.fastq_extensions + self.compressed_fastq_extensions)
+
+    def select_file(self, file_name=None):
+        """   method to select a fasta file.
+              A file name given from the command line is used instead of the file dialog.   """
+
+        # Clear the output on the label
+        self.show_result("")
+
+        if file_name is None:
+            from tkinter import filedialog
+            self.file_name = filedialog.askopenfilename()
+        else:
+            # full path, as the file dialog returns it
+            self.file_name = os.path.abspath(file_name).replace("\\", "/")
+
+        if self.file_name == "":
+            return "invalid"
+        return self.check_file_name(self.file_name)
+
+    def select_files(self, file_names=None):
+        """    method to select multiple fasta files.
+               File names given from the command line are used instead of the file dialog.   """
+
+        # Clear the output on the label
+        self.show_result("")
+
+        if file_names is None:
+            from tkinter import filedialog
+            self.file_names = filedialog.askopenfilenames()
+        else:
+            self.file_names = [os.path.abspath(file_name).replace("\\", "/") for file_name in file_names]
+
+        if self.file_names == "":
+            return "invalid"
+        for file_name in self.file_names:
+            if self.check_file_name(file_name) == "invalid":
+                return "invalid"
+        """If the user has chosen only one sequence,
+                ask user to select multiple files """
+        if len(self.file_names) == 1:
+            self.show_error("Input Error", "Please select more than one fasta file")
+            return "invalid"
+
+    def read_records(self, file_name, start=0, end=None, keep_case=False):
+        """
+        This method reads the given fasta file one record at a time.
+        It yields every fasta header and its sequence(uppercase bytes) as a tuple,
+        so only one sequence is kept in memory at a time.
+        Start and end select a byte range of the file that begins and ends on record boundaries.
+        With keep_case, the sequences keep their lowercase (soft-masked) bases.
+        A packed sequence file is read straight from its packed records.
+        A FASTQ file is read without its qualities, with "@" replaced by ">" in the headers,
+        so every operation on sequences runs on it as on a fasta file.
+        """
+
+        if get_compression(file_name) == "packed":
+            records = self.read_packed_records(file_name, keep_case)
+        elif self.is_fastq(file_name):
+            records = (record[:2] for record in self.read_fastq_records(file_name, start, end, keep_case))
+        else:
+            records = self.parse_records(file_name, start, end, keep_case)
+        if self.report is None:
+            return records
+        return self.measure_records(records)
+
+    def read_fastq_records(self, file_name, start=0, end=None, keep_case=False):
+        """
+        This method reads the given FASTQ file one record at a time. Every record has four lines:
+        the header with "@", the sequence, a line with "+" and the quality string.
+        It yields the header (with ">" instead of "@"), the sequence(uppercase bytes) and the qualities(bytes).
+        The file is read in large blocks that are split into lines in C,
+        and only a block and the records of one block are kept in memory.
+        Start and end select a byte range of the file that begins and ends on record boundaries.
+        """
+
+        rest = b""
+        line_number = 0
+        with self.open_input_file(file_name) as file:
+            if start:
+                file.seek(start)
+            remaining = None if end is None else end - start
+            while True:
+                block = file.read(16 * 1024 * 1024 if remaining is None else min(16 * 1024 * 1024, remaining))
+                if remaining is not None:
+                    remaining -= len(block)
+
+                if block:
+                    lines = (rest + block).split(b"\n")
+                    # the lines of the records that are not complete in this block are kept for the next one
+                    complete = (len(lines) - 1) // 4 * 4
+                    rest = b"\n".join(lines[complete:])
+                    del lines[complete:]
+                else:
+                    # the last record of the file may end without a newline, and blank lines after it are skipped
+                    lines = rest.rstrip(b"\r\n").split(b"\n") if rest.strip() else []
+                    rest = b""
+                    if len(lines) % 4:
+                        raise FastqFormatError("Incomplete FASTQ record at the end of " + file_name)
+                # a file with Windows line endings
+                if lines and lines[0].endswith(b"\r"):
+                    lines = [line.rstrip(b"\r") for line in lines]
+
+                self.count_progress(len(block), len(lines) // 4)
+                for number, (Header, sequence, separator, quality) in enumerate(zip(lines[0::4], lines[1::4],
+                                                                                    lines[2::4], lines[3::4])):
+                    if Header[:1] != b"@" or separator[:1] != b"+" or len(sequence) != len(quality):
+                        raise FastqFormatError("Not a FASTQ record at line " + str(line_number + 4 * number + 1) +
+                                               " of " + file_name)
+                    if keep_case:
+                        yield ">" + Header[1:].decode(), sequence, quality
+                    else:
+                        yield ">" + Header[1:].decode(), sequence.upper(), quality
+                line_number += len(lines)
+
+                if not block:
+                    break
+
+    def read_packed_records(self, file_name, keep_case=False):
+        """ This method is the reader of read_records for packed sequence files."""
+
+        with PackedFasta(file_name) as store:
+            for number, (offset, Header) in enumerate(store.records):
+                sequence = store.get_sequence(number, keep_case=keep_case)
+                # the progress is counted in packed bytes
+                if number + 1 < len(store.records):
+                    self.count_progress(store.records[number + 1][0] - offset)
+                else:
+                    self.count_progress(len(store.mapped_file) - offset)
+                yield Header, sequence
+
+    def parse_records(self, file_name, start, end, keep_case=False):
+        """ This method is the fasta parser of read_records."""
+
+        # create necessary variables
+        Header = None
+        chunks = []
+        position = start
+        counted = start
+
+        # reading the fasta file in binary mode, line by line, decompressing it if needed
+        with self.open_input_file(file_name) as file:
+            if start:
+                file.seek(start)
+            for line in file:
+                # stop at the end of the byte range
+                if end is not None and position >= end:
+                    break
+                position += len(line)
+
+                line = line.strip()
+                # skip empty lines
+                if not line:
+                    continue
+                # separating header and sequence
+                if line.startswith(b">"):
+                    if Header is not None or chunks:
+                        self.count_progress(position - counted)
+                        counted = position
+                        # join the sequence lines only once per record
+                        if keep_case:
+                            yield Header or "", b"".join(chunks)
+                        else:
+                            yield Header or "", b"".join(chunks).upper()
+                    Header = line.decode()
+                    chunks = []
+                else:
+                    chunks.append(line)
+
+        # the last record of the file
+        if Header is not None or chunks:
+            self.count_progress(position - counted)
+            if keep_case:
+                yield Header or "", b"".join(chunks)
+            else:
+                yield Header or "", b"".join(chunks).upper()
+
+    def find_record_boundaries(self, file_name, number_of_chunks, size=None):
+        """
+        This method splits the given fasta file into byte ranges of about the same size.
+        Every range starts at the beginning of a record, so the ranges can be read separately.
+        It returns the list of boundaries, starting with 0 and ending with the file size,
+        or with the given size to split only the start of a growing file.
+        """
+
+        if size is None:
+            size = os.path.getsize(file_name)
+        boundaries = [0]
+
+        if size > 0:
+            with open(file_name, "rb") as file:
+                with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped_file:
+                    for chunk in range(1, number_of_chunks):
+                        # move the boundary forward to the next header
+                        position = mapped_file.find(b"\n>", max(size * chunk // number_of_chunks - 1, boundaries[-1]),
+                                                    size)
+                        if position == -1:
+                            break
+                        if position + 1 > boundaries[-1]:
+                            boundaries.append(position + 1)
+
+        boundaries.append(size)
+        return boundaries
+
+    def format_record(self, Header, sequence, line_width=None):
+        """
+        This method creates the bytes of one fasta record, ready to be written with a single write.
+        With a line width, the sequence is wrapped into lines of that many characters.
+        """
+
+        # a record without a sequence is only its header line
+        if not sequence:
+            return Header.encode() + b"\n"
+        if line_width and len(sequence) > line_width:
+            sequence = b"\n".join([sequence[start:start + line_width] for start in range(0, len(sequence), line_width)])
+        return Header.encode() + b"\n" + sequence + b"\n"
+
+    def write_record(self, file, Header, sequence, line_width=None):
+        """ This method writes one fasta header and its sequence to an open binary file."""
+
+        file.write(self.format_record(Header, sequence, line_width))
+
+    def build_index(self, file_name, check_line_widths=True):
+        """
+        This method reads the given fasta file once and builds a samtools compatible index.
+        Every entry has the name, sequence length, byte offset of the sequence,
+        bases per line and bytes per line of a record.
+        The index is written next to the fasta file as a ".fai" file.
+        The offsets of a compressed file are offsets in its decompressed bytes, as in samtools,
+        and a BGZF file also gets a ".gzi" index of its blocks if it has none.
+        As in samtools, every line of a record but the last must have the same width, otherwise the entry can not
+        tell where the lines are and a FastaIndexError is raised. Without check_line_widths, such a record keeps
+        the width of its first line, and the index is returned but not saved.
+        """
+
+        index = []
+        entry = None
+        offset = 0
+        # whether the current record has had a line that can only be its last one, shorter or blank
+        last_line_seen = False
+        line_widths_differ = False
+
+        with self.open_input_file(file_name) as file:
+            for line in file:
+                stripped = line.strip()
+                if stripped.startswith(b">"):
+                    # the accession number (first word of the header) is the name of the record
+                    name = stripped[1:].split(maxsplit=1)
+                    entry = [name[0].decode() if name else "", 0, offset + len(line), 0, 0]
+                    index.append(entry)
+                    last_line_seen = False
+                elif stripped and entry is not None:
+                    if entry[3] == 0 and not last_line_seen:
+                        # the first sequence line sets the line width of the record
+                        entry[3] = len(stripped)
+                        entry[4] = len(line)
+                    elif last_line_seen or len(stripped) > entry[3]:
+                        if check_line_widths:
+                            raise FastaIndexError("Different line length in sequence " + entry[0] + " of " +
+                                                  file_name + ", every line but the last must have the same width")
+                        line_widths_differ = True
+                    if len(stripped) < entry[3] or len(line) != entry[4]:
+                        last_line_seen = True
+                    entry[1] += len(stripped)
+                elif entry is not None:
+                    last_line_seen = True
+                offset += len(line)
+
+            if get_compression(file_name) == "bgzf" and file.raw.index is None:
+                try:
+                    file.raw.write_index()
+                except OSError:
+                    # as the index below, the file is still read without a saved block index.
+                    pass
+
+        self.count_progress(offset, len(index))
+        index = [tuple(entry) for entry in index]
+        if line_widths_differ:
+            return index
+
+        # writing the index file, and stamping it with the modification time of the fasta file
+        # so that the index can be checked against later changes.
+        index_file_name = file_name + ".fai"
+        try:
+            with open(index_file_name, "w") as file:
+                for entry in index:
+                    file.write("\t".join(str(value) for value in entry) + "\n")
+            status = os.stat(file_name)
+            os.utime(index_file_name, ns=(status.st_atime_ns, status.st_mtime_ns))
+        except OSError:
+            # the index is still usable for this run even if it cannot be saved.
+            pass
+
+        return index
+
+    def is_index_valid(self, file_name, index_file_name):
+        """
+        This method checks whether a saved index still matches the fasta file.
+        The index is valid only if the modification time of the fasta file has not changed
+        and the last record of the index ends where the file ends.
+        For a compressed file only the modification time is checked, as finding its end means decompressing it.
+        """
+
+        status = os.stat(file_name)
+        if os.stat(index_file_name).st_mtime_ns != status.st_mtime_ns:
+            return False
+
+        if get_compression(file_name) is not None:
+            return True
+
+        # only the last line of the index is read, from a block at the end that grows until it has the whole line
+        block_size = 4096
+        with open(index_file_name, "rb") as file:
+            index_size = file.seek(0, os.SEEK_END)
+            while True:
+                start = max(0, index_size - block_size)
+                file.seek(start)
+                tail = file.read()
+                if start == 0 or b"\n" in tail.rstrip(b"\n"):
+                    break
+                block_size *= 2
+        lines = tail.splitlines()
+        if not lines:
+            return status.st_size == 0
+
+        # calculating where the sequence of the last record should end
+        name, length, offset, line_bases, line_width = lines[-1].decode().split("\t")
+        end = self.get_record_end((name, int(length), int(offset), int(line_bases), int(line_width)))
+
+        # anything after the last sequence must be whitespace only
+        if end > status.st_size:
+            return False
+        with open(file_name, "rb") as file:
+            file.seek(end)
+            return file.read().strip() == b""
+
+    def get_record_end(self, entry):
+        """ This method calculates where the sequence of an index entry ends in the fasta file."""
+
+        name, length, offset, line_bases, line_width = entry
+        if length == 0:
+            return offset
+        return offset + length + (length - 1) // line_bases * (line_width - line_bases)
+
+    def load_index(self, file_name):
+        """
+        This method returns the index of the given fasta file.
+        A saved ".fai" index is reused, and it is rebuilt only when the fasta file has changed.
+        """
+
+        index_file_name = file_name + ".fai"
+        if os.path.exists(index_file_name) and self.is_index_valid(file_name, index_file_name):
+            index = []
+            with open(index_file_name, "r") as file:
+                for line in file:
+                    name, length, offset, line_bases, line_width = line.rstrip("\n").split("\t")
+                    index.append((name, int(length), int(offset), int(line_bases), int(line_width)))
+            return index
+
+        return self.build_index(file_name)
+
+    def count_index_records(self, file_name):
+        """
+        This method returns the number of records of the given fasta file.
+        The lines of a valid saved ".fai" index are counted without parsing them, otherwise the index is built.
+        A file with records whose lines have different widths is counted too, see build_index.
+        """
+
+        index_file_name = file_name + ".fai"
+        if os.path.exists(index_file_name) and self.is_index_valid(file_name, index_file_name):
+            number_of_lines = 0
+            last_block = b""
+            with open(index_file_name, "rb") as file:
+                for block in iter(lambda: file.read(1024 * 1024), b""):
+                    number_of_lines += block.count(b"\n")
+                    last_block = block
+            # the last line may not end with a newline
+            if last_block and not last_block.endswith(b"\n"):
+                number_of_lines += 1
+            return number_of_lines
+
+        return len(self.build_index(file_name, check_line_widths=False))
+
+    def get_record_bytes(self, mapped_file, entry):
+        """
+        This method returns the bytes of one record of a memory-mapped fasta file, from its header line
+        to the end of its sequence and a newline, using its index entry.
+        """
+
+        # the header is the line just before the sequence
+        offset = entry[2]
+        header_start = mapped_file.rfind(b"\n", 0, max(offset - 1, 0)) + 1
+
+        # the sequence ends where the next record starts, see read_record_bytes
+        end = mapped_file.find(b"\n>", max(offset - 1, 0))
+        if end == -1:
+            end = len(mapped_file)
+        return mapped_file[header_start:end].rstrip() + b"\n"
+
+    def read_record_bytes(self, file, entry):
+        """
+        This method reads the bytes of one record, from its header line to the end of its sequence,
+        from an open input file using its index entry. It returns the bytes and where the sequence starts in them.
+        The sequence ends where the next record starts, so a record is read whole even if the widths of its lines
+        differ from the entry, e.g. in a ".fai" index written by another program.
+        """
+
+        offset = entry[2]
+        end = self.get_record_end(entry)
+
+        # the header is the line just before the sequence, searched backwards in growing steps
+        step = 4096
+        while True:
+            start = max(offset - step, 0)
+            file.seek(start)
+            data = file.read(end - start)
+            header_start = data.rfind(b"\n", 0, max(offset - start - 1, 0)) + 1
+            if header_start > 0 or start == 0:
+                break
+            step *= 16
+        data = data[header_start:]
+        sequence_start = offset - start - header_start
+
+        # reading on from the end given by the entry until the next header
+        search_start = max(sequence_start - 1, 0)
+        while True:
+            next_record = data.find(b"\n>", search_start)
+            if next_record != -1:
+                data = data[:next_record]
+                break
+            block = file.read(1024 * 1024)
+            if not block:
+                break
+            search_start = max(len(data) - 1, 0)
+            data += block
+
+        return data.rstrip(), sequence_start
+
+    def load_id_index(self, file_name):
+        """
+        This method returns the ID index of the given fasta file, see IdIndex.
+        A saved ".ids" index is reused while the modification time and size of the fasta file are the same,
+        otherwise it is built from the ".fai" index. An index that can not be saved next to the fasta file
+        is saved in the output directory.
+        """
+
+        status = os.stat(file_name)
+        index_file_names = [file_name + ".ids",
+                            os.path.join(self.output_directory, os.path.basename(file_name) + ".ids")]
+        for index_file_name in index_file_names:
+            if os.path.exists(index_file_name) and os.stat(index_file_name).st_mtime_ns == status.st_mtime_ns:
+                try:
+                    id_index = IdIndex(index_file_name)
+                except ValueError:
+                    continue
+                if id_index.size == status.st_size:
+                    return id_index
+                id_index.close()
+
+        index = self.load_index(file_name)
+        for index_file_name in index_file_names:
+            try:
+                write_id_index(index_file_name, index, status.st_size)
+                # the index is stamped with the modification time of the fasta file, as the ".fai" index
+                os.utime(index_file_name, ns=(status.st_atime_ns, status.st_mtime_ns))
+                return IdIndex(index_file_name)
+            except OSError:
+                continue
+        raise OSError("The ID index of " + file_name + " can not be saved")
+
+    def extract_records(self, ids=None, pattern=None, file_name=None):
+        """
+        This method writes the records of a fasta file whose names (the first word of the header)
+        are in a list of IDs, or match a regular expression, to a new fasta file in file order.
+        The records are found in the ID index and read from their offsets, so only the matching records are read.
+        The records are copied as they are, and the records of a packed sequence file are written with their line width.
+        """
+
+        # call the select file method but, abort running the method if returns invalid.
+        if self.select_file(file_name) == "invalid":
+            return
+
+        # the index of a fasta file can not describe FASTQ records
+        if self.is_fastq(self.file_name):
+            self.show_error("Input Error", "Please select a fasta file to extract records from")
+            return
+
+        # the IDs are the first word of every line, with or without ">"
+        if ids is not None:
+            ids = list(dict.fromkeys(words[0].lstrip(">") for words in (line.split() for line in ids) if words))
+
+        name = os.path.basename(self.file_name)
+        if name.endswith(".gz"):
+            name = name[:-len(".gz")]
+        subset_file_name = self.output_file_name(os.path.join(self.output_directory,
+                                                              os.path.splitext(name)[0] + ".subset.fasta"))
+        temporary_file_name = subset_file_name + ".part"
+        compression = get_compression(self.file_name)
+
+        if compression == "packed":
+            # a packed sequence file has the names in its record table
+            import re
+            with PackedFasta(self.file_name) as store:
+                names = [Header[1:].split(" ")[0] for offset, Header in store.records]
+                if ids is not None:
+                    # records with the same name are all extracted
+                    numbers_by_name = collections.defaultdict(list)
+                    for number, name in enumerate(names):
+                        numbers_by_name[name].append(number)
+                    found = [numbers_by_name.get(id, []) for id in ids]
+                    number_of_ids_found = sum(1 for numbers in found if numbers)
+                    numbers = sorted(itertools.chain.from_iterable(found))
+                else:
+                    expression = re.compile(pattern)
+                    numbers = [number for number, name in enumerate(names) if expression.search(name)]
+                with self.open_output_file(temporary_file_name, 1024 * 1024) as file:
+                    for number in numbers:
+                        sequence = store.get_sequence(number)
+                        self.count_progress(len(sequence))
+                        with self.measure("write"):
+                            self.write_record(file, store.records[number][1], sequence,
+                                              store.get_record_info(number)["line_width"])
+
+        else:
+            with self.load_id_index(self.file_name) as id_index:
+                if ids is not None:
+                    found = [id_index.find(id) for id in ids]
+                    number_of_ids_found = sum(1 for numbers in found if numbers)
+                    numbers = sorted(set(itertools.chain.from_iterable(found)))
+                else:
+                    numbers = sorted(id_index.search(pattern))
+                entries = [id_index.get_entry(number) for number in numbers]
+
+            with self.open_output_file(temporary_file_name, 1024 * 1024) as file:
+                if compression is None:
+                    with open(self.file_name, "rb") as fasta_file:
+                        with mmap.mmap(fasta_file.fileno(), 0, access=mmap.ACCESS_READ) as mapped_file:
+                            for offset, length, line_bases, line_width in entries:
+                                record = self.get_record_bytes(mapped_file,
+                                                               ("", length, offset, line_bases, line_width))
+                                self.count_progress(len(record))
+                                with self.measure("write"):
+                                    file.write(record)
+                else:
+                    with self.open_input_file(self.file_name) as fasta_file:
+                        for offset, length, line_bases, line_width in entries:
+                            data, sequence_start = self.read_record_bytes(
+                                fasta_file, ("", length, offset, line_bases, line_width))
+                            self.count_progress(len(data))
+                            with self.measure("write"):
+                                file.write(data.rstrip(b"\r\n") + b"\n")
+
+        self.finish_output_file(temporary_file_name, subset_file_name)
+
+        # Display the output on the label
+        result = "Extracted " + str(len(numbers)) + " records"
+        if ids is not None:
+            result += ", " + str(len(ids) - number_of_ids_found) + " IDs not found"
+        self.show_result(result)
+
+        """ display a confirmation message about the task completion"""
+        self.show_info("Task completed!", "Please check " + self.output_directory + " folder")
+
+    def create_fasta_file_name(self, Header):
+        """ Headers with ">" and ":" cause errors when tried to create files including them.
+            This method removes >,: and split the header using whitespaces.
+            This method splits filepaths using "/".
+            Then it creates the output path and fasta file's name.
+            """
+
+        if "/" in Header:
+            # This means the parameter passed by the name
+            # of Header is a filepath. It contains "/" to indicate directories
+
+            # splitting the header using forward slash.
+            new_file_name = Header.split("/")
+
+            # using only the accession number as file name
+            fasta_file_name = os.path.join(self.output_directory, new_file_name[-1])
+
+            # the outputs of a FASTQ file are fasta files
+            if fasta_file_name.endswith(self.compressed_fastq_extensions):
+                fasta_file_name = fasta_file_name[:-len(".gz")]
+            if fasta_file_name.endswith(self.fastq_extensions):
+                fasta_file_name = os.path.splitext(fasta_file_name)[0] + ".fasta"
+        else:
+            # If "/" is not found, this parameter passed by the name
+            # of Header is actually a fasta header.
+            # remove ">" from header
+            Head = Header.strip(">")
+            # remove any colons
+            Head = Head.replace(":", " ")
+
+            # splitting the header using whitespaces
+            new_file_name = Head.split(" ")
+
+            # using only the accession number as file name
+            fasta_file_name = os.path.join(self.output_directory, new_file_name[0] + ".fasta")
+
+        # compressed outputs end with ".gz", uncompressed outputs of compressed inputs do not
+        return self.output_file_name(fasta_file_name)
+
+    def get_sequence_type(self, sequence):
+        """
+        This method checks whether the given
+        sequence is protein, RNA or DNA.
+        """
+
+        return self.classify_sequence(sequence)[0]
+
+    def classify_sequence(self, sequence, sample_size=1000000):
+        """
+        This method decides whether a sequence(bytes) is protein, RNA or DNA from the letters of the whole sequence.
+        Sequences longer than sample_size are classified from 16 blocks spread over the sequence.
+        It returns the sequence type and a confidence between 0 and 1.
+        The result is kept for the last sequence, so calling it again for the same record costs nothing.
+        """
+
+        if sequence is self.classified_sequence:
+            return self.classification
+
+        with self.measure("classify"):
+            # taking a sample of a very long sequence
+            sample = sequence
+            if len(sequence) > sample_size:
+                block_size = sample_size // 16
+                step = len(sequence) // 16
+                sample = b"".join([sequence[block * step:block * step + block_size] for block in range(16)])
+
+            # counting the letter classes with one translate and a few counts, all done in C
+            classes = sample.translate(self.sequence_classes)
+            nucleotides = classes.count(b"c")
+            # the IUPAC ambiguity codes are also amino acids, so they count for neither type,
+            # and a sequence with many of them, e.g. ACGTRYKMSWN, is classified by its other letters
+            letters = nucleotides + classes.count(b"p")
+
+            if letters == 0:
+                # a sequence of ambiguity codes only is more likely a protein, but without any confidence
+                classification = ("protein" if classes.count(b"a") else "DNA", 0.0)
+            else:
+                # A, C, G, T, U and N are also amino acids, but make up only about a third of a protein.
+                # The confidence grows with the distance from the threshold between the two.
+                nucleotide_fraction = nucleotides / letters
+                if nucleotide_fraction >= 0.75:
+                    confidence = min(1.0, (nucleotide_fraction - 0.75) / 0.2)
+                    if sample.count(b"U") > sample.count(b"T"):
+                        classification = ("RNA", confidence)
+                    else:
+                        classification = ("DNA", confidence)
+                else:
+                    classification = ("protein", min(1.0, (0.75 - nucleotide_fraction) / 0.4))
+
+        self.classified_sequence = sequence
+        self.classification = classification
+        return classification
+
+    """  -------------------------------------  main methods ------------------------------------------------ """
+
+    def split_multi_Fasta_file(self, file_name=None, records_per_file=None, bytes_per_file=None, line_width=None):
+        """
+        This method splits a given single multi-Fasta file into separate fasta files
+         containing one sequence in each.
+        With records_per_file or bytes_per_file, the sequences are split into shards
+        of that many records or about that many bytes instead.
+        With a line width, the sequences are wrapped into lines of that many characters.
+        """
+
+        # call the select file method but, abort running te method if returns invalid.
+        if self.select_file(file_name) == "invalid":
+            return
+
+        if records_per_file is None and bytes_per_file is None:
+            # reading the fasta file one record at a time and writing it to a separate file.
+            for Header, sequence in self.read_records(self.file_name):
+                """ get the fasta file name"""
+                fasta_file_name = self.create_fasta_file_name(Header)
+
+                # writing the header and sequence with a single write.
+                # a rename per record would cost more than the write itself, so only shards use temporary files.
+                with self.measure("write"), self.open_output_file(fasta_file_name) as file:
+                    file.write(self.format_record(Header, sequence, line_width))
+        else:
+            self.write_shards(self.read_records(self.file_name), records_per_file, bytes_per_file, line_width)
+
+        """ display a confirmation message about the task completion"""
+        self.show_info("Task completed!", "Please check " + self.output_directory + " folder")
+
+    def write_shards(self, records, records_per_file=None, bytes_per_file=None, line_width=None):
+        """
+        This method writes a stream of fasta records into numbered shard files
+        of at most records_per_file records or about bytes_per_file bytes.
+        A record larger than bytes_per_file gets a shard of its own.
+        Every shard is written with a large buffer to a temporary file and renamed when it is complete.
+        """
+
+        # the shards are named after the input file, e.g. Output/sequences_0001.fasta
+        shard_file_prefix = self.create_fasta_file_name(self.file_name)
+        if shard_file_prefix.endswith(".gz"):
+            shard_file_prefix = shard_file_prefix[:-len(".gz")]
+        shard_file_prefix = os.path.splitext(shard_file_prefix)[0]
+        shard_file_extension = self.output_file_name(".fasta")
+
+        file = None
+        number_of_shards = 0
+        shard_file_names = []
+        try:
+            for Header, sequence in records:
+                with self.measure("write"):
+                    record = self.format_record(Header, sequence, line_width)
+
+                    # start a new shard when the current one is full
+                    if file is not None and ((records_per_file and shard_records >= records_per_file) or
+                                             (bytes_per_file and shard_bytes + len(record) > bytes_per_file)):
+                        file.close()
+                        file = None
+                        self.finish_output_file(shard_file_name + ".part", shard_file_name)
+                        shard_file_names.append(shard_file_name)
+
+                    if file is None:
+                        number_of_shards += 1
+                        shard_file_name = shard_file_prefix + "_" + str(number_of_shards).zfill(4) + \
+                            shard_file_extension
+                        file = self.open_output_file(shard_file_name + ".part", 1024 * 1024)
+                        shard_records = 0
+                        shard_bytes = 0
+
+                    file.write(record)
+                    shard_records += 1
+                    shard_bytes += len(record)
+
+            # the last shard
+            if file is not None:
+                with self.measure("write"):
+                    file.close()
+                    file = None
+                    self.finish_output_file(shard_file_name + ".part", shard_file_name)
+
+        except BaseException:
+            # an error in the middle of the stream removes the current shard and the shards already written
+            if file is not None:
+                file.close()
+                shard_file_names.append(shard_file_name + ".part")
+            for file_name in shard_file_names:
+                for output_file_name in [file_name, file_name + ".gzi"]:
+                    if os.path.exists(output_file_name):
+                        os.remove(output_file_name)
+            raise
+
+        return number_of_shards
+
+    def number_of_Fasta_sequences(self, file_name=None):
+        """
+        This method calculates the number of fasta sequences
+        in a given multi fasta file.
+        """
+        # call the select file method but, abort running te method if returns invalid.
+        if self.select_file(file_name) == "invalid":
+            return
+
+        # the number of records is read from the fasta index, and the records of a FASTQ file are counted.
+        with self.measure("parse"):
+            if self.is_fastq(self.file_name):
+                number_of_fasta_sequences = sum(1 for record in self.read_fastq_records(self.file_name))
+            else:
+                number_of_fasta_sequences = self.count_index_records(self.file_name)
+
+        # Display the number of fasta sequences on the label
+        self.show_result("Number of fasta sequences: " + str(number_of_fasta_sequences))
+
+    def combine_multiple_Fasta_files(self, file_names=None, duplicate_headers="keep", normalize=False):
+        """
+        This method reads a multiple fasta files  and
+        combine the sequences into a multi-fasta file.
+        The files are streamed in order. Without any changes to the records their bytes are
+        copied as they are, otherwise the records are rewritten as unwrapped uppercase sequences.
+        Records with an accession number seen before are kept, renamed or reported as an error
+        depending on duplicate_headers ("keep", "rename" or "error").
+        """
+        # call the files selecting method but, abort running method if returns invalid.
+        if self.select_files(file_names) == "invalid":
+            return
+
+        fasta_file_name = self.output_file_name(os.path.join(self.output_directory, "multifasta file.fasta"))
+
+        # create a new fasta file, as a temporary file until it is complete.
+        with self.open_output_file(fasta_file_name + ".part", 0) as file:
+
+            if duplicate_headers == "keep" and not normalize:
+                # copy every file byte by byte, adding a newline where a file does not end with one.
+                self.concatenate_files(self.file_names, file)
+            else:
+                # access the selected file list, select one file at a time and
+                # write all of its fasta headers and sequences to the multi-fasta file.
+                records = (record for filepath in self.file_names for record in self.read_records(filepath))
+                if duplicate_headers != "keep":
+                    records = self.check_duplicate_headers(records, duplicate_headers)
+
+                # a large buffer, as the file itself is opened unbuffered for the byte copy.
+                # a compressed file buffers whole blocks itself.
+                if self.compress_output:
+                    buffered_output = contextlib.nullcontext(file)
+                else:
+                    buffered_output = open(file.fileno(), "wb", buffering=1024 * 1024, closefd=False)
+                with buffered_output as buffered_file:
+                    for Header, sequence in records:
+                        if Header is None:
+                            break
+                        with self.measure("write"):
+                            self.write_record(buffered_file, Header, sequence)
+
+        if not self.failed:
+            self.finish_output_file(fasta_file_name + ".part", fasta_file_name)
+        else:
+            for output_file_name in [fasta_file_name + ".part", fasta_file_name + ".part.gzi"]:
+                if os.path.exists(output_file_name):
+                    os.remove(output_file_name)
+            return
+
+        """ display a confirmation message about the task completion"""
+        self.show_info("Task completed!", "Please check " + self.output_directory + " folder")
+
+    def concatenate_files(self, file_names, file):
+        """
+        This method copies the given files into an open output file one after another.
+        A newline is added between two files if the first one does not end with a newline.
+        Compressed files, and any file copied into a compressed output, are copied through a buffer
+        and decompressed or compressed on the way.
+        """
+
+        last_byte = b"\n"
+        for file_name in file_names:
+            if self.compress_output or get_compression(file_name) is not None:
+                with self.measure("write"), self.open_input_file(file_name) as input_file:
+                    chunk = input_file.read(1024 * 1024)
+                    # fixing the boundary between two files
+                    if chunk and last_byte != b"\n":
+                        file.write(b"\n")
+                    while chunk:
+                        file.write(chunk)
+                        last_byte = chunk[-1:]
+                        self.count_progress(len(chunk), 0)
+                        chunk = input_file.read(1024 * 1024)
+                continue
+
+            with open(file_name, "rb", buffering=0) as input_file:
+                size = os.fstat(input_file.fileno()).st_size
+                if size == 0:
+                    continue
+
+                # fixing the boundary between two files
+                if last_byte != b"\n":
+                    file.write(b"\n")
+                input_file.seek(size - 1)
+                last_byte = input_file.read(1)
+                input_file.seek(0)
+
+                with self.measure("write"):
+                    self.copy_file_bytes(input_file, file)
+                self.count_progress(size, 0)
+
+        # the combined file always ends with a newline
+        if last_byte != b"\n":
+            file.write(b"\n")
+
+    def copy_file_bytes(self, input_file, file):
+        """
+        This method copies the rest of an unbuffered input file to an unbuffered output file.
+        The bytes are copied inside the kernel with copy_file_range or sendfile where the system supports it,
+        and through a buffer otherwise.
+        """
+
+        remaining = os.fstat(input_file.fileno()).st_size - input_file.tell()
+
+        for kernel_copy in ["copy_file_range", "sendfile"]:
+            if not hasattr(os, kernel_copy):
+                continue
+            try:
+                while remaining > 0:
+                    if kernel_copy == "copy_file_range":
+                        copied = os.copy_file_range(input_file.fileno(), file.fileno(), remaining)
+                    else:
+                        copied = os.sendfile(file.fileno(), input_file.fileno(), None, remaining)
+                    if copied == 0:
+                        return
+                    remaining -= copied
+                return
+            except OSError:
+                # not supported for these files, try the next way of copying
+                continue
+
+        shutil.copyfileobj(input_file, file, 1024 * 1024)
+
+    def check_duplicate_headers(self, records, duplicate_headers):
+        """
+        This method checks a stream of fasta records for accession numbers that were seen before.
+        With duplicate_headers "rename", a number is added to the accession number of a duplicate,
+        e.g. ">NM_000518.5_2". With "error", an error is displayed and the stream ends with (None, None).
+        Only a 64-bit hash of every accession number is kept, so the set stays small for many records.
+        """
+
+        seen = set()
+        for Header, sequence in records:
+            words = Header[1:].split(maxsplit=1)
+            accession = words[0] if words else ""
+            key = int.from_bytes(hashlib.blake2b(accession.encode(), digest_size=8).digest(), "big")
+
+            if key in seen:
+                if duplicate_headers == "error":
+                    self.show_error("Header Error", "Duplicate fasta header: " + accession)
+                    yield None, None
+                    return
+
+                # find a number that makes the accession number unique
+                number = 2
+                while True:
+                    new_accession = accession + "_" + str(number)
+                    key = int.from_bytes(hashlib.blake2b(new_accession.encode(), digest_size=8).digest(), "big")
+                    if key not in seen:
+                        break
+                    number += 1
+                Header = ">" + new_accession + Header[1 + len(accession):]
+
+            seen.add(key)
+            yield Header, sequence
+
+    def pack_Fasta_file(self, file_name=None):
+        """
+        This method converts a nucleotide fasta file into a packed sequence file (".fa2b") with 2 bits per base,
+        see PackedFastaWriter. The packed file can be read by every operation instead of the fasta file,
+        and unpack_Fasta_file restores the fasta file from it.
+        """
+
+        # call the select file method but, abort running te method if returns invalid.
+        if self.select_file(file_name) == "invalid":
+            return
+
+        # the index of a fasta file can not describe FASTQ records
+        if self.is_fastq(self.file_name):
+            self.show_error("Input Error", "Please select a fasta file to pack")
+            return
+
+        if get_compression(self.file_name) == "packed":
+            self.show_error("Input Error", "Please select a fasta file that is not packed")
+            return
+
+        # the packed file is named after the input, e.g. Output/genome.fa2b
+        name = os.path.basename(self.file_name)
+        if name.endswith(".gz"):
+            name = name[:-len(".gz")]
+        packed_file_name = os.path.join(self.output_directory, os.path.splitext(name)[0] + ".fa2b")
+        temporary_file_name = packed_file_name + ".part"
+
+        # the index has the line width of every record, a record without a header has no index entry
+        try:
+            index = iter(self.load_index(self.file_name))
+        except FastaIndexError:
+            # a record with lines of different widths is packed with the width of its first line
+            index = iter(self.build_index(self.file_name, check_line_widths=False))
+
+        if self.messages is not None or self.report is not None:
+            self.output_files.append(temporary_file_name)
+        with PackedFastaWriter(temporary_file_name) as writer:
+            for Header, sequence in self.read_records(self.file_name, keep_case=True):
+                # a protein can not be packed into 2 bits per base
+                if self.get_sequence_type(sequence.upper()) == "protein":
+                    protein = True
+                    break
+                line_width = next(index)[3] if Header else 0
+                with self.measure("write"):
+                    writer.add(Header, sequence, line_width)
+            else:
+                protein = False
+
+        # if a sequence is a protein, display a sequence type error and exit the method.
+        if protein:
+            os.remove(temporary_file_name)
+            self.show_error("Sequence Type Error", "Please select nucleotide sequences to pack")
+            return
+
+        self.finish_output_file(temporary_file_name, packed_file_name)
+
+        """ display a confirmation message about the task completion"""
+        self.show_info("Task completed!", "Please check " + self.output_directory + " folder")
+
+    def unpack_Fasta_file(self, file_name=None):
+        """
+        This method restores the fasta file of a packed sequence file, with its headers, soft-masked bases
+        and line widths. A fasta file with one line width in every record and no empty lines is restored exactly.
+        """
+
+        # call the select file method but, abort running te method if returns invalid.
+        if self.select_file(file_name) == "invalid":
+            return
+
+        if get_compression(self.file_name) != "packed":
+            self.show_error("Input Error", "Please select a packed sequence file")
+            return
+
+        """ get the fasta file name"""
+        fasta_file_name = self.create_fasta_file_name(self.file_name)
+        temporary_file_name = fasta_file_name + ".part"
+
+        with PackedFasta(self.file_name) as store, self.open_output_file(temporary_file_name, 1024 * 1024) as file:
+            for number, (offset, Header) in enumerate(store.records):
+                with self.measure("parse"):
+                    info = store.get_record_info(number)
+                    sequence = store.get_sequence(number)
+                self.count_progress(info["bases"] - offset + (info["length"] + 3) // 4)
+                with self.measure("write"):
+                    self.write_record(file, Header, sequence, info["line_width"])
+
+        self.finish_output_file(temporary_file_name, fasta_file_name)
+
+        """ display a confirmation message about the task completion"""
+        self.show_info("Task completed!", "Please check " + self.output_directory + " folder")
+
+
+def make_delete_table(alphabet):
+    """ This function creates a bytes.translate delete table containing every byte that is not in the alphabet."""
+
+    return bytes(byte for byte in range(256) if byte not in alphabet.encode())
+
+
+class Sequence(Fasta):
+
+    # characters kept by each cleaning alphabet
+    alphabets = {
+        "IUPAC strict": "ACGTU",
+        "IUPAC ambiguous": "ACGTURYSWKMBDHVN",
+        "20 amino acids": "ACDEFGHIKLMNPQRSTVWY",
+        "25 amino acids": "ACDEFGHIKLMNPQRSTVWYBZJUO",
+    }
+
+    # precomputed delete tables of the alphabets
+    delete_tables = {name: make_delete_table(alphabet) for name, alphabet in alphabets.items()}
+
+    # the complement of every base, and the base 4 digits of the bases in a k-mer code
+    complement_table = bytes.maketrans(b"ACGT", b"TGCA")
+    # the complement of every IUPAC nucleotide code
+    iupac_complement_table = bytes.maketrans(b"ACGTRYSWKMBDHVN", b"TGCAYRSWMKVHDBN")
+    kmer_digit_table = bytes.maketrans(b"ACGT", b"0123")
+
+    def clean_records(self, records, alphabet):
+        """
+        This method removes every character that is not in the given alphabet
+        from a stream of fasta records, one record at a time.
+        """
+
+        delete_table = self.delete_tables[alphabet]
+        for Header, sequence in records:
+            with self.measure("compute"):
+                sequence = sequence.translate(None, delete_table)
+            yield Header, sequence
+
+    def get_composition(self, sequence):
+        """
+        This method counts the bases of a sequence(uppercase bytes) in one place for every content method.
+        It returns a table with A, C, G, T, U, N and other counts,
+        AT and GC counts and the sequence length.
+        """
+
+        # bytes.count scans the sequence in C, once for each base.
+        with self.measure("compute"):
+            composition = {base: sequence.count(base.encode()) for base in ["A", "C", "G", "T", "U", "N"]}
+            composition["length"] = len(sequence)
+
+        return self.add_composition_totals(composition)
+
+    def add_composition_totals(self, composition):
+        """ This method adds the other, AT and GC counts to a composition table with the base counts and length."""
+
+        composition["other"] = composition["length"] - sum(composition[base] for base in "ACGTUN")
+        composition["AT"] = composition["A"] + composition["T"] + composition["U"]
+        composition["GC"] = composition["G"] + composition["C"]
+        return composition
+
+    def get_record_stats(self, sequence):
+        """
+        This method returns the statistics of a record as kept in the statistics cache:
+        the composition table of its sequence with its sequence type and the confidence of the type.
+        """
+
+        stats = self.get_composition(sequence)
+        stats["type"], stats["confidence"] = self.classify_sequence(sequence)
+        return stats
+
+    def is_whole_file(self, file_name, end):
+        """
+        This method checks whether reading a file up to the given end reads the whole file.
+        The statistics cache describes whole files, so it is used only for those.
+        """
+
+        return end is None or end == os.path.getsize(file_name)
+
+    def open_stats_cache(self):
+        """   method to open the statistics cache of the output directory, or return None if it is not used   """
+
+        if not self.use_stats_cache:
+            return None
+        if self.stats_cache is None:
+            self.stats_cache = StatsCache(os.path.join(self.output_directory, "stats_cache.sqlite"),
+                                          self.stats_cache_size)
+        return self.stats_cache
+
+    def close_stats_cache(self):
+        """   method to close the statistics cache when an operation is finished   """
+
+        if self.stats_cache is not None:
+            self.stats_cache.close()
+            self.stats_cache = None
+
+    def read_cached_stats(self, file_name):
+        """
+        This method returns the statistics of the records of a file from the statistics cache,
+        or None if the cache has no valid entry for the file.
+        """
+
+        cache = self.open_stats_cache()
+        if cache is None:
+            return None
+        cached_stats = cache.read(file_name)
+        if cached_stats is None:
+            return None
+        return (self.add_composition_totals(stats) for stats in cached_stats)
+
+    def read_records_with_stats(self, file_name, cached_stats=None, end=None):
+        """
+        This method reads the given fasta file one record at a time, with the statistics of every record.
+        It yields the header, the sequence and the statistics as a tuple.
+        The statistics come from the statistics cache when it has a valid entry for the file,
+        or from the cached statistics already read by the caller.
+        Otherwise they are calculated, and saved in the cache once the whole file has been read.
+        With an end, only the records before that byte offset are read, e.g. a snapshot of a growing file.
+        """
+
+        if not self.is_whole_file(file_name, end):
+            for Header, sequence in self.read_records(file_name, 0, end):
+                yield Header, sequence, self.get_record_stats(sequence)
+            return
+
+        if cached_stats is None:
+            cached_stats = self.read_cached_stats(file_name)
+        if cached_stats is not None:
+            for (Header, sequence), stats in zip(self.read_records(file_name), cached_stats):
+                yield Header, sequence, stats
+            return
+
+        cache = self.open_stats_cache()
+        if cache is not None:
+            cache.begin_file(file_name)
+        completed = False
+        try:
+            for Header, sequence in self.read_records(file_name):
+                stats = self.get_record_stats(sequence)
+                if cache is not None:
+                    cache.add(stats)
+                yield Header, sequence, stats
+            completed = True
+        finally:
+            # a file that was not read to the end, e.g. a cancelled operation, is not saved
+            if cache is not None:
+                if completed:
+                    cache.commit_file()
+                else:
+                    cache.rollback_file()
+
+    def get_content(self, composition, bases):
+        """
+        This method calculates the content of the given bases from a composition table.
+        """
+
+        # an empty sequence has no content
+        if composition["length"] == 0:
+            return 0
+        return sum(composition[base] for base in bases) / composition["length"]
+
+    def get_content_bases(self, content_type, sequence_type):
+        """
+        This method selects the bases and the name of the content
+        according to the content type and sequence type.
+        """
+
+        if content_type == "AT" and sequence_type == "DNA":
+            return ["A", "T"], "AT content: "
+
+        elif content_type == "GC" and (sequence_type == "DNA" or sequence_type == "RNA"):
+            return ["G", "C"], "GC content: "
+
+        elif content_type == "AT" and sequence_type == "RNA":
+            return ["A", "U"], "AT content: "
+
+        return [], ""
+
+    def write_annotated_records(self, file, records, annotation, bases=None, content_name=""):
+        """
+        This method appends the sequence length (annotation "length") or
+        the AT/GC content (annotation "content") of every record to its header
+        and writes the records to an open file.
+        The records come with their statistics, see read_records_with_stats.
+        It returns the number of records written, or "protein" if a protein
+        sequence is found while writing contents.
+        """
+
+        number_of_records = 0
+        for Header, sequence, stats in records:
+            new_header = self.annotate_header(Header, stats, annotation, bases, content_name)
+            if new_header == "protein":
+                return "protein"
+
+            with self.measure("write"):
+                self.write_record(file, new_header, sequence)
+            number_of_records += 1
+
+        return number_of_records
+
+    def annotate_header(self, Header, stats, annotation, bases=None, content_name=""):
+        """
+        This method appends the sequence length (annotation "length") or
+        the AT/GC content (annotation "content") of a record to its header, using the statistics of the record.
+        It returns the new header, or "protein" for the content of a protein sequence.
+        """
+
+        if annotation == "length":
+            # set up unit of length based on the sequence type
+            if stats["type"] == "protein":
+                unit = " aa"
+            else:
+                unit = " bp"
+
+            # creating new header with the sequence length
+            return Header + ", sequence length " + str(stats["length"]) + unit
+
+        # AT/GC content can not be calculated for a protein
+        if stats["type"] == "protein":
+            return "protein"
+
+        """ calculate the AT/GC content from the composition of the sequence"""
+        content = self.get_content(stats, bases)
+
+        # create new header
+        return Header + ", " + content_name + str(round(content, 2))
+
+    def write_annotated_file(self, file_name, fasta_file_name, annotation, bases=None, content_name="", workers=1,
+                             end=None):
+        """
+        This method writes the annotated records of a multi-fasta file into a new multi-fasta file.
+        The output is written to a temporary file first, so a protein sequence leaves no partial output.
+        With more than one worker, the records of an uncompressed file are annotated in parallel.
+        A compressed file is read by one process, which decompresses it on its threads,
+        and so is a file whose statistics are in the statistics cache, as only writing is left to do.
+        With an end, only the records before that byte offset of an uncompressed file are annotated.
+        It returns "protein" if a protein sequence is found while writing contents.
+        """
+
+        temporary_file_name = fasta_file_name + ".part"
+
+        cached_stats = None
+        if self.is_whole_file(file_name, end):
+            cached_stats = self.read_cached_stats(file_name)
+        if workers > 1 and get_compression(file_name) is None and not self.is_fastq(file_name) and cached_stats is None:
+            result = self.write_annotated_file_in_parallel(file_name, temporary_file_name, annotation, bases,
+                                                           content_name, workers, end)
+        else:
+            with self.open_output_file(temporary_file_name) as file:
+                result = self.write_annotated_records(file, self.read_records_with_stats(file_name, cached_stats,
+                                                                                         end),
+                                                      annotation, bases, content_name)
+
+        if result == "protein":
+            for output_file_name in [temporary_file_name, temporary_file_name + ".gzi"]:
+                if os.path.exists(output_file_name):
+                    os.remove(output_file_name)
+            return "protein"
+
+        self.finish_output_file(temporary_file_name, fasta_file_name)
+
+    def write_annotated_file_in_parallel(self, file_name, temporary_file_name, annotation, bases, content_name,
+                                         workers, end=None):
+        """
+        This method splits a multi-fasta file into byte ranges on record boundaries
+        and annotates them on a process pool. Every worker writes its own part file
+        and sends back only its number of records and the statistics of its records,
+        and the part files are joined in input order.
+        It returns "protein" if a protein sequence is found while writing contents.
+        """
+
+        # a few ranges per worker keep all workers busy until the end
+        boundaries = self.find_record_boundaries(file_name, workers * 4, end)
+        tasks = []
+        for chunk in range(len(boundaries) - 1):
+            part_file_name = temporary_file_name + "." + str(chunk)
+            tasks.append((file_name, boundaries[chunk], boundaries[chunk + 1], part_file_name, annotation, bases,
+                          content_name, self.report is not None))
+
+        cache = None
+        if self.is_whole_file(file_name, end):
+            cache = self.open_stats_cache()
+        if cache is not None:
+            cache.begin_file(file_name)
+
+        try:
+            # map returns the results in the order of the tasks
+            from concurrent.futures import ProcessPoolExecutor
+            results = []
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                for result, report, rows in executor.map(annotate_chunk, tasks):
+                    results.append(result)
+                    # the stages of the workers are added to the run report of this operation
+                    if report is not None and self.report is not None:
+                        self.merge_report(report)
+                    # the statistics come back in input order and are saved in the cache
+                    if cache is not None and result != "protein":
+                        cache.add_rows(rows)
+
+            if "protein" in results:
+                return "protein"
+            if cache is not None:
+                cache.commit_file()
+
+            # joining the part files in input order
+            with self.measure("write"), self.open_output_file(temporary_file_name) as file:
+                for task in tasks:
+                    with open(task[3], "rb") as part_file:
+                        shutil.copyfileobj(part_file, file, 1024 * 1024)
+
+            return sum(results)
+
+        finally:
+            # the statistics are saved only if every worker has finished
+            if cache is not None:
+                cache.rollback_file()
+            for task in tasks:
+                if os.path.exists(task[3]):
+                    os.remove(task[3])
+
+    def hash_file_range(self, file_name, start, end):
+        """   method to calculate the blake2b hash of the bytes of a file between two offsets   """
+
+        digest = hashlib.blake2b(digest_size=16)
+        with open(file_name, "rb") as file:
+            file.seek(start)
+            remaining = end - start
+            while remaining > 0:
+                block = file.read(min(remaining, 1024 * 1024))
+                if not block:
+                    break
+                digest.update(block)
+                remaining -= len(block)
+        return digest.hexdigest()
+
+    def find_last_record_start(self, file_name, end):
+        """   method to find the byte offset of the last record that starts before the given end of a fasta file   """
+
+        if end == 0:
+            return 0
+        with open(file_name, "rb") as file:
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped_file:
+                return mapped_file.rfind(b"\n>", 0, end) + 1
+
+    def make_checkpoint(self, file_name, fasta_file_name, end, settings):
+        """
+        This method describes the input of an incremental run after it has been processed up to the given end.
+        The hashes of the last record and of the first MB show whether the processed part has changed since.
+        """
+
+        last_record_start = self.find_last_record_start(file_name, end)
+        return {
+            "input": os.path.abspath(file_name),
+            "end": end,
+            "last_record_start": last_record_start,
+            "last_record_hash": self.hash_file_range(file_name, last_record_start, end),
+            "head_hash": self.hash_file_range(file_name, 0, min(end, 1024 * 1024)),
+            "settings": settings,
+            "output_size": os.path.getsize(fasta_file_name),
+        }
+
+    def read_checkpoint(self, checkpoint_file_name, file_name, fasta_file_name, settings):
+        """
+        This method reads the checkpoint of an earlier incremental run.
+        It returns the checkpoint if only records have been appended to the input since,
+        otherwise the input has to be processed again and it returns "invalid".
+        """
+
+        import json
+
+        try:
+            with open(checkpoint_file_name, "r") as file:
+                checkpoint = json.load(file)
+            end = checkpoint["end"]
+            last_record_start = checkpoint["last_record_start"]
+
+            # the same input and settings, and an output that has not been changed since
+            if (checkpoint["input"] != os.path.abspath(file_name) or checkpoint["settings"] != settings or
+                    os.path.getsize(fasta_file_name) != checkpoint["output_size"] or
+                    os.path.getsize(file_name) < end):
+                return "invalid"
+
+            # the processed part of the input is unchanged
+            if (self.hash_file_range(file_name, last_record_start, end) != checkpoint["last_record_hash"] or
+                    self.hash_file_range(file_name, 0, min(end, 1024 * 1024)) != checkpoint["head_hash"]):
+                return "invalid"
+
+            # the appended data starts a new record, and does not continue the last one
+            with open(file_name, "rb") as file:
+                file.seek(end)
+                appended = file.read(1024).lstrip()
+            if appended and not appended.startswith(b">"):
+                return "invalid"
+
+        except (OSError, ValueError, KeyError, TypeError):
+            return "invalid"
+
+        return checkpoint
+
+    def write_annotated_file_incrementally(self, file_name, fasta_file_name, annotation, bases=None, content_name="",
+                                           workers=1):
+        """
+        This method writes the annotated records of a multi-fasta file that only grows at its end.
+        A checkpoint next to the output remembers how much of the input has been processed,
+        so a later run annotates only the appended records and appends them to the output.
+        If the processed part of the input has changed, the whole output is written again.
+        Compressed inputs and outputs can not be appended to, and are always written again, as FASTQ inputs,
+        whose record starts can not be found from the end of the file.
+        It returns "protein" if a protein sequence is found while writing contents.
+        """
+
+        import json
+
+        checkpoint_file_name = fasta_file_name + ".checkpoint"
+        # the bases tell DNA (A+T) and RNA (A+U) AT contents apart, which have the same content name
+        settings = {"annotation": annotation, "bases": bases, "content_name": content_name}
+
+        if get_compression(file_name) is not None or self.compress_output or self.is_fastq(file_name):
+            if os.path.exists(checkpoint_file_name):
+                os.remove(checkpoint_file_name)
+            return self.write_annotated_file(file_name, fasta_file_name, annotation, bases, content_name, workers)
+
+        # the input is processed up to its current size, records appended while it runs are left for the next run
+        end = os.path.getsize(file_name)
+
+        checkpoint = "invalid"
+        if os.path.exists(checkpoint_file_name) and os.path.exists(fasta_file_name):
+            checkpoint = self.read_checkpoint(checkpoint_file_name, file_name, fasta_file_name, settings)
+
+        if checkpoint == "invalid":
+            # the checkpoint is removed first, so an interrupted rebuild is not taken for a finished one
+            if os.path.exists(checkpoint_file_name):
+                os.remove(checkpoint_file_name)
+            if self.write_annotated_file(file_name, fasta_file_name, annotation, bases, content_name, workers,
+                                         end) == "protein":
+                return "protein"
+
+        elif end > checkpoint["end"]:
+            records = ((Header, sequence, self.get_record_stats(sequence))
+                       for Header, sequence in self.read_records(file_name, checkpoint["end"], end))
+            # the output is cut back to its checkpoint if the appended records can not be written completely
+            with open(fasta_file_name, "ab") as file:
+                try:
+                    result = self.write_annotated_records(file, records, annotation, bases, content_name)
+                    if result == "protein":
+                        file.truncate(checkpoint["output_size"])
+                        return "protein"
+                except BaseException:
+                    file.truncate(checkpoint["output_size"])
+                    raise
+
+        else:
+            # nothing has been appended since the last run
+            return
+
+        temporary_file_name = checkpoint_file_name + ".part"
+        with open(temporary_file_name, "w") as file:
+            json.dump(self.make_checkpoint(file_name, fasta_file_name, end, settings), file, indent=2)
+        os.replace(temporary_file_name, checkpoint_file_name)
+
+    def read_single_record_stats(self, file_name):
+        """
+        This method returns the statistics of a fasta file that should contain only one sequence,
+        from the statistics cache if it has them.
+        It returns None if the file has no sequence, or "multiple" if it has more than one.
+        """
+
+        cached_stats = self.read_cached_stats(file_name)
+        if cached_stats is not None:
+            stats = list(itertools.islice(cached_stats, 2))
+        else:
+            records = self.read_records_with_stats(file_name)
+            stats = [record[2] for record in itertools.islice(records, 2)]
+            # a file with more than one sequence is not read to the end, and not saved in the cache
+            records.close()
+
+        # checking whether the file has more than one sequence.
+        if not stats:
+            return None
+        elif len(stats) > 1:
+            return "multiple"
+        return stats[0]
+
+    def remove_unwanted_from_nucleotide(self, alphabet="IUPAC strict", file_name=None):
+        """
+        This method removes unwanted characters from fasta nucleotide sequences
+        and write them into separate fasta files.
+        The alphabet can be "IUPAC strict" or "IUPAC ambiguous".
+        """
+
+        # call the select file method but, abort running te method if returns invalid.
+        if self.select_file(file_name) == "invalid":
+            return
+
+        # reading and cleaning the fasta file one record at a time
+        for Header, cleansequence in self.clean_records(self.read_records(self.file_name), alphabet):
+
+            """ get the fasta file name"""
+            fasta_file_name = self.create_fasta_file_name(Header)
+
+            # writing the clean sequence with its header to a fasta file.
+            with self.measure("write"), self.open_output_file(fasta_file_name) as file:
+                self.write_record(file, Header, cleansequence)
+
+        """ display a confirmation message about the task completion"""
+        self.show_info("Task completed!", "Please check " + self.output_directory + " folder")
+
+    def remove_unwanted_from_protein(self, alphabet="25 amino acids", file_name=None):
+        """
+        This method removes unwanted characters from fasta protein sequences
+        and write them into separate fasta files.
+        The alphabet can be "20 amino acids" or "25 amino acids".
+        """
+        # call the select file method but, abort running te method if returns invalid.
+        if self.select_file(file_name) == "invalid":
+            return
+
+        # reading and cleaning the fasta file one record at a time
+        for Header, sequence in self.clean_records(self.read_records(self.file_name), alphabet):
+
+            """ get the fasta file name"""
+            fasta_file_name = self.create_fasta_file_name(Header)
+
+            # writing the clean sequence with its header to a fasta file.
+            with self.measure("write"), self.open_output_file(fasta_file_name) as file:
+                self.write_record(file, Header, sequence)
+
+        """ display a confirmation message about the task completion"""
+        self.show_info("Task completed!", "Please check " + self.output_directory + " folder")
+
+    def add_sequence_length_to_header(self, file_name=None):
+
+        """
+        This method to calculates and append the length
+        of an input FASTA sequence to its FASTA header.
+        """
+        # call the select file method but, abort running te method if returns invalid.
+        if self.select_file(file_name) == "invalid":
+            return
+
+        # reading the fasta file one record at a time, with the statistics of the record
+        for Header, sequence, stats in self.read_records_with_stats(self.file_name):
+
+            # the sequence length
+            length = stats["length"]
+
+            # set up unit of length based on the sequence type
+            if stats["type"] == "protein":
+                unit = " aa"
+            else:
+                unit = " bp"
+
+            """ get the fasta file name"""
+            fasta_file_name = self.create_fasta_file_name(Header)
+
+            # writing the sequence length appended header and sequence to a fasta file
+            with self.measure("write"), self.open_output_file(fasta_file_name) as file:
+                self.write_record(file, Header + ", sequence length " + str(length) + unit, sequence)
+
+        """ display a confirmation message about the task completion"""
+        self.show_info("Task completed!", "Please check " + self.output_directory + " folder")
+
+    def add_sequence_lengths_to_headers(self, workers=1, file_name=None, incremental=False, table_format=None):
+
+        """
+        This method uses a multi-fasta file as the input,
+        calculates and appends the length of each sequence to the respective FASTA header
+         and write them into a new multi-fasta file.
+        With more than one worker, the records are processed on a process pool.
+        In incremental mode, only the records appended since the last run are processed.
+        With a table format ("tsv" or "npz"), a table of statistics is written instead, see write_stats_table.
+        """
+
+        if table_format is not None:
+            return self.write_stats_table(table_format, file_name)
+
+        # call the select file method but, abort running te method if returns invalid.
+        if self.select_file(file_name) == "invalid":
+            return
+
+        """ get the fasta file name"""
+        fasta_file_name = self.create_fasta_file_name(self.file_name)
+
+        # writing the sequence length appended header and sequence to a multi-fasta file
+        if incremental:
+            self.write_annotated_file_incrementally(self.file_name, fasta_file_name, "length", workers=workers)
+        else:
+            self.write_annotated_file(self.file_name, fasta_file_name, "length", workers=workers)
+
+        """ display a confirmation message about the task completion"""
+        self.show_info("Task completed!", "Please check " + self.output_directory + " folder")
+
+    def get_AT_content(self, file_name=None):
+        """
+        This method calculates the AT content of a given nucleotide sequence.
+        Then, writes the AT content added header, and sequence to a new fasta file.
+        """
+        bases = ["A", "T", "U"]
+
+        # call the select file method but, abort running te method if returns invalid.
+        if self.select_file(file_name) == "invalid":
+            return
+
+        # the statistics of the only record of the fasta file.
+        stats = self.read_single_record_stats(self.file_name)
+        if stats is None:
+            return
+        elif stats == "multiple":
+            self.show_error("Sequence Number Error", "Please select one nucleotide sequence to calculate AT "
+                                                     "content")
+            return
+
+        # if the sequence is a protein,
+        # display a sequence type error and exit the method.
+        if stats["type"] == "protein":
+            self.show_error("Sequence Type Error", "Please select a nucleotide sequence to calculate AT "
+                                                   "content")
+            return
+
+        else:
+            """ calculate the AT content from the composition of the sequence"""
+            AT_content = self.get_content(stats, bases)
+
+            # Display the output on the label
+            self.show_result("AT content: " + str(round(AT_content, 2)))
+
+    def get_GC_content(self, file_name=None):
+        """
+        This method calculates the GC content of a given fasta nucleotide sequence.
+        Then, writes the GC content added header, and sequence to a new fasta file.
+        """
+
+        bases = ["G", "C"]
+
+        # call the select file method but, abort running te method if returns invalid.
+        if self.select_file(file_name) == "invalid":
+            return
+
+        # the statistics of the only record of the fasta file.
+        stats = self.read_single_record_stats(self.file_name)
+        if stats is None:
+            return
+        elif stats == "multiple":
+            self.show_error("Sequence Number Error", "Please select one nucleotide sequence to calculate GC "
+                                                     "content")
+            return
+
+        # if the sequence is a protein,
+        # display a sequence type error and exit the method.
+        if stats["type"] == "protein":
+            self.show_error("Sequence Type Error", "Please select a nucleotide sequence to calculate GC "
+                                                   "content")
+            return
+
+        else:
+            """ calculate the GC content from the composition of the sequence"""
+            GC_content = self.get_content(stats, bases)
+
+            # Display the output on the label
+            self.show_result("GC content: " + str(round(GC_content, 2)))
+
+    def add_content_to_header_and_write(self, content_type, sequence_type, file_name=None):
+        """
+        This method calculates and append the AT or GC content of an input DNA or RNA FASTA sequence
+         and append it to the FASTA header.
+         Then write it to a new fasta file.
+        """
+        # call the select file method but, abort running te method if returns invalid.
+        if self.select_file(file_name) == "invalid":
+            return
+
+        # adjust bases according to the content type and sequence type
+        bases, content_name = self.get_content_bases(content_type, sequence_type)
+
+        # reading the fasta file one record at a time, with the statistics of the record
+        for Header, sequence, stats in self.read_records_with_stats(self.file_name):
+            # if the sequence is a protein,
+            # display a sequence type error and exit the method.
+            if stats["type"] == "protein":
+                self.show_error("Sequence Type Error", "Please select nucleotide sequences to calculate AT/GC "
+                                                       "content")
+                return
+
+            else:
+                """ calculate the AT/GC content from the composition of the sequence"""
+                content = self.get_content(stats, bases)
+
+                """ get the fasta file name"""
+                fasta_file_name = self.create_fasta_file_name(Header)
+
+                # writing the sequence length appended header and sequence to a fasta file
+                with self.measure("write"), self.open_output_file(fasta_file_name) as file:
+                    self.write_record(file, Header + ", " + content_name + str(round(content, 2)), sequence)
+
+        """ display a confirmation message about the task completion"""
+        self.show_info("Task completed!", "Please check " + self.output_directory + " folder")
+
+    def add_contents_to_headers_and_write(self, content_type, sequence_type, workers=1, file_name=None,
+                                          incremental=False, table_format=None):
+        """
+        This method uses a multi-fasta file to calculate and append the AT or GC content of each sequence
+        to the relevant fasta header and write them to a new multi-fasta file.
+        With more than one worker, the records are processed on a process pool.
+        In incremental mode, only the records appended since the last run are processed.
+        With a table format ("tsv" or "npz"), a table of statistics is written instead, see write_stats_table.
+        """
+
+        if table_format is not None:
+            return self.write_stats_table(table_format, file_name)
+
+        # call the select file method but, abort running te method if returns invalid.
+        if self.select_file(file_name) == "invalid":
+            return
+
+        # adjust bases according to the content type and sequence type
+        bases, content_name = self.get_content_bases(content_type, sequence_type)
+
+        """ get the fasta file name"""
+        fasta_file_name = self.create_fasta_file_name(self.file_name)
+
+        # writing the content appended header and sequence to a multi-fasta file.
+        # if a sequence is a protein, display a sequence type error and exit the method.
+        if incremental:
+            write_annotated_file = self.write_annotated_file_incrementally
+        else:
+            write_annotated_file = self.write_annotated_file
+        if write_annotated_file(self.file_name, fasta_file_name, "content", bases, content_name,
+                                workers) == "protein":
+            self.show_error("Sequence Type Error", "Please select nucleotide sequences to calculate AT/GC "
+                                                   "content")
+            return
+
+        """ display a confirmation message about the task completion"""
+        self.show_info("Task completed!", "Please check " + self.output_directory + " folder")
+
+    def write_stats_table(self, output_format="tsv", file_name=None):
+        """
+        This method writes a table with one row of statistics for every record of a multi-fasta file:
+        the ID (the first word of the header), sequence length, sequence type, A, C, G, T, U and N counts,
+        and GC and AT content, without writing the sequences again.
+        The table is a tab separated file, or a NumPy ".npz" file with one array per column.
+        The IDs are taken from the headers of the records, with the same rule as the index (the first word
+        after ">"), and the statistics come from the statistics cache or are calculated during the same pass.
+        """
+
+        # call the select file method but, abort running te method if returns invalid.
+        if self.select_file(file_name) == "invalid":
+            return
+
+        name = os.path.basename(self.file_name)
+        if name.endswith(".gz"):
+            name = name[:-len(".gz")]
+        table_file_name = os.path.join(self.output_directory, os.path.splitext(name)[0] + ".stats." + output_format)
+        if output_format == "tsv":
+            table_file_name = self.output_file_name(table_file_name)
+        temporary_file_name = table_file_name + ".part"
+
+        # the IDs and statistics of the records, in file order, both from the same records
+        # so that a sequence without a header before the first record still gets its own row
+        rows = (((Header[1:].split(maxsplit=1) or [""])[0], record_stats)
+                for Header, sequence, record_stats in self.read_records_with_stats(self.file_name))
+
+        bases = ["A", "C", "G", "T", "U", "N"]
+        number_of_records = 0
+        if output_format == "tsv":
+            with self.open_output_file(temporary_file_name, 1024 * 1024) as file:
+                file.write(("ID\tlength\ttype\t" + "\t".join(bases) + "\tGC\tAT\n").encode())
+                for id, record_stats in rows:
+                    with self.measure("write"):
+                        file.write((id + "\t" + str(record_stats["length"]) + "\t" + record_stats["type"] + "\t" +
+                                    "\t".join(str(record_stats[base]) for base in bases) + "\t" +
+                                    str(round(self.get_content(record_stats, ["GC"]), 4)) + "\t" +
+                                    str(round(self.get_content(record_stats, ["AT"]), 4)) + "\n").encode())
+                    number_of_records += 1
+        else:
+            columns = [("ID", "S"), ("length", "Q"), ("type", "S")] + [(base, "Q") for base in bases] + \
+                      [("GC", "d"), ("AT", "d")]
+            with self.open_output_file(temporary_file_name, 1024 * 1024, compress=False) as file:
+                writer = NpzWriter(file, columns, self.output_directory, self.compress_output)
+                for id, record_stats in rows:
+                    with self.measure("write"):
+                        writer.add([id.encode(), record_stats["length"], record_stats["type"].encode()] +
+                                   [record_stats[base] for base in bases] +
+                                   [self.get_content(record_stats, ["GC"]), self.get_content(record_stats, ["AT"])])
+                    number_of_records += 1
+                with self.measure("write"):
+                    writer.close()
+
+        self.finish_output_file(temporary_file_name, table_file_name)
+
+        # Display the output on the label
+        self.show_result("Statistics of " + str(number_of_records) + " records")
+
+        """ display a confirmation message about the task completion"""
+        self.show_info("Task completed!", "Please check " + self.output_directory + " folder")
+
+    def pipeline_clean(self, records, alphabet="IUPAC strict"):
+        """ This pipeline stage removes every character that is not in the alphabet, see clean_records."""
+
+        if alphabet not in self.delete_tables:
+            raise ValueError("Unknown alphabet: " + str(alphabet))
+        delete_table = self.delete_tables[alphabet]
+        for Header, sequence, stats, original_header in records:
+            with self.measure("compute"):
+                sequence = sequence.translate(None, delete_table)
+            # the statistics of the sequence before cleaning are no longer valid
+            yield Header, sequence, None, original_header
+
+    def pipeline_length(self, records):
+        """ This pipeline stage appends the sequence length to the header, see annotate_header."""
+
+        for Header, sequence, stats, original_header in records:
+            if stats is None:
+                stats = self.get_record_stats(sequence)
+            yield self.annotate_header(Header, stats, "length"), sequence, stats, original_header
+
+    def pipeline_content(self, records, content_type="GC", sequence_type="DNA"):
+        """
+        This pipeline stage appends the AT or GC content to the header, see annotate_header.
+        A protein sequence stops the pipeline.
+        """
+
+        bases, content_name = self.get_content_bases(content_type, sequence_type)
+        if not bases:
+            raise ValueError("Unknown content type or sequence type: " + str(content_type) + ", " + str(sequence_type))
+        for Header, sequence, stats, original_header in records:
+            if stats is None:
+                stats = self.get_record_stats(sequence)
+            new_header = self.annotate_header(Header, stats, "content", bases, content_name)
+            if new_header == "protein":
+                raise SequenceTypeError("Please select nucleotide sequences to calculate AT/GC content")
+            yield new_header, sequence, stats, original_header
+
+    def pipeline_filter(self, records, min_length=None, max_length=None, min_GC=None, max_GC=None, types=None):
+        """
+        This pipeline stage keeps only the records with a sequence length, GC content (between 0 and 1)
+        and sequence type ("DNA", "RNA" or "protein") in the given limits.
+        """
+
+        for Header, sequence, stats, original_header in records:
+            if stats is None:
+                stats = self.get_record_stats(sequence)
+            if min_length is not None and stats["length"] < min_length:
+                continue
+            if max_length is not None and stats["length"] > max_length:
+                continue
+            if min_GC is not None and self.get_content(stats, ["GC"]) < min_GC:
+                continue
+            if max_GC is not None and self.get_content(stats, ["GC"]) > max_GC:
+                continue
+            if types is not None and stats["type"] not in types:
+                continue
+            yield Header, sequence, stats, original_header
+
+    def read_pipeline_spec(self, spec_file_name):
+        """
+        This method reads the stages of a pipeline from a JSON file: a list of stages, or an object with
+        the list as "stages". Every stage is an object with its name as "stage" and its options, e.g.
+        [{"stage": "clean", "alphabet": "IUPAC ambiguous"}, {"stage": "length"}, {"stage": "filter", "min_length": 100},
+        {"stage": "write", "line_width": 60}]
+        """
+
+        import json
+        with open(spec_file_name, "r") as file:
+            spec = json.load(file)
+        if isinstance(spec, dict):
+            # e.g. a single stage written without the list around it
+            unknown_keys = sorted(set(spec) - {"stages"})
+            if unknown_keys:
+                raise ValueError("Unknown keys of the pipeline spec: " + ", ".join(unknown_keys) +
+                                 ", the stages must be a list or the \"stages\" list of an object")
+            if "stages" not in spec:
+                raise ValueError("The pipeline spec has no \"stages\" list")
+            spec = spec["stages"]
+        if not isinstance(spec, list) or not all(isinstance(stage, dict) for stage in spec):
+            raise ValueError("The stages of the pipeline spec must be a list of objects")
+        return spec
+
+    def check_pipeline_options(self, name, options):
+        """
+        This method checks the types of the options of a pipeline stage before the pipeline reads any record,
+        and raises a ValueError for a wrong one, e.g. a min_length of "5" read from a JSON file.
+        """
+
+        for option, value in options.items():
+            if value is None:
+                continue
+            if option in ["min_length", "max_length", "min_GC", "max_GC"]:
+                valid = isinstance(value, (int, float)) and not isinstance(value, bool)
+                kind = "a number"
+            elif option in ["line_width", "records_per_file", "bytes_per_file"]:
+                valid = isinstance(value, int) and not isinstance(value, bool) and value > 0
+                kind = "a positive whole number"
+            elif option == "types":
+                valid = isinstance(value, list) and all(isinstance(item, str) for item in value)
+                kind = "a list of sequence types"
+            elif option in ["alphabet", "content_type", "sequence_type"]:
+                valid = isinstance(value, str)
+                kind = "a string"
+            else:
+                # unknown options are found when the generator of the stage is created
+                continue
+            if not valid:
+                raise ValueError("The " + option + " option of the " + str(name) + " stage must be " + kind +
+                                 ", not " + repr(value))
+
+    def run_pipeline(self, stages, file_name=None):
+        """
+        This method runs a pipeline of stages on every record of a multi-fasta file in a single streaming pass,
+        without intermediate files. The stages are "clean", "length", "content" and "filter", in any order,
+        see the pipeline_ methods, and a last stage "write" (one file, with an optional line_width) or
+        "split" (one file per record, or shards with records_per_file or bytes_per_file, see split_multi_Fasta_file).
+        The statistics of a record are calculated once and shared by the stages until a clean changes the sequence.
+        Every record is passed between the stages as its header, sequence, statistics and original header.
+        """
+
+        # call the select file method but, abort running te method if returns invalid.
+        if self.select_file(file_name) == "invalid":
+            return
+
+        # the last stage writes the records, and it is "write" if the pipeline has none
+        stages = [dict(stage) for stage in stages]
+        if not stages or stages[-1].get("stage") not in ["write", "split"]:
+            stages.append({"stage": "write"})
+        output = stages.pop()
+        output_name = output.pop("stage")
+
+        records = ((Header, sequence, None, Header) for Header, sequence in self.read_records(self.file_name))
+        try:
+            for stage in stages:
+                name = stage.pop("stage", None)
+                if name not in ["clean", "length", "content", "filter"]:
+                    raise ValueError("Unknown pipeline stage: " + str(name))
+                self.check_pipeline_options(name, stage)
+                # unknown options of a stage are found when its generator is created,
+                # and wrong values when it reads the first record
+                try:
+                    records = getattr(self, "pipeline_" + name)(records, **stage)
+                except TypeError as error:
+                    raise ValueError(str(error))
+            if not set(output) <= {"line_width", "records_per_file", "bytes_per_file"} or \
+                    (output_name == "write" and set(output) - {"line_width"}):
+                raise ValueError("Unknown options of the " + output_name + " stage: " + ", ".join(sorted(output)))
+            self.check_pipeline_options(output_name, output)
+
+            if output_name == "split" and (output.get("records_per_file") or output.get("bytes_per_file")):
+                self.write_shards(((Header, sequence) for Header, sequence, stats, original_header in records),
+                                  output.get("records_per_file"), output.get("bytes_per_file"),
+                                  output.get("line_width"))
+
+            elif output_name == "split":
+                written_file_names = []
+                try:
+                    for Header, sequence, stats, original_header in records:
+                        # the file name comes from the accession of the original header, not from the annotated one
+                        fasta_file_name = self.create_fasta_file_name(original_header)
+                        written_file_names.append(fasta_file_name)
+
+                        with self.measure("write"), self.open_output_file(fasta_file_name) as file:
+                            file.write(self.format_record(Header, sequence, output.get("line_width")))
+                except (SequenceTypeError, ValueError, TypeError):
+                    # the files of the records before the error are removed, as the partial output of "write"
+                    for written_file_name in written_file_names:
+                        for output_file_name in [written_file_name, written_file_name + ".gzi"]:
+                            if os.path.exists(output_file_name):
+                                os.remove(output_file_name)
+                    raise
+
+            else:
+                name = os.path.basename(self.file_name)
+                if name.endswith(".gz"):
+                    name = name[:-len(".gz")]
+                pipeline_file_name = self.output_file_name(os.path.join(self.output_directory,
+                                                                        os.path.splitext(name)[0] + ".pipeline.fasta"))
+                temporary_file_name = pipeline_file_name + ".part"
+                try:
+                    with self.open_output_file(temporary_file_name, 1024 * 1024) as file:
+                        for Header, sequence, stats, original_header in records:
+                            with self.measure("write"):
+                                file.write(self.format_record(Header, sequence, output.get("line_width")))
+                except (SequenceTypeError, ValueError, TypeError):
+                    for output_file_name in [temporary_file_name, temporary_file_name + ".gzi"]:
+                        if os.path.exists(output_file_name):
+                            os.remove(output_file_name)
+                    raise
+                self.finish_output_file(temporary_file_name, pipeline_file_name)
+
+        # a wrong option that the checks do not catch stops the pipeline while streaming
+        except (ValueError, TypeError) as error:
+            self.show_error("Pipeline Error", str(error))
+            return
+
+        # if a sequence is a protein, display a sequence type error and exit the method.
+        except SequenceTypeError as error:
+            self.show_error("Sequence Type Error", str(error))
+            return
+
+        """ display a confirmation message about the task completion"""
+        self.show_info("Task completed!", "Please check " + self.output_directory + " folder")
+
+    def select_fastq_file(self, file_name):
+        """   method to select a FASTQ file, see select_file   """
+
+        # call the select file method but, abort running te method if returns invalid.
+        if self.select_file(file_name) == "invalid":
+            return "invalid"
+        if not self.is_fastq(self.file_name):
+            self.show_error("Input Error", "Please select a FASTQ file")
+            return "invalid"
+
+    def get_fastq_output_name(self, suffix):
+        """ This method returns the name of an output of the selected FASTQ file, e.g. Output/reads.trimmed.fastq"""
+
+        name = os.path.basename(self.file_name)
+        if name.endswith(".gz"):
+            name = name[:-len(".gz")]
+        return os.path.join(self.output_directory, os.path.splitext(name)[0] + suffix)
+
+    def get_quality_statistics(self, file_name, phred_offset=33):
+        """
+        This method reads a FASTQ file and yields the ID (first word of the header), length,
+        mean Phred quality and Q30 fraction (bases with quality 30 or more) of every read.
+        At the end, it yields None and the number of reads, mean Phred quality and Q30 fraction of every position.
+        The per-position sums are added up for all reads in C: the qualities of a read are spread into 32-bit
+        fields of one large integer, so adding the integers of the reads adds every position at once.
+        """
+
+        import array
+
+        # the qualities below Q30 are deleted to count the bases of Q30 or more, and the table marks those bases
+        low_qualities = bytes(range(min(phred_offset + 30, 256)))
+        q30_table = bytes(int(character >= phred_offset + 30) for character in range(256))
+
+        def get_field_integer(values):
+            # every byte becomes the lowest byte of a little-endian 32-bit field
+            fields = bytearray(4 * len(values))
+            fields[0::4] = values
+            return int.from_bytes(fields, "little")
+
+        def get_fields(integer, length):
+            fields = array.array("I")
+            fields.frombytes(integer.to_bytes(4 * length, "little"))
+            if sys.byteorder == "big":
+                fields.byteswap()
+            return fields
+
+        lengths = collections.Counter()
+        quality_sums = []
+        q30_counts = []
+        quality_integer = 0
+        q30_integer = 0
+        reads_in_integers = 0
+
+        for Header, sequence, quality in self.read_fastq_records(file_name):
+            length = len(quality)
+            lengths[length] += 1
+            with self.measure("compute"):
+                quality_sum = sum(quality) - phred_offset * length
+                q30_count = len(quality.translate(None, low_qualities))
+                quality_integer += get_field_integer(quality)
+                q30_integer += get_field_integer(quality.translate(q30_table))
+                reads_in_integers += 1
+
+                # a field holds the sum of 2 ** 24 qualities of at most 255, so the integers are emptied before
+                if reads_in_integers == 1 << 24:
+                    self.add_position_sums(quality_sums, get_fields(quality_integer, max(lengths)))
+                    self.add_position_sums(q30_counts, get_fields(q30_integer, max(lengths)))
+                    quality_integer = q30_integer = reads_in_integers = 0
+
+            yield (Header[1:].split(" ")[0], length, quality_sum / length if length else 0,
+                   q30_count / length if length else 0)
+
+        maximum_length = max(lengths, default=0)
+        self.add_position_sums(quality_sums, get_fields(quality_integer, maximum_length))
+        self.add_position_sums(q30_counts, get_fields(q30_integer, maximum_length))
+
+        # the number of reads that reach every position
+        reads = list(itertools.accumulate(lengths[length] for length in range(maximum_length, 0, -1)))[::-1]
+        yield None, [(reads[position], (quality_sums[position] - phred_offset * reads[position]) / reads[position],
+                      q30_counts[position] / reads[position]) for position in range(maximum_length)]
+
+    def add_position_sums(self, sums, fields):
+        """ This method adds the fields of a per-position sum to a list of sums, which grows as needed."""
+
+        sums.extend([0] * (len(fields) - len(sums)))
+        for position, value in enumerate(fields):
+            sums[position] += value
+
+    def write_fastq_quality_statistics(self, phred_offset=33, output_format="tsv", file_name=None):
+        """
+        This method writes the quality statistics of a FASTQ file to two tables:
+        the length, mean Phred quality and Q30 fraction of every read, and the number of reads,
+        mean Phred quality and Q30 fraction of every position (from 1) along the reads.
+        The tables are tab separated files, or NumPy ".npz" files with one array per column, see NpzWriter.
+        """
+
+        if self.select_fastq_file(file_name) == "invalid":
+            return
+
+        read_file_name = self.get_fastq_output_name(".read_quality." + output_format)
+        position_file_name = self.get_fastq_output_name(".position_quality." + output_format)
+        if output_format == "tsv":
+            read_file_name = self.output_file_name(read_file_name)
+            position_file_name = self.output_file_name(position_file_name)
+
+        def write_table(table_file_name, columns, rows):
+            temporary_file_name = table_file_name + ".part"
+            if output_format == "tsv":
+                with self.open_output_file(temporary_file_name, 1024 * 1024) as file:
+                    file.write(("\t".join(name for name, typecode in columns) + "\n").encode())
+                    for row in rows:
+                        with self.measure("write"):
+                            file.write(("\t".join(str(round(value, 4)) if isinstance(value, float) else str(value)
+                                                  for value in row) + "\n").encode())
+            else:
+                with self.open_output_file(temporary_file_name, 1024 * 1024, compress=False) as file:
+                    writer = NpzWriter(file, columns, self.output_directory, self.compress_output)
+                    for row in rows:
+                        with self.measure("write"):
+                            writer.add([value.encode() if isinstance(value, str) else value for value in row])
+                    with self.measure("write"):
+                        writer.close()
+            self.finish_output_file(temporary_file_name, table_file_name)
+
+        # the per-read table is written while the file is read, the per-position table at the end
+        statistics = {"reads": 0, "bases": 0, "quality": 0, "Q30": 0}
+
+        def read_rows():
+            for row in self.get_quality_statistics(self.file_name, phred_offset):
+                if row[0] is None:
+                    statistics["positions"] = row[1]
+                    return
+                statistics["reads"] += 1
+                statistics["bases"] += row[1]
+                statistics["quality"] += row[1] * row[2]
+                statistics["Q30"] += row[1] * row[3]
+                yield row
+
+        write_table(read_file_name, [("ID", "S"), ("length", "Q"), ("mean_quality", "d"), ("Q30_fraction", "d")],
+                    read_rows())
+        write_table(position_file_name, [("position", "Q"), ("reads", "Q"), ("mean_quality", "d"),
+                                         ("Q30_fraction", "d")],
+                    ((position + 1,) + row for position, row in enumerate(statistics["positions"])))
+
+        # Display the output on the label
+        bases = max(statistics["bases"], 1)
+        self.show_result("Reads: " + str(statistics["reads"]) + ", mean quality: " +
+                         str(round(statistics["quality"] / bases, 2)) + ", Q30: " +
+                         str(round(100 * statistics["Q30"] / bases, 2)) + "%")
+
+        """ display a confirmation message about the task completion"""
+        self.show_info("Task completed!", "Please check " + self.output_directory + " folder")
+
+    def convert_fastq_to_fasta(self, line_width=None, file_name=None):
+        """
+        This method writes the reads of a FASTQ file to a multi-fasta file without their qualities.
+        With a line width, the sequences are wrapped into lines of that many characters.
+        """
+
+        if self.select_fastq_file(file_name) == "invalid":
+            return
+
+        fasta_file_name = self.create_fasta_file_name(self.file_name)
+        temporary_file_name = fasta_file_name + ".part"
+        with self.open_output_file(temporary_file_name, 1024 * 1024) as file:
+            for Header, sequence in self.read_records(self.file_name, keep_case=True):
+                with self.measure("write"):
+                    file.write(self.format_record(Header, sequence, line_width))
+        self.finish_output_file(temporary_file_name, fasta_file_name)
+
+        """ display a confirmation message about the task completion"""
+        self.show_info("Task completed!", "Please check " + self.output_directory + " folder")
+
+    def trim_fastq(self, quality=20, min_length=1, phred_offset=33, file_name=None):
+        """
+        This method trims the bases below a Phred quality from both ends of every read of a FASTQ file,
+        and writes the reads that keep at least min_length bases to a new FASTQ file.
+        The ends are found in C: the qualities are translated into a mask that is stripped from both sides.
+        """
+
+        if self.select_fastq_file(file_name) == "invalid":
+            return
+
+        # the bases below the quality are zero bytes in the mask
+        mask_table = bytes(int(character >= phred_offset + quality) for character in range(256))
+
+        trimmed_file_name = self.output_file_name(self.get_fastq_output_name(".trimmed.fastq"))
+        temporary_file_name = trimmed_file_name + ".part"
+        number_of_reads = 0
+        number_of_kept_reads = 0
+        with self.open_output_file(temporary_file_name, 1024 * 1024) as file:
+            for Header, sequence, qualities in self.read_fastq_records(self.file_name, keep_case=True):
+                number_of_reads += 1
+                with self.measure("compute"):
+                    mask = qualities.translate(mask_table)
+                    end = len(mask.rstrip(b"\0"))
+                    start = end - len(mask[:end].lstrip(b"\0"))
+                if end - start < min_length:
+                    continue
+                number_of_kept_reads += 1
+                with self.measure("write"):
+                    file.write(b"@" + Header[1:].encode() + b"\n" + sequence[start:end] + b"\n+\n" +
+                               qualities[start:end] + b"\n")
+        self.finish_output_file(temporary_file_name, trimmed_file_name)
+
+        # Display the output on the label
+        self.show_result("Kept " + str(number_of_kept_reads) + " of " + str(number_of_reads) + " reads")
+
+        """ display a confirmation message about the task completion"""
+        self.show_info("Task completed!", "Please check " + self.output_directory + " folder")
+
+    def get_cumulative_counts(self, sequence, base, block_size):
+        """
+        This method counts a base in every block of a sequence(uppercase bytes)
+        and returns the cumulative counts at the block boundaries, starting with 0.
+        """
+
+        # bytes.count scans every block in C, so the sequence is read only once
+        counts = [sequence.count(base, start, start + block_size) for start in range(0, len(sequence), block_size)]
+        return list(itertools.accumulate(counts, initial=0))
+
+    def get_window_counts(self, sequence, base, window, step, number_of_windows):
+        """
+        This method counts a base in every sliding window along a sequence(uppercase bytes).
+        The base is counted once in blocks of the step size, so the whole blocks of a window are
+        the difference of two cumulative counts, and only the rest of a window that is shorter than a step
+        is counted again. Slicing takes every window at once instead of one at a time.
+        """
+
+        length = len(sequence)
+        blocks_per_window, remainder = divmod(window, step)
+
+        cumulative_counts = self.get_cumulative_counts(sequence, base, step)
+        first = cumulative_counts[:number_of_windows]
+        last = cumulative_counts[blocks_per_window:blocks_per_window + number_of_windows]
+        # only the last window can be cut short by the end of the sequence
+        if len(last) < number_of_windows:
+            last.append(cumulative_counts[-1])
+        counts = [last_count - first_count for last_count, first_count in zip(last, first)]
+
+        if remainder:
+            counts = [count + sequence.count(base, min(start + window - remainder, length), min(start + window, length))
+                      for start, count in zip(range(0, length, step), counts)]
+        return counts
+
+    def get_GC_windows(self, sequence, window, step):
+        """
+        This method calculates the GC content and GC skew of sliding windows along a sequence(uppercase bytes),
+        from cumulative G and C counts instead of counting every window again, see get_window_counts.
+        It yields the start, end, GC content and GC skew of every window. Windows stop at the first one
+        that reaches the end of the sequence, which can be shorter than the window size.
+        """
+
+        length = len(sequence)
+        number_of_windows = min(len(range(0, length, step)), -(-max(length - window, 0) // step) + 1)
+
+        with self.measure("compute"):
+            G_counts = self.get_window_counts(sequence, b"G", window, step, number_of_windows)
+            C_counts = self.get_window_counts(sequence, b"C", window, step, number_of_windows)
+
+        for start, G_count, C_count in zip(range(0, length, step), G_counts, C_counts):
+            end = min(start + window, length)
+            GC_skew = 0.0
+            if G_count + C_count:
+                GC_skew = (G_count - C_count) / (G_count + C_count)
+            yield start, end, (G_count + C_count) / (end - start), GC_skew
+
+    def write_GC_windows(self, window=1000, step=None, output_format="bed", file_name=None):
+        """
+        This method calculates the GC content and GC skew of sliding windows along every sequence
+        of a fasta file, with the given window size and step (by default the window size).
+        The windows are written as a BED-like table with the name, start, end, GC content and GC skew
+        of every window, or as a binary array of float32 GC content and GC skew pairs
+        with a JSON file that lists the records and their windows.
+        """
+
+        # call the select file method but, abort running te method if returns invalid.
+        if self.select_file(file_name) == "invalid":
+            return
+
+        if step is None:
+            step = window
+        if window < 1 or step < 1:
+            self.show_error("Window Error", "Please select a window size and step of at least 1")
+            return
+
+        # the output is named after the input, e.g. Output/genome.fasta.gc_windows.bed
+        name = os.path.basename(self.file_name)
+        if name.endswith(".gz"):
+            name = name[:-len(".gz")]
+        if output_format == "bed":
+            windows_file_name = self.output_file_name(os.path.join(self.output_directory, name + ".gc_windows.bed"))
+        else:
+            windows_file_name = self.output_file_name(os.path.join(self.output_directory, name + ".gc_windows.bin"))
+        temporary_file_name = windows_file_name + ".part"
+
+        # the records and their windows in the binary array
+        records = []
+        number_of_windows = 0
+        protein = False
+
+        with self.open_output_file(temporary_file_name) as file:
+            for Header, sequence in self.read_records(self.file_name):
+
+                # GC content can not be calculated for a protein
+                if self.get_sequence_type(sequence) == "protein":
+                    protein = True
+                    break
+
+                # using only the accession number as the name of the sequence
+                record_name = Header.strip(">").split(" ")[0]
+                windows = self.get_GC_windows(sequence, window, step)
+
+                if output_format == "bed":
+                    with self.measure("write"):
+                        file.write("".join(record_name + "\t" + str(start) + "\t" + str(end) + "\t" +
+                                           str(round(GC_content, 4)) + "\t" + str(round(GC_skew, 4)) + "\n"
+                                           for start, end, GC_content, GC_skew in windows).encode())
+                else:
+                    import array
+                    values = array.array("f", itertools.chain.from_iterable((GC_content, GC_skew)
+                                                                            for _, _, GC_content, GC_skew in windows))
+                    with self.measure("write"):
+                        # the array is written in little-endian byte order on every platform
+                        if sys.byteorder == "big":
+                            values.byteswap()
+                        file.write(values.tobytes())
+                    records.append({"name": record_name, "length": len(sequence), "first_window": number_of_windows,
+                                    "windows": len(values) // 2})
+                    number_of_windows += len(values) // 2
+
+        # if a sequence is a protein, display a sequence type error and exit the method.
+        if protein:
+            for output_file_name in [temporary_file_name, temporary_file_name + ".gzi"]:
+                if os.path.exists(output_file_name):
+                    os.remove(output_file_name)
+            self.show_error("Sequence Type Error", "Please select nucleotide sequences to calculate GC content")
+            return
+
+        self.finish_output_file(temporary_file_name, windows_file_name)
+
+        if output_format != "bed":
+            import json
+            with open(windows_file_name + ".json", "w") as file:
+                json.dump({"format": "float32 little-endian, GC content and GC skew of every window",
+                           "window": window, "step": step, "windows": number_of_windows, "records": records},
+                          file, indent=2)
+
+        """ display a confirmation message about the task completion"""
+        self.show_info("Task completed!", "Please check " + self.output_directory + " folder")
+
+    def decode_kmer(self, code, k):
+        """   method to unpack the integer code of a k-mer into its bases   """
+
+        return "".join("ACGT"[(code >> (2 * position)) & 3] for position in range(k - 1, -1, -1))
+
+    def write_kmer_run(self, counts, run_file_name):
+        """
+        This method writes the counts of the k-mers of a part of a file as a sorted run.
+        The k-mers are folded into their canonical form, the smaller of the k-mer and its reverse complement,
+        and written as little-endian pairs of 64-bit canonical codes and counts, sorted by code.
+        A k-mer and its reverse complement are both in the run, and are added up when the runs are merged.
+        """
+
+        import array
+        from operator import itemgetter, methodcaller
+
+        with self.measure("compute"):
+            # every step maps over all k-mers at once, in C
+            kmers = list(counts)
+            reverse_complements = map(itemgetter(slice(None, None, -1)),
+                                      map(methodcaller("translate", self.complement_table), kmers))
+            # A < C < G < T, so the smaller bytes also have the smaller code.
+            # the bases become the digits of a base 4 number, which packs them into 2 bits each.
+            codes = list(map(int, map(methodcaller("translate", self.kmer_digit_table),
+                                      map(min, kmers, reverse_complements)), itertools.repeat(4)))
+            order = sorted(range(len(codes)), key=codes.__getitem__)
+            values = array.array("Q", itertools.chain.from_iterable(zip(map(codes.__getitem__, order),
+                                                                        map(list(counts.values()).__getitem__,
+                                                                            order))))
+
+        with self.measure("write"), open(run_file_name, "wb") as file:
+            if sys.byteorder == "big":
+                values.byteswap()
+            file.write(values.tobytes())
+
+    def read_kmer_run(self, run_file_name, block_size=65536):
+        """   method to read the codes and counts of a sorted run of k-mers one block at a time   """
+
+        import array
+
+        with open(run_file_name, "rb") as file:
+            while True:
+                values = array.array("Q")
+                values.frombytes(file.read(block_size * 16))
+                if not values:
+                    return
+                if sys.byteorder == "big":
+                    values.byteswap()
+                yield from zip(values[0::2], values[1::2])
+
+    def merge_kmer_runs(self, runs):
+        """
+        This method merges sorted runs of k-mer codes and counts into one sorted stream,
+        and adds up the counts of the same k-mer. It yields the code and count of every k-mer.
+        """
+
+        import heapq
+
+        previous_code, previous_count = None, 0
+        for code, count in heapq.merge(*runs):
+            if code == previous_code:
+                previous_count += count
+            else:
+                if previous_code is not None:
+                    yield previous_code, previous_count
+                previous_code, previous_count = code, count
+        if previous_code is not None:
+            yield previous_code, previous_count
+
+    def count_kmers_in_records(self, records, k, run_file_name_prefix, max_kmers):
+        """
+        This method counts the k-mers of a stream of records. Windows with bases other than A, C, G, T
+        (or U) are skipped. When more than max_kmers different k-mers are held,
+        they are written to disk as a sorted run, see write_kmer_run.
+        It returns the file names of the runs, or "protein" if a protein sequence is found.
+        """
+
+        import re
+
+        run_file_names = []
+        counts = collections.Counter()
+
+        for Header, sequence in records:
+            # k-mers can not be counted for a protein
+            if self.get_sequence_type(sequence) == "protein":
+                for run_file_name in run_file_names:
+                    os.remove(run_file_name)
+                return "protein"
+            if b"U" in sequence:
+                sequence = sequence.replace(b"U", b"T")
+
+            for fragment in re.finditer(rb"[ACGT]{" + str(k).encode() + rb",}", sequence):
+                fragment = fragment.group()
+
+                # long fragments are counted in pieces that overlap by k - 1 bases, so the memory can be checked
+                for start in range(0, len(fragment) - k + 1, 1024 * 1024):
+                    piece = fragment[start:start + 1024 * 1024 + k - 1]
+                    with self.measure("compute"):
+                        # the k-mers are sliced and counted in C, without a Python loop over the bases
+                        counts.update(map(piece.__getitem__, map(slice, range(len(piece) - k + 1),
+                                                                 range(k, len(piece) + 1))))
+
+                    if len(counts) > max_kmers:
+                        run_file_names.append(run_file_name_prefix + "." + str(len(run_file_names)))
+                        self.write_kmer_run(counts, run_file_names[-1])
+                        counts = collections.Counter()
+
+        if counts or not run_file_names:
+            run_file_names.append(run_file_name_prefix + "." + str(len(run_file_names)))
+            self.write_kmer_run(counts, run_file_names[-1])
+        return run_file_names
+
+    def count_kmers(self, k=21, top=20, workers=1, memory_limit=512 * 1024 * 1024, file_name=None):
+        """
+        This method counts the canonical k-mers (k up to 31) of a multi-fasta file.
+        With more than one worker, the records of an uncompressed file are counted on a process pool.
+        The counts are kept below the memory limit by writing sorted runs to disk,
+        and the runs of all workers are merged into a binary count table of little-endian pairs
+        of 64-bit k-mer codes (2 bits for every base, A=0, C=1, G=2, T=3) and counts, sorted by code,
+        after a header with "KMER", k as a 32-bit integer and the number of k-mers as a 64-bit integer.
+        The top k-mers by count are written to a tab separated summary.
+        """
+
+        # call the select file method but, abort running te method if returns invalid.
+        if self.select_file(file_name) == "invalid":
+            return
+
+        if not 1 <= k <= 31:
+            self.show_error("K-mer Size Error", "Please select a k-mer size from 1 to 31")
+            return
+
+        # the output is named after the input, e.g. Output/genome.fasta.k21.kmers
+        name = os.path.basename(self.file_name)
+        if name.endswith(".gz"):
+            name = name[:-len(".gz")]
+        table_file_name = self.output_file_name(os.path.join(self.output_directory, name + ".k" + str(k) + ".kmers"))
+        top_file_name = self.output_file_name(os.path.join(self.output_directory, name + ".k" + str(k) + ".top.tsv"))
+
+        import heapq
+        import tempfile
+        run_directory = tempfile.mkdtemp(prefix="kmers_", dir=self.output_directory)
+
+        try:
+            # a counted k-mer takes about 150 bytes in a Counter, and every worker has its share of the memory
+            if workers > 1 and get_compression(self.file_name) is None and not self.is_fastq(self.file_name):
+                boundaries = self.find_record_boundaries(self.file_name, workers * 4)
+            else:
+                workers = 1
+                boundaries = [0, None]
+            max_kmers = max(1000, memory_limit // workers // 150)
+            tasks = [(self.file_name, boundaries[chunk], boundaries[chunk + 1], k,
+                      os.path.join(run_directory, "run" + str(chunk)), max_kmers, self.report is not None)
+                     for chunk in range(len(boundaries) - 1)]
+
+            if workers == 1:
+                results = [self.count_kmers_in_records(self.read_records(self.file_name), k, tasks[0][4], max_kmers)]
+            else:
+                from concurrent.futures import ProcessPoolExecutor
+                results = []
+                with ProcessPoolExecutor(max_workers=workers) as executor:
+                    for result, report in executor.map(count_kmers_chunk, tasks):
+                        results.append(result)
+                        # the stages of the workers are added to the run report of this operation
+                        if report is not None and self.report is not None:
+                            self.merge_report(report)
+
+            # if a sequence is a protein, display a sequence type error and exit the method.
+            if "protein" in results:
+                self.show_error("Sequence Type Error", "Please select nucleotide sequences to count k-mers")
+                return
+
+            # the merged counts are written to the run directory first, as their number is needed for the header
+            import array
+            from operator import itemgetter
+            runs = [self.read_kmer_run(run_file_name) for result in results for run_file_name in result]
+            merged = self.merge_kmer_runs(runs)
+            number_of_kmers = 0
+            total_count = 0
+            # the top k-mers by count. nlargest keeps the earlier k-mer, with the smaller code, between equal counts
+            top_kmers = []
+            merged_file_name = os.path.join(run_directory, "merged")
+            with self.measure("write"), open(merged_file_name, "wb") as file:
+                for block in iter(lambda: list(itertools.islice(merged, 65536)), []):
+                    values = array.array("Q", itertools.chain.from_iterable(block))
+                    if sys.byteorder == "big":
+                        values.byteswap()
+                    file.write(values.tobytes())
+
+                    number_of_kmers += len(block)
+                    total_count += sum(map(itemgetter(1), block))
+                    top_kmers = heapq.nlargest(top, top_kmers + block, key=itemgetter(1))
+
+            temporary_file_name = table_file_name + ".part"
+            with self.measure("write"), self.open_output_file(temporary_file_name) as file:
+                file.write(struct.pack("<4sIQ", b"KMER", k, number_of_kmers))
+                with open(merged_file_name, "rb") as merged_file:
+                    shutil.copyfileobj(merged_file, file, 1024 * 1024)
+            self.finish_output_file(temporary_file_name, table_file_name)
+
+            temporary_file_name = top_file_name + ".part"
+            with self.measure("write"), self.open_output_file(temporary_file_name) as file:
+                file.write(("kmer\tcount\n" + "".join(self.decode_kmer(code, k) + "\t" + str(count) + "\n"
+                                                      for code, count in top_kmers)).encode())
+            self.finish_output_file(temporary_file_name, top_file_name)
+
+        finally:
+            shutil.rmtree(run_directory, ignore_errors=True)
+
+        # Display the output on the label
+        self.show_result("Distinct k-mers: " + str(number_of_kmers) + ", total k-mers: " + str(total_count))
+
+        """ display a confirmation message about the task completion"""
+        self.show_info("Task completed!", "Please check " + self.output_directory + " folder")
+
+    def get_sequence_digest(self, sequence, reverse_complement=False):
+        """
+        This method returns the 128-bit BLAKE2b digest of a sequence, ignoring the case of the bases.
+        With reverse_complement, the digest is of the smaller of the sequence and its reverse complement,
+        so a sequence and its reverse complement have the same digest. U is read as T.
+        """
+
+        sequence = sequence.upper()
+        if reverse_complement:
+            if b"U" in sequence:
+                sequence = sequence.replace(b"U", b"T")
+            sequence = min(sequence, sequence.translate(self.iupac_complement_table)[::-1])
+        return hashlib.blake2b(sequence, digest_size=16).digest()
+
+    def remove_duplicate_sequences(self, reverse_complement=False, memory_limit=512 * 1024 * 1024, file_name=None):
+        """
+        This method writes the records of a multi-fasta file without the records whose sequence was seen before,
+        so the first record of every sequence is kept, whatever its header. The sequences are compared by their
+        128-bit digests, see get_sequence_digest, which are kept in a DigestSet.
+        When the digests fill the memory limit, the digests of the rest of the file are written to
+        256 partitions on disk by their last byte. Every partition is then deduplicated on its own, after the digests
+        seen before, and the records kept in the partitions are written in a second pass over the file.
+        """
+
+        # call the select file method but, abort running te method if returns invalid.
+        if self.select_file(file_name) == "invalid":
+            return
+
+        name = os.path.basename(self.file_name)
+        if name.endswith(".gz"):
+            name = name[:-len(".gz")]
+        unique_file_name = self.output_file_name(os.path.join(self.output_directory,
+                                                              os.path.splitext(name)[0] + ".unique.fasta"))
+        temporary_file_name = unique_file_name + ".part"
+
+        import array
+        import heapq
+        import tempfile
+        partition_directory = tempfile.mkdtemp(prefix="dedupe_", dir=self.output_directory)
+
+        try:
+            digests = DigestSet(memory_limit)
+            number_of_records = 0
+            number_of_unique_records = 0
+            # the number of the first record whose digest is written to a partition
+            spill_start = None
+
+            with self.open_output_file(temporary_file_name, 1024 * 1024) as file:
+                for Header, sequence in self.read_records(self.file_name, keep_case=True):
+                    with self.measure("compute"):
+                        digest = self.get_sequence_digest(sequence, reverse_complement)
+
+                    if spill_start is None:
+                        if digests.add(digest):
+                            number_of_unique_records += 1
+                            with self.measure("write"):
+                                self.write_record(file, Header, sequence)
+
+                        if digests.full:
+                            # the digests seen so far go first into the partitions, with the record number 0
+                            spill_start = number_of_records + 1
+                            partitions = [open(os.path.join(partition_directory, str(partition)), "wb")
+                                          for partition in range(256)]
+                            for seen_digest in digests:
+                                partitions[seen_digest[15]].write(seen_digest + bytes(8))
+                            digests = None
+                    else:
+                        # the records after the spill are numbered from 1
+                        partitions[digest[15]].write(digest + struct.pack("<Q", number_of_records - spill_start + 1))
+                    number_of_records += 1
+
+                if spill_start is not None:
+                    for partition in partitions:
+                        partition.close()
+
+                    # the numbers of the records that are kept in every partition, in file order
+                    for partition in range(256):
+                        partition_file_name = os.path.join(partition_directory, str(partition))
+                        partition_digests = DigestSet()
+                        kept = array.array("Q")
+                        with open(partition_file_name, "rb") as partition_file:
+                            for block in iter(lambda: partition_file.read(24 * 65536), b""):
+                                with self.measure("compute"):
+                                    for start in range(0, len(block), 24):
+                                        if partition_digests.add(block[start:start + 16]):
+                                            number = int.from_bytes(block[start + 16:start + 24], "little")
+                                            if number:
+                                                kept.append(number)
+                        with open(partition_file_name, "wb") as partition_file:
+                            kept.tofile(partition_file)
+
+                    def read_kept(partition):
+                        with open(os.path.join(partition_directory, str(partition)), "rb") as partition_file:
+                            for block in iter(lambda: partition_file.read(8 * 65536), b""):
+                                numbers = array.array("Q")
+                                numbers.frombytes(block)
+                                yield from numbers
+
+                    # the second pass writes the kept records after the spill
+                    kept_numbers = heapq.merge(*[read_kept(partition) for partition in range(256)])
+                    next_kept = next(kept_numbers, None)
+                    records = self.read_records(self.file_name, keep_case=True)
+                    for number, (Header, sequence) in enumerate(itertools.islice(records, spill_start, None), 1):
+                        if next_kept is None:
+                            break
+                        if number == next_kept:
+                            number_of_unique_records += 1
+                            with self.measure("write"):
+                                self.write_record(file, Header, sequence)
+                            next_kept = next(kept_numbers, None)
+                    records.close()
+
+        finally:
+            shutil.rmtree(partition_directory, ignore_errors=True)
+
+        self.finish_output_file(temporary_file_name, unique_file_name)
+
+        # Display the output on the label
+        self.show_result("Kept " + str(number_of_unique_records) + " of " + str(number_of_records) + " records, " +
+                         str(number_of_records - number_of_unique_records) + " duplicates removed")
+
+        """ display a confirmation message about the task completion"""
+        self.show_info("Task completed!", "Please check " + self.output_directory + " folder")
+
+    def write_sort_run(self, items, file_name):
+        """
+        This method writes a sorted run of (key, record number) pairs to a text file, one tab separated pair
+        per line. Floats are written with repr, so they are read back exactly.
+        """
+
+        with self.measure("write"), open(file_name, "w", buffering=1024 * 1024) as file:
+            file.writelines(repr(key) + "\t" + str(number) + "\n" if isinstance(key, float) else
+                            str(key) + "\t" + str(number) + "\n" for key, number in items)
+
+    def read_sort_run(self, file_name, key_type):
+        """ This method reads a sorted run of (key, record number) pairs, see write_sort_run."""
+
+        with open(file_name, "r", buffering=1024 * 1024) as file:
+            for line in file:
+                key, number = line.rsplit("\t", 1)
+                yield key_type(key), int(number)
+
+    def sort_records(self, key="length", descending=False, memory_limit=512 * 1024 * 1024, file_name=None):
+        """
+        This method writes the records of a multi-fasta file sorted by sequence length, GC content or ID
+        (the first word of the header). Records with the same key stay in file order.
+        Only the keys and record numbers are sorted: the lengths and IDs come from the memory-mapped ID index,
+        and the GC contents from the statistics cache or a pass over the sequences.
+        When they do not fit in the memory limit, sorted runs are written to disk and merged with heapq.merge.
+        The records are then copied once from the file in sorted order, with their entries read from the ID index
+        on demand, so the index is never loaded into memory. A compressed file is decompressed
+        to a temporary file first, and the records of a packed sequence file are read from their packed bytes.
+        """
+
+        # call the select file method but, abort running te method if returns invalid.
+        if self.select_file(file_name) == "invalid":
+            return
+
+        # the index of a fasta file can not describe FASTQ records
+        if self.is_fastq(self.file_name):
+            self.show_error("Input Error", "Please select a fasta file to sort")
+            return
+
+        name = os.path.basename(self.file_name)
+        if name.endswith(".gz"):
+            name = name[:-len(".gz")]
+        sorted_file_name = self.output_file_name(os.path.join(self.output_directory,
+                                                              os.path.splitext(name)[0] + ".sorted.fasta"))
+        temporary_file_name = sorted_file_name + ".part"
+        compression = get_compression(self.file_name)
+        key_type = {"length": int, "GC": float, "ID": str}[key]
+
+        import heapq
+        import tempfile
+        from operator import itemgetter
+        run_directory = tempfile.mkdtemp(prefix="sort_", dir=self.output_directory)
+        store = None
+        id_index = None
+
+        try:
+            # the key of every record, in file order
+            if compression == "packed":
+                store = PackedFasta(self.file_name)
+                if key == "ID":
+                    keys = (Header[1:].split(" ")[0] for offset, Header in store.records)
+                else:
+                    compositions = (store.get_record_info(number)["composition"]
+                                    for number in range(len(store.records)))
+                    if key == "length":
+                        keys = (composition["length"] for composition in compositions)
+                    else:
+                        keys = (self.get_content(composition, ["G", "C"]) for composition in compositions)
+            else:
+                id_index = self.load_id_index(self.file_name)
+                if key == "length":
+                    keys = (id_index.get_entry(number)[1] for number in range(id_index.number_of_records))
+                elif key != "ID":
+                    stats = self.read_cached_stats(self.file_name)
+                    if stats is None:
+                        stats = (stats for Header, sequence, stats in self.read_records_with_stats(self.file_name))
+                    keys = (self.get_content(record_stats, ["G", "C"]) for record_stats in stats)
+
+            # a key and record number take about 150 bytes in a list of tuples
+            max_items = max(1000, memory_limit // 150)
+            run_file_names = []
+            items = []
+            if key == "ID" and id_index is not None:
+                # the ID index has the names in sorted order, and the same names in file order,
+                # so the runs of these items keep records with the same key in file order too
+                all_items = ((id_index.get_sorted_name(position).decode(), id_index.get_sorted_number(position))
+                             for position in range(id_index.number_of_records))
+            else:
+                all_items = zip(keys, itertools.count())
+            for item in all_items:
+                items.append(item)
+                if len(items) >= max_items:
+                    with self.measure("compute"):
+                        items.sort(key=itemgetter(0), reverse=descending)
+                    run_file_names.append(os.path.join(run_directory, "run" + str(len(run_file_names))))
+                    self.write_sort_run(items, run_file_names[-1])
+                    items = []
+            with self.measure("compute"):
+                items.sort(key=itemgetter(0), reverse=descending)
+            number_of_records = len(items) + max_items * len(run_file_names)
+
+            # the runs are in file order, so heapq.merge keeps records with the same key in file order
+            if run_file_names:
+                runs = [self.read_sort_run(run_file_name, key_type) for run_file_name in run_file_names]
+                items = heapq.merge(*runs, items, key=itemgetter(0), reverse=descending)
+
+            with self.open_output_file(temporary_file_name, 1024 * 1024) as file:
+                if compression == "packed":
+                    for _, number in items:
+                        sequence = store.get_sequence(number)
+                        self.count_progress(len(sequence))
+                        with self.measure("write"):
+                            self.write_record(file, store.records[number][1], sequence,
+                                              store.get_record_info(number)["line_width"])
+                else:
+                    fasta_file_name = self.file_name
+                    if compression is not None:
+                        fasta_file_name = os.path.join(run_directory, "decompressed.fasta")
+                        with self.open_input_file(self.file_name) as input_file, open(fasta_file_name, "wb") as output:
+                            shutil.copyfileobj(input_file, output, 1024 * 1024)
+
+                    with open(fasta_file_name, "rb") as fasta_file:
+                        with mmap.mmap(fasta_file.fileno(), 0, access=mmap.ACCESS_READ) as mapped_file:
+                            for _, number in items:
+                                offset, length, line_bases, line_width = id_index.get_entry(number)
+                                entry = ("", length, offset, line_bases, line_width)
+                                record = self.get_record_bytes(mapped_file, entry)
+                                self.count_progress(len(record))
+                                with self.measure("write"):
+                                    file.write(record)
+
+        finally:
+            if store is not None:
+                store.close()
+            if id_index is not None:
+                id_index.close()
+            shutil.rmtree(run_directory, ignore_errors=True)
+
+        self.finish_output_file(temporary_file_name, sorted_file_name)
+
+        # Display the output on the label
+        self.show_result("Sorted " + str(number_of_records) + " records by " + key)
+
+        """ display a confirmation message about the task completion"""
+        self.show_info("Task completed!", "Please check " + self.output_directory + " folder")
+
+    def find_batch_files(self, source):
+        """
+        This method finds the fasta files of a batch: every fasta, compressed fasta or packed sequence file
+        in a directory tree, or the files that match a glob pattern such as "data/**/*.fa".
+        It returns the files from the largest to the smallest, and the directory their outputs are relative to.
+        """
+
+        extensions = self.fasta_extensions + self.compressed_fasta_extensions + self.packed_fasta_extensions
+        if os.path.isdir(source):
+            base_directory = os.path.abspath(source)
+            file_names = [os.path.join(directory, name) for directory, _, names in os.walk(base_directory)
+                          for name in names]
+        else:
+            import glob
+            file_names = [os.path.abspath(file_name) for file_name in glob.glob(source, recursive=True)]
+            base_directory = None
+
+        file_names = [file_name for file_name in file_names
+                      if file_name.endswith(extensions) and os.path.isfile(file_name)]
+        if file_names and base_directory is None:
+            base_directory = os.path.commonpath([os.path.dirname(file_name) for file_name in file_names])
+
+        # the largest files first, so a large file that comes last does not keep one worker busy alone
+        sizes = {file_name: os.path.getsize(file_name) for file_name in file_names}
+        file_names.sort(key=lambda file_name: (-sizes[file_name], file_name))
+        return file_names, base_directory
+
+    def run_batch(self, source, operation, arguments=(), workers=1, retries=1):
+        """
+        This method runs one operation, given by the name of its method, on every fasta file of a directory tree
+        or glob pattern, see find_batch_files. The files are processed on a process pool, largest first,
+        and small files are sent to the workers in groups so that starting a task costs little.
+        The outputs of a file are written to the output directory under the path of the file relative to the
+        batch, and the outputs of a split into a directory of their own.
+        A file that fails with an exception is retried up to retries times, and the batch goes on.
+        The result of every file is written to batch_manifest.json in the output directory.
+        """
+
+        file_names, base_directory = self.find_batch_files(source)
+        if not file_names:
+            self.show_error("Input Error", "No fasta files found: " + source)
+            return
+        self.file_names = file_names
+
+        # the output directory of every file
+        output_directories = {}
+        for file_name in file_names:
+            output_directory = os.path.join(self.output_directory,
+                                            os.path.relpath(os.path.dirname(file_name), base_directory))
+            if operation == "split_multi_Fasta_file":
+                name = os.path.basename(file_name)
+                if name.endswith(".gz"):
+                    name = name[:-len(".gz")]
+                output_directory = os.path.join(output_directory, os.path.splitext(name)[0])
+            output_directories[file_name] = os.path.normpath(output_directory)
+
+        # the options of the workers. The processes already run in parallel, so every worker compresses on
+        # one thread, and the statistics cache is not used, as one SQLite database is not written by many processes.
+        options = (self.compress_output, 1 if workers > 1 else self.threads)
+
+        # small files are grouped up to 64 files or 8 MB per task
+        tasks = []
+        group = []
+        group_size = 0
+        for file_name in file_names:
+            group.append((file_name, output_directories[file_name]))
+            group_size += os.path.getsize(file_name)
+            if len(group) == 64 or group_size >= 8 * 1024 * 1024:
+                tasks.append((operation, arguments, group, options))
+                group = []
+                group_size = 0
+        if group:
+            tasks.append((operation, arguments, group, options))
+
+        start_time = time.perf_counter()
+        attempts = collections.Counter()
+        results = {}
+
+        def add_results(task_results):
+            """ This function keeps the final results and returns the files that are tried again."""
+
+            retry_files = []
+            for result in task_results:
+                file_name = result["file"]
+                attempts[file_name] += 1
+                result["attempts"] = attempts[file_name]
+                if result.pop("retry") and attempts[file_name] <= retries:
+                    retry_files.append((file_name, output_directories[file_name]))
+                else:
+                    results[file_name] = result
+                    self.count_progress(os.path.getsize(file_name))
+            return retry_files
+
+        if workers <= 1:
+            while tasks:
+                retry_files = add_results(run_batch_files(tasks.pop(0)))
+                tasks.extend((operation, arguments, [retry_file], options) for retry_file in retry_files)
+        else:
+            from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+            from concurrent.futures.process import BrokenProcessPool
+
+            while tasks:
+                executor = ProcessPoolExecutor(max_workers=workers)
+                broken = False
+                try:
+                    futures = {executor.submit(run_batch_files, task): task for task in tasks}
+                    tasks = []
+                    while futures:
+                        done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            task = futures.pop(future)
+                            try:
+                                task_results = future.result()
+                            except BrokenProcessPool:
+                                # a worker has died, the files of its task are tried again in a new pool
+                                broken = True
+                                task_results = [{"file": file_name, "status": "failed", "error": "worker process died",
+                                                 "retry": True, "seconds": 0, "outputs": []}
+                                                for file_name, _ in task[2]]
+                            retry_files = add_results(task_results)
+                            retry_tasks = [(operation, arguments, [retry_file], options) for retry_file in retry_files]
+                            if broken:
+                                tasks.extend(retry_tasks)
+                            else:
+                                for retry_task in retry_tasks:
+                                    futures[executor.submit(run_batch_files, retry_task)] = retry_task
+                finally:
+                    # a cancelled batch does not wait for the files that have not started
+                    executor.shutdown(wait=True, cancel_futures=True)
+
+        # the manifest with the result of every file, in the order of the files
+        import json
+        failed = [result for result in results.values() if result["status"] != "ok"]
+        manifest = {
+            "source": source,
+            "operation": operation,
+            "arguments": list(arguments),
+            "files": len(results),
+            "succeeded": len(results) - len(failed),
+            "failed": len(failed),
+            "retried": sum(1 for result in results.values() if result["attempts"] > 1),
+            "bytes": sum(os.path.getsize(file_name) for file_name in results),
+            "wall_seconds": round(time.perf_counter() - start_time, 3),
+            "results": [results[file_name] for file_name in sorted(results)],
+        }
+        manifest_file_name = os.path.join(self.output_directory, "batch_manifest.json")
+        with open(manifest_file_name, "w") as file:
+            json.dump(manifest, file, indent=2)
+
+        # Display the output on the label
+        self.show_result("Processed " + str(len(results)) + " files, " + str(len(failed)) + " failed")
+        if failed:
+            self.show_error("Batch Error", str(len(failed)) + " files failed, please check " + manifest_file_name)
+        else:
+            """ display a confirmation message about the task completion"""
+            self.show_info("Task completed!", "Please check " + self.output_directory + " folder")
+
+
+def annotate_chunk(task):
+    """
+    This function runs in a worker process.
+    It annotates the records of one byte range of a multi-fasta file and writes them to a part file.
+    Only the number of records, or "protein", is sent back to the main process,
+    together with the run report of the worker if the operation is instrumented
+    and the statistics of the records for the statistics cache.
+    """
+
+    file_name, start, end, part_file_name, annotation, bases, content_name, instrumented = task
+    sequence = Sequence()
+    if instrumented:
+        sequence.start_report("annotate_chunk", trace_memory=False)
+
+    rows = []
+
+    def read_records_with_stats():
+        for Header, record_sequence in sequence.read_records(file_name, start, end):
+            stats = sequence.get_record_stats(record_sequence)
+            rows.append(tuple(stats[column] for column in StatsCache.columns))
+            yield Header, record_sequence, stats
+
+    with open(part_file_name, "wb") as file:
+        result = sequence.write_annotated_records(file, read_records_with_stats(), annotation, bases, content_name)
+
+    if instrumented:
+        return result, sequence.finish_report(), rows
+    return result, None, rows
+
+
+def count_kmers_chunk(task):
+    """
+    This function runs in a worker process.
+    It counts the k-mers of one byte range of a multi-fasta file and writes them to sorted runs on disk.
+    Only the file names of the runs, or "protein", are sent back to the main process,
+    together with the run report of the worker if the operation is instrumented.
+    """
+
+    file_name, start, end, k, run_file_name_prefix, max_kmers, instrumented = task
+    sequence = Sequence()
+    if instrumented:
+        sequence.start_report("count_kmers_chunk", trace_memory=False)
+
+    result = sequence.count_kmers_in_records(sequence.read_records(file_name, start, end), k, run_file_name_prefix,
+                                             max_kmers)
+
+    if instrumented:
+        return result, sequence.finish_report()
+    return result, None
+
+
+def run_batch_files(task):
+    """
+    This function runs in a worker process.
+    It runs the operation of a batch on a group of files, each with its own output directory.
+    Messages are collected instead of shown, and an error message fails the file.
+    It returns the result of every file, with whether it should be tried again after an exception.
+    """
+
+    import queue
+
+    operation, arguments, files, (compress_output, threads) = task
+    results = []
+    for file_name, output_directory in files:
+        # the output directory of the batch, or of another file, is not removed with the outputs of this file
+        made_output_directory = not os.path.isdir(output_directory)
+        os.makedirs(output_directory, exist_ok=True)
+        sequence = Sequence(output_directory=output_directory)
+        sequence.compress_output = compress_output
+        sequence.threads = threads
+        sequence.use_stats_cache = False
+        sequence.messages = queue.SimpleQueue()
+
+        start_time = time.perf_counter()
+        error = None
+        retry = False
+        try:
+            getattr(sequence, operation)(*arguments, file_name=file_name)
+        except Exception as exception:
+            sequence.remove_output_files()
+            error = type(exception).__name__ + ": " + str(exception)
+            retry = True
+
+        while not sequence.messages.empty():
+            message = sequence.messages.get()
+            if message[0] == "error" and error is None:
+                error = message[1] + ": " + message[2]
+
+        output_files = sorted(set(output_file_name for output_file_name in sequence.output_files
+                                  if not output_file_name.endswith(".part") and os.path.exists(output_file_name)))
+        # a file without outputs leaves no empty output directory behind
+        if not output_files and made_output_directory and not os.listdir(output_directory):
+            os.rmdir(output_directory)
+        results.append({"file": file_name, "status": "failed" if error else "ok", "error": error, "retry": retry,
+                        "seconds": round(time.perf_counter() - start_time, 4), "outputs": output_files})
+    return results
+
+
+def run_gui():
+    """ This function builds the tkinter window and runs the GUI."""
+
+    import tkinter as tk
+    from tkinter import ttk
+    from tkinter import messagebox
+    import threading
+    import queue
+
+    # Create a tkinter window object
+    window = tk.Tk()
+
+    # Set the dimensions of the window
+    window.geometry("1000x700")
+
+    # Set the title of the window
+    window.title("Fasta Processor")
+    # disable window resizable
+    window.resizable(False, False)
+
+    # making a directory to store output files.
+    Dir = "Output"
+    if not os.path.exists(Dir):
+        os.mkdir("Output")
+
+    """ ------------set background color using a canvas  -------------------  """
+
+    canvas = tk.Canvas(window, width=1000, height=700)
+    canvas.config(background="#4ce44c")
+    canvas.pack(fill="both", expand=True)
+
+    """-------------------------background tasks---------------------------------------------"""
+    # the operation running on the worker thread, if any
+    background = {"task": None, "start_time": 0, "total_bytes": 0, "reports": False}
+
+    def run_in_background(operation, *arguments, multiple_files=False):
+        """
+        This function selects the input files on the main thread and then
+        runs the operation on a worker thread, so the window stays responsive.
+        """
+
+        # only one operation runs at a time
+        if background["task"] is not None:
+            return
+
+        task = Sequence(label1)
+        task.compress_output = compress_outputs.get()
+        if multiple_files:
+            if task.select_files() == "invalid":
+                return
+            input_files = task.file_names
+            keyword_arguments = {"file_names": input_files}
+        else:
+            if task.select_file() == "invalid":
+                return
+            input_files = [task.file_name]
+            keyword_arguments = {"file_name": task.file_name}
+
+        # from now on the task posts its messages to the main thread through a queue
+        task.messages = queue.Queue()
+        background["task"] = task
+        background["start_time"] = time.time()
+        background["total_bytes"] = sum(os.path.getsize(file_name) for file_name in input_files)
+
+        # the run report and the profile are saved in Output/reports, named after the operation and the time
+        report_file_name = None
+        profile_file_name = None
+        if write_report.get() or write_profile.get():
+            os.makedirs(os.path.join("Output", "reports"), exist_ok=True)
+            file_prefix = os.path.join("Output", "reports", operation.__name__ + "_" + time.strftime("%Y%m%d_%H%M%S"))
+            if write_report.get():
+                report_file_name = file_prefix + ".json"
+            if write_profile.get():
+                profile_file_name = file_prefix + ".prof"
+        background["reports"] = report_file_name is not None or profile_file_name is not None
+
+        def work():
+            try:
+                task.run_operation(operation.__name__, lambda: operation(task, *arguments, **keyword_arguments),
+                                   report_file_name, profile_file_name)
+            except OperationCancelled:
+                task.remove_output_files()
+                task.messages.put(("result", "Cancelled"))
+            except Exception as error:
+                task.remove_output_files()
+                task.messages.put(("error", "Error", str(error)))
+            finally:
+                task.close_stats_cache()
+            task.messages.put(("done",))
+
+        progress_bar["value"] = 0
+        cancel_button.config(state="normal")
+        threading.Thread(target=work, daemon=True).start()
+        window.after(100, check_background_task)
+
+    def check_background_task():
+        """
+        This function runs on the main thread every 100 ms while an operation is running.
+        It shows the messages of the worker thread and updates the progress bar.
+        """
+
+        task = background["task"]
+
+        while not task.messages.empty():
+            message = task.messages.get()
+            if message[0] == "result":
+                label1.config(text=message[1])
+            elif message[0] == "info":
+                messagebox.showinfo(message[1], message[2])
+            elif message[0] == "error":
+                messagebox.showerror(message[1], message[2])
+            elif message[0] == "done":
+                # the operation has finished
+                if not task.cancelled:
+                    progress_bar["value"] = 100
+                progress_label.config(text="Report saved in Output/reports" if background["reports"] else "")
+                cancel_button.config(state="disabled")
+                background["task"] = None
+                return
+
+        # progress is measured by the bytes read from the input files
+        elapsed_time = time.time() - background["start_time"]
+        total_bytes = background["total_bytes"]
+        if total_bytes > 0:
+            progress_bar["value"] = min(100, 100 * task.bytes_read / total_bytes)
+
+        progress_text = str(round(task.records_read / elapsed_time)) + " records/s" if elapsed_time > 0 else ""
+        if task.bytes_read > 0:
+            remaining_time = elapsed_time * (total_bytes - task.bytes_read) / task.bytes_read
+            progress_text += ", ETA " + str(round(max(remaining_time, 0))) + " s"
+        progress_label.config(text=progress_text)
+
+        window.after(100, check_background_task)
+
+    def cancel_background_task():
+        """ This function asks the running operation to stop. Its partial output is removed."""
+
+        if background["task"] is not None:
+            background["task"].cancelled = True
+            cancel_button.config(state="disabled")
+
+    """-------------------------buttons and labels---------------------------------------------"""
+    # Button background color and font
+    bttn_bg_color = "#000000"
+    bttn_font_size = "Calibri 13"
+
+    # welcome message label
+    label = tk.Label(canvas, text="Welcome to Fasta Processor!", font="Helvetica 35 bold", bg="#4ce44c",
+                     foreground="white")
+
+    # GUI buttons
+    button1 = tk.Button(canvas, text="Split multi-fasta file \n into separate files"
+                        , command=lambda: run_in_background(Fasta.split_multi_Fasta_file), foreground=bttn_bg_color,
+                        font=bttn_font_size, height=2, width=24)
+
+    button2 = tk.Button(canvas, text="Calculate the number of \n fasta sequences in a file"
+                        , command=lambda: run_in_background(Fasta.number_of_Fasta_sequences), foreground=bttn_bg_color,
+                        font=bttn_font_size, height=2, width=24)
+
+    button3 = tk.Button(canvas, text="Combine multiple fasta files \n into a single multi-fasta file"
+                        , command=lambda: run_in_background(Fasta.combine_multiple_Fasta_files, multiple_files=True)
+                        , foreground=bttn_bg_color,
+                        font=bttn_font_size, height=2, width=24)
+
+    button4 = tk.Button(canvas, text="Remove unwanted characters \n from a nucleotide sequence"
+                        , command=lambda: run_in_background(Sequence.remove_unwanted_from_nucleotide)
+                        , foreground=bttn_bg_color,
+                        font=bttn_font_size, height=2, width=24)
+
+    button5 = tk.Button(canvas, text="Remove unwanted characters \n from a protein sequence"
+                        , command=lambda: run_in_background(Sequence.remove_unwanted_from_protein)
+                        , foreground=bttn_bg_color,
+                        font=bttn_font_size, height=2, width=24)
+
+    button6 = tk.Button(canvas, text="Add sequence length \n to the fasta header"
+                        , command=lambda: run_in_background(Sequence.add_sequence_length_to_header)
+                        , foreground=bttn_bg_color,
+                        font=bttn_font_size, height=2, width=24)
+
+    button7 = tk.Button(canvas, text="Add sequence lengths \n to respective fasta headers"
+                        , command=lambda: run_in_background(Sequence.add_sequence_lengths_to_headers)
+                        , foreground=bttn_bg_color,
+                        font=bttn_font_size, height=2, width=24)
+
+    button8 = tk.Button(canvas, text="Get AT content"
+                        , command=lambda: run_in_background(Sequence.get_AT_content), foreground=bttn_bg_color,
+                        font=bttn_font_size, height=2, width=24)
+
+    button9 = tk.Button(canvas, text="Get GC content"
+                        , command=lambda: run_in_background(Sequence.get_GC_content), foreground=bttn_bg_color,
+                        font=bttn_font_size, height=2, width=24)
+
+    # This is the output label
+    label1 = tk.Label(canvas, text="", font="Calibri 25 bold", height=1, width=30, background="white",
+                      foreground="#4ce44c")
+
+    # Use the grid geometry manager to align the labels and radio buttons
+    label.grid(row=0, column=0, columnspan=4, padx=5)
+    button1.grid(row=1, column=0, padx=10)
+    button2.grid(row=1, column=1, padx=10)
+    button3.grid(row=1, column=2, padx=10)
+    button4.grid(row=1, column=3, padx=10)
+    button5.grid(row=2, column=0, padx=10)
+    button6.grid(row=2, column=1, padx=10)
+    button7.grid(row=2, column=2, padx=10)
+    button8.grid(row=2, column=3, padx=10)
+    button9.grid(row=3, column=0, padx=10)
+    label1.grid(row=4, column=0, columnspan=4, padx=10)
+
+    # progress of the running operation, and the button to cancel it
+    progress_frame = tk.Frame(canvas, background="#4ce44c")
+    progress_frame.grid(row=5, column=0, columnspan=4, padx=10)
+    progress_bar = ttk.Progressbar(progress_frame, length=250, maximum=100)
+    progress_label = tk.Label(progress_frame, text="", font="Calibri 12", width=30, background="#4ce44c")
+    cancel_button = tk.Button(progress_frame, text="Cancel", command=cancel_background_task, foreground=bttn_bg_color,
+                              font=bttn_font_size, width=10, state="disabled")
+    progress_bar.grid(row=0, column=0, padx=10)
+    progress_label.grid(row=0, column=1, padx=10)
+    cancel_button.grid(row=0, column=2, padx=10)
+
+    # compressed outputs, and the optional run report and cProfile dump of the next operation
+    compress_outputs = tk.BooleanVar()
+    write_report = tk.BooleanVar()
+    write_profile = tk.BooleanVar()
+    compress_check = tk.Checkbutton(progress_frame, text="BGZF output", variable=compress_outputs,
+                                    background="#4ce44c", font="Calibri 12")
+    report_check = tk.Checkbutton(progress_frame, text="Run report", variable=write_report, background="#4ce44c",
+                                  font="Calibri 12")
+    profile_check = tk.Checkbutton(progress_frame, text="Profile", variable=write_profile, background="#4ce44c",
+                                   font="Calibri 12")
+    compress_check.grid(row=0, column=3, padx=5)
+    report_check.grid(row=0, column=4, padx=5)
+    profile_check.grid(row=0, column=5, padx=5)
+
+    # use grid_column and row configure to place
+    # the buttons equally spaced.
+    canvas.grid_columnconfigure(0, minsize=115, weight=1)
+    canvas.grid_columnconfigure(1, minsize=115, weight=1)
+    canvas.grid_columnconfigure(2, minsize=115, weight=1)
+    canvas.grid_columnconfigure(3, minsize=115, weight=1)
+
+    canvas.grid_rowconfigure(0, minsize=110, weight=1)
+    canvas.grid_rowconfigure(1, minsize=110, weight=1)
+    canvas.grid_rowconfigure(2, minsize=110, weight=1)
+    canvas.grid_rowconfigure(3, minsize=110, weight=1)
+    canvas.grid_rowconfigure(4, minsize=110, weight=1)
+    canvas.grid_rowconfigure(5, minsize=50, weight=1)
+
+    """ ---------- Frame 1 contains  add_content_to_header_and_write method and its two radio buttons. ----------"""
+    frame1 = tk.Frame(canvas, borderwidth=2, relief="solid", background="#4ce44c")
+    frame1.grid(row=3, column=1)
+    # select content type
+    label2 = tk.Label(frame1, text="Select content type", font="Calibri 12", background="#4ce44c")
+
+    # using tkinter StringVar to select content type
+    content_type_1 = tk.StringVar()
+    content_type_1.set("AT")  # set the default value to AT content
+
+    radio1 = tk.Radiobutton(frame1, text="AT content", variable=content_type_1, value="AT", background="#4ce44c"
+                            , font="Calibri 12")
+
+    radio2 = tk.Radiobutton(frame1, text="GC content", variable=content_type_1, value="GC", background="#4ce44c"
+                            , font="Calibri 12")
+
+    # select sequence type
+    label3 = tk.Label(frame1, text="Select sequence type", font="Calibri 12", background="#4ce44c")
+
+    # using tkinter StringVar to select sequence type
+    sequence_type_1 = tk.StringVar()
+    sequence_type_1.set("DNA")  # set the default value to DNA sequence type
+
+    radio3 = tk.Radiobutton(frame1, text="DNA", variable=sequence_type_1, value="DNA", background="#4ce44c"
+                            , font="Calibri 12")
+
+    radio4 = tk.Radiobutton(frame1, text="RNA", variable=sequence_type_1, value="RNA", background="#4ce44c"
+                            , font="Calibri 12")
+
+    button10 = tk.Button(frame1, text="Add content to header"
+                         , command=lambda: run_in_background(Sequence.add_content_to_header_and_write,
+                                                           content_type_1.get(), sequence_type_1.get())
+                         , foreground=bttn_bg_color,
+                         font=bttn_font_size, height=1, width=21)
+
+    # Use the grid geometry manager to align the labels and radio buttons
+    label2.grid(row=0, column=0, columnspan=2)
+    radio1.grid(row=1, column=0, sticky="W")
+    radio2.grid(row=1, column=1, sticky="W")
+
+    label3.grid(row=2, column=0, columnspan=2)
+    radio3.grid(row=3, column=0, sticky="W")
+    radio4.grid(row=3, column=1, sticky="W")
+    button10.grid(row=4, column=0, columnspan=2)
+
+    """ ---------- Frame 2 contains  add_contents_to_headers_and_write method and its two radio buttons. ----"""
+    frame2 = tk.Frame(canvas, borderwidth=2, relief="solid", background="#4ce44c")
+    frame2.grid(row=3, column=2)
+    # select content type
+    label4 = tk.Label(frame2, text="Select content type", font="Calibri 12", background="#4ce44c")
+
+    # using tkinter StringVar to select content type
+    content_type_2 = tk.StringVar()
+    content_type_2.set("AT")  # set the default value to AT content
+
+    radio5 = tk.Radiobutton(frame2, text="AT content", variable=content_type_2, value="AT", background="#4ce44c"
+                            , font="Calibri 12")
+
+    radio6 = tk.Radiobutton(frame2, text="GC content", variable=content_type_2, value="GC", background="#4ce44c"
+                            , font="Calibri 12")
+
+    # select sequence type
+    label5 = tk.Label(frame2, text="Select sequence type", font="Calibri 12", background="#4ce44c")
+
+    # using tkinter StringVar to select sequence type
+    sequence_type_2 = tk.StringVar()
+    sequence_type_2.set("DNA")  # set the default value to DNA sequence type
+
+    radio7 = tk.Radiobutton(frame2, text="DNA", variable=sequence_type_2, value="DNA", background="#4ce44c"
+                            , font="Calibri 12")
+
+    radio8 = tk.Radiobutton(frame2, text="RNA", variable=sequence_type_2, value="RNA", background="#4ce44c"
+                            , font="Calibri 12")
+
+    button11 = tk.Button(frame2, text=" Add contents to headers "
+                         , command=lambda: run_in_background(Sequence.add_contents_to_headers_and_write,
+                                                           content_type_2.get(), sequence_type_2.get())
+                         , foreground=bttn_bg_color,
+                         font=bttn_font_size, height=1, width=21)
+
+    # Use the grid geometry manager to align the labels and radio buttons
+    label4.grid(row=0, column=0, columnspan=2)
+    radio5.grid(row=1, column=0, sticky="W")
+    radio6.grid(row=1, column=1, sticky="W")
+
+    label5.grid(row=2, column=0, columnspan=2)
+    radio7.grid(row=3, column=0, sticky="W")
+    radio8.grid(row=3, column=1, sticky="W")
+    button11.grid(row=4, column=0, columnspan=2)
+
+    """ ---------- Frame 3 contains the pipeline: the stages to run on every record in a single pass. ----------"""
+    frame3 = tk.Frame(canvas, borderwidth=2, relief="solid", background="#4ce44c")
+    frame3.grid(row=3, column=3)
+    label6 = tk.Label(frame3, text="Pipeline", font="Calibri 12", background="#4ce44c")
+
+    # using tkinter BooleanVar to select the stages
+    pipeline_clean = tk.BooleanVar()
+    pipeline_length = tk.BooleanVar()
+    pipeline_content = tk.BooleanVar()
+    pipeline_split = tk.BooleanVar()
+    check1 = tk.Checkbutton(frame3, text="Clean", variable=pipeline_clean, background="#4ce44c", font="Calibri 12")
+    check2 = tk.Checkbutton(frame3, text="Length", variable=pipeline_length, background="#4ce44c",
+                            font="Calibri 12")
+    check3 = tk.Checkbutton(frame3, text="GC content", variable=pipeline_content, background="#4ce44c",
+                            font="Calibri 12")
+    check4 = tk.Checkbutton(frame3, text="Split", variable=pipeline_split, background="#4ce44c", font="Calibri 12")
+
+    # the minimum sequence length of the filter stage
+    label7 = tk.Label(frame3, text="Min length", font="Calibri 12", background="#4ce44c")
+    min_length = tk.Entry(frame3, width=8, font="Calibri 12")
+
+    def run_pipeline():
+        """ This function builds the stages of the pipeline from the panel and runs it."""
+
+        stages = []
+        if pipeline_clean.get():
+            stages.append({"stage": "clean"})
+        if min_length.get().strip():
+            if not min_length.get().strip().isdigit():
+                messagebox.showerror("Input Error", "Please enter a whole number as the minimum length")
+                return
+            stages.append({"stage": "filter", "min_length": int(min_length.get())})
+        if pipeline_length.get():
+            stages.append({"stage": "length"})
+        if pipeline_content.get():
+            stages.append({"stage": "content", "content_type": "GC"})
+        stages.append({"stage": "split" if pipeline_split.get() else "write"})
+        run_in_background(Sequence.run_pipeline, stages)
+
+    button12 = tk.Button(frame3, text="Run pipeline", command=run_pipeline, foreground=bttn_bg_color,
+                         font=bttn_font_size, height=1, width=21)
+
+    # Use the grid geometry manager to align the labels and check buttons
+    label6.grid(row=0, column=0, columnspan=2)
+    check1.grid(row=1, column=0, sticky="W")
+    check2.grid(row=1, column=1, sticky="W")
+    check3.grid(row=2, column=0, sticky="W")
+    check4.grid(row=2, column=1, sticky="W")
+    label7.grid(row=3, column=0, sticky="W")
+    min_length.grid(row=3, column=1, sticky="W")
+    button12.grid(row=4, column=0, columnspan=2)
+
+    """ ----------------------last code line    ------------------"""
+    # Run the tkinter event loop
+    window.mainloop()
+
+
+def build_argument_parser():
+    """ This function creates the parser of the command line interface."""
+
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="Fasta.py", description="Fasta Processor without the GUI. "
+                                                                  "Run without arguments to open the GUI.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    # options shared by every command
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--output-dir", default="Output", help="directory of the output files (default: Output)")
+    common.add_argument("--report", metavar="FILE", help="write a JSON run report with the time, CPU time, bytes, "
+                                                         "records and peak memory of every stage to FILE "
+                                                         "(- prints it)")
+    common.add_argument("--profile", metavar="FILE", help="run the command under cProfile and dump the statistics "
+                                                          "to FILE")
+    common.add_argument("--compress", action="store_true", help="write the output files as BGZF with a .gzi index")
+    common.add_argument("--no-cache", action="store_true", help="do not use the statistics cache of the output "
+                                                                "directory")
+    common.add_argument("--cache-size-mb", type=int, default=256,
+                        help="size limit of the statistics cache (default: 256)")
+    common.add_argument("--threads", type=int, default=min(4, os.cpu_count() or 1),
+                        help="number of threads that decompress and compress BGZF blocks (default: up to 4)")
+
+    split = subparsers.add_parser("split", parents=[common], help="split a multi-fasta file into separate files")
+    split.add_argument("file")
+    split.add_argument("--records-per-file", type=int, help="write shards of this many records instead of one file "
+                                                            "per record")
+    split.add_argument("--bytes-per-file", type=int, help="write shards of about this many bytes instead of one file "
+                                                          "per record")
+    split.add_argument("--line-width", type=int, help="wrap the sequences into lines of this width")
+
+    count = subparsers.add_parser("count", parents=[common], help="print the number of fasta sequences in a file")
+    count.add_argument("file")
+
+    combine = subparsers.add_parser("combine", parents=[common],
+                                    help="combine multiple fasta files into a single multi-fasta file")
+    combine.add_argument("files", nargs="+")
+    combine.add_argument("--duplicate-headers", choices=["keep", "rename", "error"], default="keep",
+                         help="what to do with records whose accession number was seen before (default: keep)")
+    combine.add_argument("--normalize", action="store_true", help="rewrite the records as unwrapped uppercase "
+                                                                  "sequences instead of copying them")
+
+    clean = subparsers.add_parser("clean", parents=[common], help="remove unwanted characters from sequences")
+    clean.add_argument("file")
+    clean.add_argument("--protein", action="store_true", help="clean protein sequences instead of nucleotides")
+    clean.add_argument("--alphabet", choices=list(Sequence.alphabets),
+                       help="characters to keep (default: IUPAC strict, or 25 amino acids with --protein)")
+
+    lengths = subparsers.add_parser("lengths", parents=[common], help="add sequence lengths to the fasta headers")
+    lengths.add_argument("file")
+    lengths.add_argument("--separate", action="store_true", help="write every sequence to a separate file")
+    lengths.add_argument("--workers", type=int, default=1, help="number of worker processes (default: 1)")
+    lengths.add_argument("--incremental", action="store_true", help="process only the records appended to the file "
+                                                                    "since the last incremental run")
+    lengths.add_argument("--table", choices=["tsv", "npz"], help="write a table of per-record statistics instead "
+                                                                  "of rewriting the headers")
+
+    content = subparsers.add_parser("content", parents=[common],
+                                    help="print the AT/GC content of a sequence, or add it to the fasta headers")
+    content.add_argument("file")
+    content.add_argument("--content-type", choices=["AT", "GC"], default="GC")
+    content.add_argument("--sequence-type", choices=["DNA", "RNA"], default="DNA")
+    content.add_argument("--annotate", action="store_true", help="add the contents to the headers of a multi-fasta "
+                                                                 "file")
+    content.add_argument("--separate", action="store_true", help="add the contents to the headers and write every "
+                                                                 "sequence to a separate file")
+    content.add_argument("--workers", type=int, default=1, help="number of worker processes (default: 1)")
+    content.add_argument("--incremental", action="store_true", help="with --annotate, process only the records "
+                                                                    "appended to the file since the last "
+                                                                    "incremental run")
+    content.add_argument("--table", choices=["tsv", "npz"], help="write a table of per-record statistics instead "
+                                                                  "of rewriting the headers")
+
+    windows = subparsers.add_parser("windows", parents=[common],
+                                    help="write the GC content and GC skew of sliding windows along the sequences")
+    windows.add_argument("file")
+    windows.add_argument("--window", type=int, default=1000, help="window size in bases (default: 1000)")
+    windows.add_argument("--step", type=int, help="distance between the window starts (default: the window size)")
+    windows.add_argument("--format", choices=["bed", "binary"], default="bed",
+                         help="a BED-like table, or a float32 array with a JSON list of the records (default: bed)")
+
+    kmers = subparsers.add_parser("kmers", parents=[common], help="count the canonical k-mers of a multi-fasta file")
+    kmers.add_argument("file")
+    kmers.add_argument("-k", type=int, default=21, help="k-mer size, up to 31 (default: 21)")
+    kmers.add_argument("--top", type=int, default=20, help="number of k-mers in the summary (default: 20)")
+    kmers.add_argument("--workers", type=int, default=1, help="number of worker processes (default: 1)")
+    kmers.add_argument("--memory-mb", type=int, default=512,
+                       help="memory for the counts before sorted runs are written to disk (default: 512)")
+
+    dedupe = subparsers.add_parser("dedupe", parents=[common],
+                                   help="remove the records whose sequence was seen before, keeping the first one")
+    dedupe.add_argument("file")
+    dedupe.add_argument("--reverse-complement", action="store_true",
+                        help="treat a sequence and its reverse complement as the same sequence")
+    dedupe.add_argument("--memory-mb", type=int, default=512,
+                        help="memory for the sequence digests before they are partitioned on disk (default: 512)")
+
+    sort = subparsers.add_parser("sort", parents=[common],
+                                 help="sort the records of a multi-fasta file by length, GC content or ID")
+    sort.add_argument("file")
+    sort.add_argument("--key", choices=["length", "GC", "ID"], default="length", help="sort key (default: length)")
+    sort.add_argument("--descending", action="store_true", help="sort from the largest key to the smallest")
+    sort.add_argument("--memory-mb", type=int, default=512,
+                      help="memory for the sort keys before sorted runs are written to disk (default: 512)")
+
+    pipeline = subparsers.add_parser("pipeline", parents=[common],
+                                     help="run clean, length, content and filter stages and write the records "
+                                          "in a single pass")
+    pipeline.add_argument("file")
+    pipeline.add_argument("--spec", required=True,
+                          help="JSON file with the list of stages, e.g. "
+                               "[{\"stage\": \"clean\"}, {\"stage\": \"length\"}, {\"stage\": \"write\"}]")
+
+    fastq_stats = subparsers.add_parser("fastq-stats", parents=[common],
+                                        help="write per-read and per-position quality statistics of a FASTQ file")
+    fastq_stats.add_argument("file")
+    fastq_stats.add_argument("--format", choices=["tsv", "npz"], default="tsv",
+                             help="tab separated tables, or NumPy .npz files (default: tsv)")
+    fastq_stats.add_argument("--phred-offset", type=int, default=33, help="offset of the quality characters "
+                                                                          "(default: 33)")
+
+    fastq_to_fasta = subparsers.add_parser("fastq-to-fasta", parents=[common],
+                                           help="write the reads of a FASTQ file to a fasta file")
+    fastq_to_fasta.add_argument("file")
+    fastq_to_fasta.add_argument("--line-width", type=int, help="wrap the sequences into lines of this width")
+
+    trim = subparsers.add_parser("trim", parents=[common],
+                                 help="trim low quality bases from both ends of the reads of a FASTQ file")
+    trim.add_argument("file")
+    trim.add_argument("--quality", type=int, default=20, help="lowest Phred quality kept at the ends (default: 20)")
+    trim.add_argument("--min-length", type=int, default=1, help="shortest trimmed read kept (default: 1)")
+    trim.add_argument("--phred-offset", type=int, default=33, help="offset of the quality characters (default: 33)")
+
+    pack = subparsers.add_parser("pack", parents=[common],
+                                 help="convert a nucleotide fasta file into a packed sequence file (.fa2b)")
+    pack.add_argument("file")
+
+    unpack = subparsers.add_parser("unpack", parents=[common],
+                                   help="restore the fasta file of a packed sequence file (.fa2b)")
+    unpack.add_argument("file")
+
+    extract = subparsers.add_parser("extract", parents=[common],
+                                    help="write the records with the given IDs, or matching a regex, to a new file")
+    extract.add_argument("file")
+    selection = extract.add_mutually_exclusive_group(required=True)
+    selection.add_argument("--ids", metavar="FILE", help="file with one ID (first word of a header) per line")
+    selection.add_argument("--id", action="append", help="an ID to extract, can be given more than once")
+    selection.add_argument("--regex", help="regular expression searched in the IDs")
+
+    batch = subparsers.add_parser("batch", parents=[common],
+                                  help="run an operation on every fasta file of a directory tree or glob pattern")
+    batch.add_argument("source", help="a directory, or a glob pattern such as 'data/**/*.fa' (quoted)")
+    batch.add_argument("operation", choices=["clean", "clean-protein", "lengths", "content", "split", "pack"])
+    batch.add_argument("--alphabet", choices=list(Sequence.alphabets),
+                       help="characters kept by clean (default: IUPAC strict, or 25 amino acids for clean-protein)")
+    batch.add_argument("--content-type", choices=["AT", "GC"], default="GC")
+    batch.add_argument("--sequence-type", choices=["DNA", "RNA"], default="DNA")
+    batch.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                       help="number of worker processes (default: number of CPUs)")
+    batch.add_argument("--retries", type=int, default=1,
+                       help="times a file that fails with an exception is tried again (default: 1)")
+
+    return parser
+
+
+def main(arguments=None):
+    """
+    This function is the entry point of the program.
+    Without arguments it opens the GUI, otherwise it runs one command without the GUI
+    and returns the exit status.
+    """
+
+    if arguments is None:
+        arguments = sys.argv[1:]
+    if not arguments:
+        run_gui()
+        return 0
+
+    arguments = build_argument_parser().parse_args(arguments)
+
+    # making a directory to store output files.
+    os.makedirs(arguments.output_dir, exist_ok=True)
+    sequence = Sequence(output_directory=arguments.output_dir)
+    sequence.compress_output = arguments.compress
+    sequence.threads = max(1, arguments.threads)
+    sequence.use_stats_cache = not arguments.no_cache
+    sequence.stats_cache_size = arguments.cache_size_mb * 1024 * 1024
+
+    # the command runs as one operation, so it can be instrumented as a whole
+    def run():
+        if arguments.command == "split":
+            sequence.split_multi_Fasta_file(arguments.file, arguments.records_per_file, arguments.bytes_per_file,
+                                            arguments.line_width)
+        elif arguments.command == "count":
+            sequence.number_of_Fasta_sequences(arguments.file)
+        elif arguments.command == "combine":
+            sequence.combine_multiple_Fasta_files(arguments.files, arguments.duplicate_headers, arguments.normalize)
+        elif arguments.command == "clean":
+            if arguments.protein:
+                sequence.remove_unwanted_from_protein(arguments.alphabet or "25 amino acids", arguments.file)
+            else:
+                sequence.remove_unwanted_from_nucleotide(arguments.alphabet or "IUPAC strict", arguments.file)
+        elif arguments.command == "lengths":
+            if arguments.separate:
+                sequence.add_sequence_length_to_header(arguments.file)
+            else:
+                sequence.add_sequence_lengths_to_headers(arguments.workers, arguments.file, arguments.incremental,
+                                                         arguments.table)
+        elif arguments.command == "content":
+            if arguments.separate:
+                sequence.add_content_to_header_and_write(arguments.content_type, arguments.sequence_type,
+                                                         arguments.file)
+            elif arguments.annotate or arguments.table:
+                sequence.add_contents_to_headers_and_write(arguments.content_type, arguments.sequence_type,
+                                                           arguments.workers, arguments.file, arguments.incremental,
+                                                           arguments.table)
+            elif arguments.content_type == "AT":
+                sequence.get_AT_content(arguments.file)
+            else:
+                sequence.get_GC_content(arguments.file)
+        elif arguments.command == "windows":
+            sequence.write_GC_windows(arguments.window, arguments.step, arguments.format, arguments.file)
+        elif arguments.command == "pack":
+            sequence.pack_Fasta_file(arguments.file)
+        elif arguments.command == "unpack":
+            sequence.unpack_Fasta_file(arguments.file)
+        elif arguments.command == "extract":
+            ids = arguments.id
+            if arguments.ids is not None:
+                with open(arguments.ids, "r") as file:
+                    ids = file.read().splitlines()
+            sequence.extract_records(ids, arguments.regex, arguments.file)
+        elif arguments.command == "batch":
+            # the method and arguments of every batch operation
+            operations = {
+                "clean": ("remove_unwanted_from_nucleotide", (arguments.alphabet or "IUPAC strict",)),
+                "clean-protein": ("remove_unwanted_from_protein", (arguments.alphabet or "25 amino acids",)),
+                "lengths": ("add_sequence_lengths_to_headers", ()),
+                "content": ("add_contents_to_headers_and_write", (arguments.content_type, arguments.sequence_type)),
+                "split": ("split_multi_Fasta_file", ()),
+                "pack": ("pack_Fasta_file", ()),
+            }
+            operation, operation_arguments = operations[arguments.operation]
+            sequence.run_batch(arguments.source, operation, operation_arguments, arguments.workers, arguments.retries)
+        elif arguments.command == "dedupe":
+            sequence.remove_duplicate_sequences(arguments.reverse_complement, arguments.memory_mb * 1024 * 1024,
+                                                arguments.file)
+        elif arguments.command == "sort":
+            sequence.sort_records(arguments.key, arguments.descending, arguments.memory_mb * 1024 * 1024,
+                                  arguments.file)
+        elif arguments.command == "pipeline":
+            try:
+                stages = sequence.read_pipeline_spec(arguments.spec)
+            except (OSError, ValueError) as error:
+                sequence.show_error("Pipeline Error", str(error))
+            else:
+                sequence.run_pipeline(stages, arguments.file)
+        elif arguments.command == "fastq-stats":
+            sequence.write_fastq_quality_statistics(arguments.phred_offset, arguments.format, arguments.file)
+        elif arguments.command == "fastq-to-fasta":
+            sequence.convert_fastq_to_fasta(arguments.line_width, arguments.file)
+        elif arguments.command == "trim":
+            sequence.trim_fastq(arguments.quality, arguments.min_length, arguments.phred_offset, arguments.file)
+        elif arguments.command == "kmers":
+            sequence.count_kmers(arguments.k, arguments.top, arguments.workers, arguments.memory_mb * 1024 * 1024,
+                                 arguments.file)
+
+    try:
+        sequence.run_operation(arguments.command, run, arguments.report, arguments.profile)
+    except FastaIndexError as error:
+        # the operations that read records by their offsets need an index of the file
+        sequence.show_error("Index Error", str(error))
+    except FastqFormatError as error:
+        # a FASTQ file is checked while it is read, so a broken record stops the operation
+        sequence.show_error("FASTQ Error", str(error))
+    finally:
+        sequence.close_stats_cache()
+
+    return 1 if sequence.failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,281 @@
+"""
+Project: FASTA processor
+Inputs: Optional size of the synthetic inputs, a baseline file and a regression threshold.
+Outputs: A table of the timings, and optionally a JSON file with the results.
+  Description:    This program generates seeded synthetic FASTA files of different shapes,
+            runs every operation of Fasta.py on them without the GUI and reports
+            MB/s, records/s and peak memory. It fails when an operation is slower
+            than a stored baseline by more than the threshold.
+"""
+# import necessary packages
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import shutil
+import tempfile
+import subprocess
+
+# the shapes of the synthetic inputs: number of records per MB of input, alphabet and line width.
+# Shapes without records_per_mb have a fixed number of records whose length grows with the input size.
+SHAPES = {
+    "many_short_dna_unwrapped": {"records_per_mb": 5000, "records": None, "alphabet": "ACGT", "line_width": 0},
+    "many_short_dna_wrapped": {"records_per_mb": 5000, "records": None, "alphabet": "ACGT", "line_width": 60},
+    "few_huge_dna_wrapped": {"records_per_mb": None, "records": 4, "alphabet": "ACGTN", "line_width": 60},
+    "single_huge_dna_wrapped": {"records_per_mb": None, "records": 1, "alphabet": "ACGT", "line_width": 70},
+    "many_short_protein_wrapped": {"records_per_mb": 2500, "records": None, "alphabet": "ACDEFGHIKLMNPQRSTVWYX",
+                                   "line_width": 60},
+}
+
+# the operations of Fasta.py, and whether they need a nucleotide input or a file with only one record
+OPERATIONS = {
+    "split": {"nucleotide": False, "single": False},
+    "count": {"nucleotide": False, "single": False},
+    "combine": {"nucleotide": False, "single": False},
+    "clean_nucleotide": {"nucleotide": True, "single": False},
+    "clean_protein": {"nucleotide": False, "single": False},
+    "length_separate": {"nucleotide": False, "single": False},
+    "lengths": {"nucleotide": False, "single": False},
+    "content_separate": {"nucleotide": True, "single": False},
+    "contents": {"nucleotide": True, "single": False},
+    "AT_content": {"nucleotide": True, "single": True},
+    "GC_content": {"nucleotide": True, "single": True},
+    "GC_windows": {"nucleotide": True, "single": False},
+    "kmers": {"nucleotide": True, "single": False},
+    "dedupe": {"nucleotide": False, "single": False},
+    "sort": {"nucleotide": False, "single": False},
+    "stats_table": {"nucleotide": False, "single": False},
+    "pipeline": {"nucleotide": True, "single": False},
+}
+
+
+def generate_fasta(file_name, size, shape, seed):
+    """
+    This function writes a synthetic fasta file of about size bytes with the given shape.
+    The sequences are cut from a random pool of letters, so even multi-GB files are generated quickly.
+    """
+
+    generator = random.Random(seed)
+    pool = "".join(generator.choices(shape["alphabet"], k=1024 * 1024)).encode()
+
+    if shape["records"] is None:
+        number_of_records = max(1, size * shape["records_per_mb"] // (1024 * 1024))
+    else:
+        number_of_records = shape["records"]
+    record_length = max(1, size // number_of_records)
+
+    with open(file_name, "wb", buffering=1024 * 1024) as file:
+        for record in range(number_of_records):
+            file.write(b">synthetic_" + str(record).encode() + b" seed " + str(seed).encode() + b"\n")
+
+            # writing the sequence in pieces of the pool, starting at random places.
+            # the pieces are whole lines, so every line but the last has the same width.
+            piece_size = len(pool) // 2
+            if shape["line_width"]:
+                piece_size -= piece_size % shape["line_width"]
+            remaining = record_length
+            while remaining > 0:
+                start = generator.randrange(len(pool) // 2)
+                piece = pool[start:start + min(remaining, piece_size)]
+                remaining -= len(piece)
+                if shape["line_width"]:
+                    piece = b"\n".join([piece[i:i + shape["line_width"]]
+                                        for i in range(0, len(piece), shape["line_width"])])
+                file.write(piece + b"\n")
+
+    return number_of_records
+
+
+def run_operation(operation, file_name, output_directory):
+    """
+    This function runs one operation of Fasta.py in this process and returns its time and peak memory.
+    It is run in a separate process for every measurement, so the peak memory belongs to one operation.
+    """
+
+    import io
+    import resource
+    import contextlib
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    import Fasta
+
+    sequence = Fasta.Sequence(output_directory=output_directory)
+    calls = {
+        "split": lambda: sequence.split_multi_Fasta_file(file_name),
+        "count": lambda: sequence.number_of_Fasta_sequences(file_name),
+        "combine": lambda: sequence.combine_multiple_Fasta_files([file_name, file_name]),
+        "clean_nucleotide": lambda: sequence.remove_unwanted_from_nucleotide(file_name=file_name),
+        "clean_protein": lambda: sequence.remove_unwanted_from_protein(file_name=file_name),
+        "length_separate": lambda: sequence.add_sequence_length_to_header(file_name),
+        "lengths": lambda: sequence.add_sequence_lengths_to_headers(file_name=file_name),
+        "content_separate": lambda: sequence.add_content_to_header_and_write("GC", "DNA", file_name),
+        "contents": lambda: sequence.add_contents_to_headers_and_write("GC", "DNA", file_name=file_name),
+        "AT_content": lambda: sequence.get_AT_content(file_name),
+        "GC_content": lambda: sequence.get_GC_content(file_name),
+        "GC_windows": lambda: sequence.write_GC_windows(file_name=file_name),
+        "kmers": lambda: sequence.count_kmers(file_name=file_name),
+        "dedupe": lambda: sequence.remove_duplicate_sequences(file_name=file_name),
+        "sort": lambda: sequence.sort_records(file_name=file_name),
+        "stats_table": lambda: sequence.write_stats_table(file_name=file_name),
+        "pipeline": lambda: sequence.run_pipeline([{"stage": "clean"}, {"stage": "length"},
+                                                   {"stage": "content", "content_type": "GC"}], file_name),
+    }
+
+    # the index is part of what "count" measures
+    if operation == "count" and os.path.exists(file_name + ".fai"):
+        os.remove(file_name + ".fai")
+
+    start_time = time.perf_counter()
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            calls[operation]()
+    finally:
+        sequence.close_stats_cache()
+    seconds = time.perf_counter() - start_time
+
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    peak_memory = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform != "darwin":
+        peak_memory *= 1024
+
+    return {"seconds": seconds, "peak_memory": peak_memory, "failed": sequence.failed}
+
+
+def run_benchmarks(arguments):
+    """
+    This function generates the inputs, measures every operation on every shape and
+    returns the results as a list of dictionaries, and the operations that failed.
+    """
+
+    work_directory = arguments.work_dir or tempfile.mkdtemp(prefix="fasta_benchmark_")
+    os.makedirs(work_directory, exist_ok=True)
+    size = arguments.size_mb * 1024 * 1024
+
+    results = []
+    failures = []
+    for shape_name in arguments.shapes:
+        shape = SHAPES[shape_name]
+
+        # generated inputs are reused when the same size and seed are asked again
+        file_name = os.path.join(work_directory, shape_name + "_" + str(arguments.size_mb) + "mb_seed" +
+                                 str(arguments.seed) + ".fasta")
+        records_file_name = file_name + ".records"
+        if not os.path.exists(records_file_name):
+            number_of_records = generate_fasta(file_name, size, shape, arguments.seed)
+            with open(records_file_name, "w") as file:
+                file.write(str(number_of_records))
+        with open(records_file_name, "r") as file:
+            number_of_records = int(file.read())
+        file_size = os.path.getsize(file_name)
+
+        for operation in arguments.operations:
+            # skipping operations that do not apply to this shape
+            if OPERATIONS[operation]["nucleotide"] and "protein" in shape_name:
+                continue
+            if OPERATIONS[operation]["single"] and number_of_records > 1:
+                continue
+
+            output_directory = tempfile.mkdtemp(prefix="output_", dir=work_directory)
+            process = subprocess.run([sys.executable, os.path.abspath(__file__), "--run-operation", operation,
+                                      file_name, output_directory], capture_output=True, text=True)
+            shutil.rmtree(output_directory, ignore_errors=True)
+
+            if process.returncode != 0:
+                print("Failed: " + shape_name + " " + operation + "\n" + process.stderr, file=sys.stderr)
+                failures.append(shape_name + " " + operation)
+                continue
+            measurement = json.loads(process.stdout.splitlines()[-1])
+
+            # an operation that displays an error finishes without an exception, but its time is not comparable
+            if measurement["failed"]:
+                print("Failed: " + shape_name + " " + operation + " displayed an error", file=sys.stderr)
+                failures.append(shape_name + " " + operation)
+                continue
+
+            seconds = max(measurement["seconds"], 1e-9)
+            results.append({
+                "shape": shape_name,
+                "operation": operation,
+                "seconds": round(seconds, 4),
+                "MB/s": round(file_size / seconds / (1024 * 1024), 2),
+                "records/s": round(number_of_records / seconds, 1),
+                "peak_memory_MB": round(measurement["peak_memory"] / (1024 * 1024), 1),
+            })
+            print_result(results[-1])
+
+    return results, failures
+
+
+def print_result(result):
+    """ This function prints one result as a row of the table."""
+
+    print(result["shape"].ljust(30) + result["operation"].ljust(18) + str(result["seconds"]).rjust(10) +
+          str(result["MB/s"]).rjust(12) + str(result["records/s"]).rjust(14) + str(result["peak_memory_MB"]).rjust(10))
+    sys.stdout.flush()
+
+
+def compare_with_baseline(results, baseline_file_name, threshold):
+    """
+    This function compares the results with a stored baseline.
+    It returns the list of operations that are slower than the baseline by more than the threshold.
+    """
+
+    with open(baseline_file_name, "r") as file:
+        baseline = {(result["shape"], result["operation"]): result for result in json.load(file)}
+
+    regressions = []
+    for result in results:
+        previous = baseline.get((result["shape"], result["operation"]))
+        if previous is None:
+            continue
+        if result["seconds"] > previous["seconds"] * (1 + threshold):
+            regressions.append(result["shape"] + " " + result["operation"] + ": " + str(result["seconds"]) +
+                               " s, baseline " + str(previous["seconds"]) + " s")
+    return regressions
+
+
+def main():
+    """ This function runs the benchmarks from the command line and returns the exit status."""
+
+    # the measurement of a single operation, run in its own process
+    if len(sys.argv) == 5 and sys.argv[1] == "--run-operation":
+        print(json.dumps(run_operation(sys.argv[2], sys.argv[3], sys.argv[4])))
+        return 0
+
+    parser = argparse.ArgumentParser(description="Benchmarks of the Fasta Processor operations.")
+    parser.add_argument("--size-mb", type=int, default=64, help="size of every synthetic input (default: 64)")
+    parser.add_argument("--seed", type=int, default=1, help="seed of the synthetic inputs (default: 1)")
+    parser.add_argument("--shapes", nargs="+", choices=list(SHAPES), default=list(SHAPES))
+    parser.add_argument("--operations", nargs="+", choices=list(OPERATIONS), default=list(OPERATIONS))
+    parser.add_argument("--work-dir", help="directory for the synthetic inputs, reused between runs")
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--baseline", help="JSON results of an earlier run to compare with")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="allowed slowdown compared to the baseline (default: 0.25 for 25%%)")
+    arguments = parser.parse_args()
+
+    print("shape".ljust(30) + "operation".ljust(18) + "seconds".rjust(10) + "MB/s".rjust(12) + "records/s".rjust(14) +
+          "peak MB".rjust(10))
+    results, failures = run_benchmarks(arguments)
+
+    if arguments.output:
+        with open(arguments.output, "w") as file:
+            json.dump(results, file, indent=2)
+
+    status = 0
+    if failures:
+        print("Failed operations:\n" + "\n".join(failures), file=sys.stderr)
+        status = 1
+
+    if arguments.baseline:
+        regressions = compare_with_baseline(results, arguments.baseline, arguments.threshold)
+        if regressions:
+            print("Regressions compared to the baseline:\n" + "\n".join(regressions), file=sys.stderr)
+            status = 1
+
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
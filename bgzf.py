@@ -0,0 +1,268 @@
+"""
+Project: FASTA processor
+  Description:    Reading and writing BGZF files, the blocked gzip files of samtools and bgzip,
+            with their ".gzi" block index. The blocks are decompressed and compressed on a thread pool.
+"""
+# import necessary packages
+import io
+import os
+import zlib
+import bisect
+import struct
+import collections
+
+
+def inflate_block(block):
+    """
+    This function decompresses one BGZF block and checks it against its CRC32 and size.
+    zlib releases the GIL while it works, so blocks are decompressed in parallel on a thread pool.
+    """
+
+    extra_length = struct.unpack("<H", block[10:12])[0]
+    crc, size = struct.unpack("<II", block[-8:])
+    data = zlib.decompress(block[12 + extra_length:-8], -15, max(size, 1))
+    if len(data) != size or zlib.crc32(data) != crc:
+        raise OSError("Corrupt BGZF block")
+    return data
+
+
+def deflate_block(data, level):
+    """ This function compresses up to 64 KB of data into one BGZF block."""
+
+    compressor = zlib.compressobj(level, zlib.DEFLATED, -15)
+    compressed_data = compressor.compress(data) + compressor.flush()
+    # the header holds the size of the whole block minus one: 18 bytes of header, the data and 8 bytes of trailer
+    header = struct.pack("<BBBBIBBHBBHH", 31, 139, 8, 4, 0, 0, 255, 6, 66, 67, 2, len(compressed_data) + 25)
+    return header + compressed_data + struct.pack("<II", zlib.crc32(data), len(data))
+
+
+def read_gzi_index(file_name):
+    """
+    This function reads the ".gzi" index of a BGZF file, if there is one that is newer than the file.
+    It returns the list of (compressed offset, uncompressed offset) of every block, or None.
+    """
+
+    index_file_name = file_name + ".gzi"
+    if not os.path.exists(index_file_name) or os.stat(index_file_name).st_mtime_ns < os.stat(file_name).st_mtime_ns:
+        return None
+    with open(index_file_name, "rb") as file:
+        data = file.read()
+    number_of_entries = struct.unpack("<Q", data[:8])[0]
+    offsets = struct.unpack("<" + str(2 * number_of_entries) + "Q", data[8:8 + 16 * number_of_entries])
+    # the first block, at offset 0 in both files, is not stored
+    return [(0, 0)] + [(offsets[entry], offsets[entry + 1]) for entry in range(0, len(offsets), 2)]
+
+
+def write_gzi_index(file_name, blocks):
+    """ This function writes the ".gzi" index of a BGZF file in the format used by samtools and bgzip."""
+
+    with open(file_name + ".gzi", "wb") as file:
+        file.write(struct.pack("<Q", len(blocks) - 1))
+        for compressed_offset, uncompressed_offset in blocks[1:]:
+            file.write(struct.pack("<QQ", compressed_offset, uncompressed_offset))
+
+
+class BgzfReader(io.RawIOBase):
+    """
+    Reads the decompressed bytes of a BGZF file.
+    The compressed blocks are read ahead and decompressed on a thread pool,
+    and seeking uses the ".gzi" index of the file if there is one.
+    """
+
+    def __init__(self, file_name, threads=4):
+        super().__init__()
+        self.file_name = file_name
+        self.file = open(file_name, "rb")
+        self.threads = threads
+        self.executor = None
+        # blocks being decompressed, in file order, and the decompressed block being read
+        self.pending = collections.deque()
+        self.data = b""
+        self.data_position = 0
+        # uncompressed position of the next byte, and the offsets of the blocks read from the start of the file
+        self.position = 0
+        self.blocks = []
+        self.end_of_file = False
+        self.index = read_gzi_index(file_name)
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def read_block(self):
+        """ This method reads the next compressed block of the file, or returns None at the end of the file."""
+
+        header = self.file.read(18)
+        if len(header) < 18:
+            return None
+        if header[:4] != b"\x1f\x8b\x08\x04" or header[12:14] != b"BC":
+            raise OSError("Not a BGZF file: " + self.file_name)
+        block_size = struct.unpack("<H", header[16:18])[0] + 1
+        return header + self.file.read(block_size - 18)
+
+    def queue_blocks(self):
+        """ This method keeps a few blocks per thread waiting to be decompressed."""
+
+        if self.executor is None:
+            from concurrent.futures import ThreadPoolExecutor
+            self.executor = ThreadPoolExecutor(max_workers=self.threads)
+
+        while not self.end_of_file and len(self.pending) < self.threads * 4:
+            compressed_offset = self.file.tell()
+            block = self.read_block()
+            if block is None:
+                self.end_of_file = True
+                break
+            self.pending.append((self.executor.submit(inflate_block, block), compressed_offset))
+
+    def readinto(self, buffer):
+        # moving to the next decompressed block when the current one has been read
+        while self.data_position >= len(self.data):
+            self.queue_blocks()
+            if not self.pending:
+                return 0
+            future, compressed_offset = self.pending.popleft()
+            self.data = future.result()
+            self.data_position = 0
+            # the empty block at the end of the file is not indexed
+            if self.blocks is not None and self.data:
+                self.blocks.append((compressed_offset, self.position))
+
+        size = min(len(buffer), len(self.data) - self.data_position)
+        buffer[:size] = self.data[self.data_position:self.data_position + size]
+        self.data_position += size
+        self.position += size
+        return size
+
+    def tell(self):
+        return self.position
+
+    def write_index(self):
+        """ This method writes the ".gzi" index of a file that has been read to the end from the start."""
+
+        if self.end_of_file and not self.pending and self.blocks:
+            write_gzi_index(self.file_name, self.blocks)
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_CUR:
+            offset += self.position
+        elif whence != io.SEEK_SET:
+            raise OSError("BGZF files can only be searched from the start")
+
+        # starting from the block before the offset if the file has an index, and from the start otherwise
+        if offset != self.position:
+            block = (0, 0)
+            if self.index is not None:
+                uncompressed_offsets = [entry[1] for entry in self.index]
+                block = self.index[bisect.bisect_right(uncompressed_offsets, offset) - 1]
+            for future, compressed_offset in self.pending:
+                future.cancel()
+            self.pending.clear()
+            # the blocks are no longer read from the start of the file
+            self.blocks = None
+            self.file.seek(block[0])
+            self.data = b""
+            self.data_position = 0
+            self.position = block[1]
+            self.end_of_file = False
+
+            # skipping the bytes between the start of the block and the offset
+            skip_buffer = bytearray(1024 * 1024)
+            while self.position < offset:
+                if self.readinto(memoryview(skip_buffer)[:min(len(skip_buffer), offset - self.position)]) == 0:
+                    break
+        return self.position
+
+    def close(self):
+        if not self.closed:
+            if self.executor is not None:
+                for future, compressed_offset in self.pending:
+                    future.cancel()
+                self.executor.shutdown()
+            self.file.close()
+        super().close()
+
+
+class BgzfWriter(io.RawIOBase):
+    """
+    Writes a BGZF file, a gzip file made of independent blocks of at most 64 KB that any gzip reader can read.
+    The blocks are compressed on a thread pool, and a ".gzi" index of the blocks is written
+    next to the file when it is closed, so the file stays randomly accessible.
+    """
+
+    # uncompressed bytes per block, as used by bgzip
+    block_size = 65280
+    # the empty block that marks the end of a BGZF file
+    end_of_file_block = bytes.fromhex("1f8b08040000000000ff0600424302001b0003000000000000000000")
+
+    def __init__(self, file_name, threads=4, level=6):
+        super().__init__()
+        self.file_name = file_name
+        self.file = open(file_name, "wb")
+        self.threads = threads
+        self.level = level
+        from concurrent.futures import ThreadPoolExecutor
+        self.executor = ThreadPoolExecutor(max_workers=threads)
+        # data waiting for a full block, blocks being compressed in file order, and the offsets of the blocks written
+        self.buffer = bytearray()
+        self.pending = collections.deque()
+        self.blocks = []
+        self.compressed_offset = 0
+        self.uncompressed_offset = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        view = memoryview(data).cast("B")
+        start = 0
+
+        # filling up the block started by earlier writes
+        if self.buffer:
+            start = min(len(view), self.block_size - len(self.buffer))
+            self.buffer += view[:start]
+            if len(self.buffer) < self.block_size:
+                return len(view)
+            self.compress_block(bytes(self.buffer))
+            self.buffer = bytearray()
+
+        while len(view) - start >= self.block_size:
+            self.compress_block(bytes(view[start:start + self.block_size]))
+            start += self.block_size
+
+        self.buffer += view[start:]
+        return len(view)
+
+    def compress_block(self, data):
+        """ This method compresses a block on the thread pool, writing finished blocks when enough are waiting."""
+
+        self.pending.append((self.executor.submit(deflate_block, data, self.level), len(data)))
+        while len(self.pending) > self.threads * 4:
+            self.write_block()
+
+    def write_block(self):
+        """ This method writes the oldest compressed block to the file."""
+
+        future, size = self.pending.popleft()
+        block = future.result()
+        self.blocks.append((self.compressed_offset, self.uncompressed_offset))
+        self.file.write(block)
+        self.compressed_offset += len(block)
+        self.uncompressed_offset += size
+
+    def close(self):
+        if not self.closed:
+            try:
+                if self.buffer:
+                    self.compress_block(bytes(self.buffer))
+                    self.buffer = bytearray()
+                while self.pending:
+                    self.write_block()
+                self.file.write(self.end_of_file_block)
+                write_gzi_index(self.file_name, self.blocks or [(0, 0)])
+            finally:
+                self.executor.shutdown()
+                self.file.close()
+        super().close()
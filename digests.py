@@ -0,0 +1,88 @@
+"""
+Project: FASTA processor
+  Description:    A compact set of the 16-byte sequence digests used to find duplicate sequences.
+"""
+
+
+class DigestSet:
+    """
+    A set of 16-byte digests kept in one bytearray, as an open addressing hash table with linear probing.
+    A digest takes one 16-byte slot and the table is at most half full, so a digest takes 32 to 64 bytes
+    instead of about 100 in a set of bytes objects. An all-zero slot is empty.
+    When the table would grow beyond the size limit, it is marked as full instead.
+    """
+
+    empty = bytes(16)
+
+    def __init__(self, size_limit=None, number_of_slots=1024):
+        self.size_limit = size_limit
+        self.table = bytearray(16 * number_of_slots)
+        self.mask = number_of_slots - 1
+        self.count = 0
+        self.full = False
+        # the all-zero digest can not be kept in the table
+        self.has_empty = False
+
+    def __len__(self):
+        return self.count
+
+    def get_size(self):
+        """ This method returns the size of the table in bytes."""
+
+        return len(self.table)
+
+    def add(self, digest):
+        """ This method adds a digest to the set. It returns True if the digest is new."""
+
+        table = self.table
+        mask = self.mask
+        slot = hash(digest) & mask
+        while True:
+            stored = table[16 * slot:16 * slot + 16]
+            if stored == digest:
+                # the all-zero digest matches an empty slot, and is kept apart
+                if digest == self.empty:
+                    return self.add_empty()
+                return False
+            if stored == self.empty:
+                break
+            slot = (slot + 1) & mask
+        if digest == self.empty:
+            return self.add_empty()
+        table[16 * slot:16 * slot + 16] = digest
+        self.count += 1
+
+        if 2 * self.count > mask + 1:
+            if self.size_limit is not None and 2 * len(table) > self.size_limit:
+                self.full = True
+            else:
+                self.resize()
+        return True
+
+    def add_empty(self):
+        """ This method adds the all-zero digest to the set. It returns True if the digest is new."""
+
+        new = not self.has_empty
+        self.has_empty = True
+        self.count += new
+        return new
+
+    def resize(self):
+        """ This method doubles the number of slots and places the digests again."""
+
+        table = self.table
+        self.table = bytearray(2 * len(table))
+        self.mask = 2 * self.mask + 1
+        self.count = int(self.has_empty)
+        for start in range(0, len(table), 16):
+            digest = table[start:start + 16]
+            if digest != self.empty:
+                self.add(bytes(digest))
+
+    def __iter__(self):
+        if self.has_empty:
+            yield self.empty
+        for start in range(0, len(self.table), 16):
+            digest = self.table[start:start + 16]
+            if digest != self.empty:
+                yield bytes(digest)
@@ -0,0 +1,103 @@
+"""
+Project: FASTA processor
+  Description:    Writing tables of numbers and strings as NumPy ".npz" archives without NumPy.
+"""
+# import necessary packages
+import os
+import sys
+import shutil
+import struct
+
+
+class NpzWriter:
+    """
+    Writes columns of numbers and strings to a NumPy ".npz" file, a zip archive with one ".npy" array per column,
+    without NumPy. The columns have the typecodes "Q" (64-bit unsigned integers), "d" (64-bit floats)
+    or "S" (bytes strings, padded with zero bytes to the longest one). The rows are added to array buffers,
+    which are written to a temporary file per column when they are full, so the memory does not grow
+    with the number of rows. With compress, the arrays are deflated as by numpy.savez_compressed.
+    """
+
+    buffer_size = 65536
+    descriptions = {"Q": "<u8", "d": "<f8"}
+
+    def __init__(self, file, columns, directory, compress=False):
+        import tempfile
+        self.file = file
+        self.columns = columns
+        self.compress = compress
+        self.directory = tempfile.mkdtemp(prefix="columns_", dir=directory)
+        self.column_files = [open(os.path.join(self.directory, str(column)), "wb") for column in range(len(columns))]
+        self.buffers = [self.new_buffer(typecode) for name, typecode in columns]
+        self.widths = [1] * len(columns)
+        self.number_of_rows = 0
+
+    def new_buffer(self, typecode):
+        import array
+        return [] if typecode == "S" else array.array(typecode)
+
+    def add(self, row):
+        """ This method adds a row, with a value for every column."""
+
+        for buffer, value in zip(self.buffers, row):
+            buffer.append(value)
+        self.number_of_rows += 1
+        if self.number_of_rows % self.buffer_size == 0:
+            self.flush()
+
+    def flush(self):
+        """ This method writes the buffers to the temporary files of their columns."""
+
+        for column, (name, typecode) in enumerate(self.columns):
+            buffer = self.buffers[column]
+            if typecode == "S":
+                if buffer:
+                    self.widths[column] = max(self.widths[column], max(map(len, buffer)))
+                    self.column_files[column].write(b"\n".join(buffer) + b"\n")
+            else:
+                if sys.byteorder == "big":
+                    buffer.byteswap()
+                buffer.tofile(self.column_files[column])
+            self.buffers[column] = self.new_buffer(typecode)
+
+    def write_npy_header(self, file, description):
+        """ This method writes the header of a one-dimensional ".npy" array (format version 1.0)."""
+
+        header = ("{'descr': '" + description + "', 'fortran_order': False, 'shape': (" + str(self.number_of_rows) +
+                  ",), }")
+        # the magic string, version, header length and header are padded to a multiple of 64 bytes
+        header += " " * (-(10 + len(header) + 1) % 64) + "\n"
+        file.write(b"\x93NUMPY\x01\x00" + struct.pack("<H", len(header)) + header.encode("latin1"))
+
+    def close(self):
+        """ This method writes every column as an array of the archive and removes the temporary files."""
+
+        import zipfile
+
+        try:
+            self.flush()
+            for column_file in self.column_files:
+                column_file.close()
+
+            compression = zipfile.ZIP_DEFLATED if self.compress else zipfile.ZIP_STORED
+            with zipfile.ZipFile(self.file, "w", compression) as archive:
+                for column, (name, typecode) in enumerate(self.columns):
+                    column_file_name = os.path.join(self.directory, str(column))
+                    with archive.open(name + ".npy", "w", force_zip64=True) as array_file:
+                        if typecode == "S":
+                            width = self.widths[column]
+                            self.write_npy_header(array_file, "|S" + str(width))
+                            with open(column_file_name, "rb") as column_file:
+                                while True:
+                                    lines = column_file.readlines(1024 * 1024)
+                                    if not lines:
+                                        break
+                                    array_file.write(b"".join(line[:-1].ljust(width, b"\0") for line in lines))
+                        else:
+                            self.write_npy_header(array_file, self.descriptions[typecode])
+                            with open(column_file_name, "rb") as column_file:
+                                shutil.copyfileobj(column_file, array_file, 1024 * 1024)
+        finally:
+            for column_file in self.column_files:
+                column_file.close()
+            shutil.rmtree(self.directory, ignore_errors=True)
@@ -0,0 +1,288 @@
+"""
+Project: FASTA processor
+  Description:    The packed sequence files (".fa2b"), which store 2 bits per base like the UCSC ".2bit" format,
+            with a writer, a memory-mapped reader and a stream of the fasta text of a packed file.
+"""
+# import necessary packages
+import io
+import sys
+import mmap
+import bisect
+import struct
+import itertools
+
+
+def make_unpack_tables():
+    """
+    This function creates the tables that turn every byte of a packed sequence into its 4 bases.
+    Table k gives the base in position k of the byte, the first base being in the highest 2 bits.
+    """
+
+    return [bytes(b"ACGT"[(byte >> (6 - 2 * position)) & 3] for byte in range(256)) for position in range(4)]
+
+
+class PackedFastaWriter:
+    """
+    Writes fasta records into a packed sequence file (".fa2b"), similar to the UCSC ".2bit" format.
+    Every base takes 2 bits (A=0, C=1, G=2, T=3), and runs of N, of soft-masked (lowercase) bases
+    and of other characters are kept as blocks, so the records can be restored exactly.
+    All numbers are little-endian. The file starts with "FA2B" and the version as a 32-bit integer.
+    Every record has a block of a record header (length as a 64-bit integer, then line width, flags,
+    number of N blocks, soft-mask blocks and other blocks as 32-bit integers), the A, C, G, T, U and N counts,
+    the 64-bit starts and lengths of the N, soft-mask and other blocks, the characters of the other blocks
+    and the packed bases. Flag 1 marks an RNA sequence, whose T are written as U.
+    The record table at the end has the offset of the block, the length of the header and the header
+    of every record, and the file ends with the offset of the record table and the number of records.
+    """
+
+    version = 1
+    # the base 4 digits of the bases. N and other characters are packed as A and restored from their blocks.
+    digit_table = bytes(b"0123"[b"ACGT".index(byte)] if byte in b"ACGT" else ord("0") for byte in range(256))
+
+    def __init__(self, file_name):
+        self.file = open(file_name, "wb")
+        self.file.write(struct.pack("<4sI", b"FA2B", self.version))
+        self.offset = 8
+        # the offset and the header of every record
+        self.records = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exception):
+        self.close()
+
+    def get_blocks(self, pattern, sequence):
+        """ This method returns the starts and lengths of the runs of a sequence that match a pattern."""
+
+        import re
+        import array
+
+        starts, lengths = array.array("Q"), array.array("Q")
+        for match in re.finditer(pattern, sequence):
+            starts.append(match.start())
+            lengths.append(match.end() - match.start())
+        return starts, lengths
+
+    def pack_bases(self, sequence):
+        """
+        This method packs the bases of a sequence(uppercase bytes) into 2 bits each.
+        The bases become the digits of a base 4 number, which int converts into its bytes in C.
+        """
+
+        digits = sequence.translate(self.digit_table)
+        pieces = []
+        for start in range(0, len(digits), 4 * 1024 * 1024):
+            piece = digits[start:start + 4 * 1024 * 1024]
+            # the last byte is filled up with A
+            piece += b"0" * (-len(piece) % 4)
+            pieces.append(int(piece, 4).to_bytes(len(piece) // 4, "big"))
+        return b"".join(pieces)
+
+    def add(self, Header, sequence, line_width=0):
+        """
+        This method adds a record to the file. The sequence keeps its case, and
+        the line width is the number of bases per line of the fasta file, or 0 for an unwrapped sequence.
+        """
+
+        upper_sequence = sequence.upper()
+        composition = [upper_sequence.count(base) for base in [b"A", b"C", b"G", b"T", b"U", b"N"]]
+        # the runs are searched only if the sequence has any, as searching is slower than these checks
+        if upper_sequence != sequence:
+            mask_blocks = self.get_blocks(rb"[a-z]+", sequence)
+        else:
+            mask_blocks = self.get_blocks(rb"[a-z]+", b"")
+
+        # an RNA sequence is packed as DNA, other sequences with U keep it in their other blocks
+        flags = 0
+        if composition[4] and not composition[3]:
+            flags = 1
+            upper_sequence = upper_sequence.replace(b"U", b"T")
+
+        # U is one of the other characters, unless the sequence is RNA
+        known_bases = sum(composition) if flags else sum(composition) - composition[4]
+        N_blocks = self.get_blocks(rb"N+", upper_sequence if composition[5] else b"")
+        other_blocks = self.get_blocks(rb"[^ACGTN]+", upper_sequence if known_bases < len(sequence) else b"")
+        other_characters = b"".join(upper_sequence[start:start + length] for start, length in zip(*other_blocks))
+
+        block = [struct.pack("<QIIIII", len(sequence), line_width or 0, flags, len(N_blocks[0]), len(mask_blocks[0]),
+                             len(other_blocks[0])), struct.pack("<6Q", *composition)]
+        for values in N_blocks + mask_blocks + other_blocks:
+            if sys.byteorder == "big":
+                values.byteswap()
+            block.append(values.tobytes())
+        block.append(other_characters)
+        block.append(self.pack_bases(upper_sequence))
+
+        self.records.append((self.offset, Header.encode()))
+        for data in block:
+            self.file.write(data)
+            self.offset += len(data)
+
+    def close(self):
+        if not self.file.closed:
+            try:
+                table_offset = self.offset
+                for offset, Header in self.records:
+                    self.file.write(struct.pack("<QI", offset, len(Header)) + Header)
+                self.file.write(struct.pack("<QQ", table_offset, len(self.records)))
+            finally:
+                self.file.close()
+
+
+class PackedFasta:
+    """
+    Reads the records of a packed sequence file written by PackedFastaWriter.
+    The file is memory-mapped, so the length and base counts of a record, or a part of its sequence,
+    are read without reading the rest of the file.
+    """
+
+    unpack_tables = make_unpack_tables()
+
+    def __init__(self, file_name):
+        self.file = open(file_name, "rb")
+        try:
+            self.mapped_file = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self.file.close()
+            raise ValueError("Not a packed sequence file: " + file_name)
+        if self.mapped_file[:4] != b"FA2B" or len(self.mapped_file) < 24:
+            self.close()
+            raise ValueError("Not a packed sequence file: " + file_name)
+
+        # the record table: the offset of the block and the header of every record
+        table_offset, number_of_records = struct.unpack("<QQ", self.mapped_file[-16:])
+        self.records = []
+        position = table_offset
+        for _ in range(number_of_records):
+            offset, header_length = struct.unpack_from("<QI", self.mapped_file, position)
+            position += 12
+            self.records.append((offset, self.mapped_file[position:position + header_length].decode()))
+            position += header_length
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exception):
+        self.close()
+
+    def close(self):
+        self.mapped_file.close()
+        self.file.close()
+
+    def get_record_info(self, number):
+        """
+        This method reads the record header of a record and returns its length, line width, flags,
+        base counts and blocks, and where its packed bases start.
+        """
+
+        import array
+
+        offset = self.records[number][0]
+        length, line_width, flags, *block_counts = struct.unpack_from("<QIIIII", self.mapped_file, offset)
+        composition = dict(zip("ACGTUN", struct.unpack_from("<6Q", self.mapped_file, offset + 28)))
+        composition["length"] = length
+
+        position = offset + 76
+        blocks = []
+        for count in block_counts:
+            starts, lengths = array.array("Q"), array.array("Q")
+            starts.frombytes(self.mapped_file[position:position + 8 * count])
+            lengths.frombytes(self.mapped_file[position + 8 * count:position + 16 * count])
+            if sys.byteorder == "big":
+                starts.byteswap()
+                lengths.byteswap()
+            blocks.append((starts, lengths))
+            position += 16 * count
+        other_characters = position
+        position += sum(blocks[2][1])
+
+        return {"length": length, "line_width": line_width, "flags": flags, "composition": composition,
+                "N": blocks[0], "mask": blocks[1], "other": blocks[2], "other_characters": other_characters,
+                "bases": position}
+
+    def get_sequence(self, number, start=0, end=None, keep_case=True):
+        """
+        This method unpacks the sequence of a record between start and end (bytes).
+        Only the packed bytes and blocks of that part are read. Soft-masked bases are lowercase,
+        unless keep_case is False.
+        """
+
+        info = self.get_record_info(number)
+        if end is None or end > info["length"]:
+            end = info["length"]
+        start = min(start, end)
+
+        # every byte holds 4 bases, which are placed with one translate per position
+        first_byte = start // 4
+        data = self.mapped_file[info["bases"] + first_byte:info["bases"] - (-end // 4)]
+        sequence = bytearray(4 * len(data))
+        for position, table in enumerate(self.unpack_tables):
+            sequence[position::4] = data.translate(table)
+        del sequence[end - 4 * first_byte:]
+        del sequence[:start - 4 * first_byte]
+
+        if info["flags"] & 1:
+            sequence = sequence.replace(b"T", b"U")
+
+        # the blocks that overlap the part, with the characters of the other blocks that come before
+        other_offsets = [0] + list(itertools.accumulate(info["other"][1]))
+        for name in ["N", "other", "mask"]:
+            if name == "mask" and not keep_case:
+                continue
+            starts, lengths = info[name]
+            for block in range(max(bisect.bisect_right(starts, start) - 1, 0), len(starts)):
+                block_start = starts[block]
+                if block_start >= end:
+                    break
+                block_end = block_start + lengths[block]
+                if block_end <= start:
+                    continue
+                first, last = max(block_start, start), min(block_end, end)
+                if name == "N":
+                    sequence[first - start:last - start] = b"N" * (last - first)
+                elif name == "other":
+                    position = info["other_characters"] + other_offsets[block] + first - block_start
+                    sequence[first - start:last - start] = self.mapped_file[position:position + last - first]
+                else:
+                    sequence[first - start:last - start] = sequence[first - start:last - start].lower()
+
+        return bytes(sequence)
+
+
+class PackedFastaStream(io.RawIOBase):
+    """
+    Reads a packed sequence file as the text of the fasta file it was made from,
+    so every reader of fasta files can read it. format_record turns a record into its text.
+    """
+
+    def __init__(self, file_name, format_record):
+        super().__init__()
+        self.store = PackedFasta(file_name)
+        self.format_record = format_record
+        self.record = 0
+        self.data = b""
+        self.data_position = 0
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        while self.data_position == len(self.data):
+            if self.record == len(self.store.records):
+                return 0
+            info = self.store.get_record_info(self.record)
+            self.data = self.format_record(self.store.records[self.record][1], self.store.get_sequence(self.record),
+                                           info["line_width"])
+            self.data_position = 0
+            self.record += 1
+
+        size = min(len(buffer), len(self.data) - self.data_position)
+        buffer[:size] = self.data[self.data_position:self.data_position + size]
+        self.data_position += size
+        return size
+
+    def close(self):
+        if not self.closed:
+            self.store.close()
+        super().close()
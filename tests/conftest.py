@@ -0,0 +1,51 @@
+"""
+Fixtures shared by the tests. The tests run the operations of Fasta.py without the GUI
+on small fasta files written to a temporary directory.
+"""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import Fasta
+
+
+@pytest.fixture
+def output_directory(tmp_path):
+    """ The output directory of the operations."""
+
+    return tmp_path / "Output"
+
+
+@pytest.fixture
+def run(output_directory):
+    """ Runs a command of the command line with the outputs in the output directory and returns its exit status."""
+
+    def run_command(*arguments):
+        return Fasta.main([str(argument) for argument in arguments] + ["--output-dir", str(output_directory)])
+
+    return run_command
+
+
+@pytest.fixture
+def sequence(output_directory):
+    """ A Sequence without the GUI that writes to the output directory."""
+
+    os.makedirs(output_directory, exist_ok=True)
+    sequence = Fasta.Sequence(output_directory=str(output_directory))
+    yield sequence
+    sequence.close_stats_cache()
+
+
+@pytest.fixture
+def write_file(tmp_path):
+    """ Writes text or bytes to a file in the temporary directory and returns its path as a string."""
+
+    def write(name, content):
+        path = tmp_path / name
+        path.write_bytes(content.encode() if isinstance(content, str) else content)
+        return str(path)
+
+    return write
@@ -0,0 +1,59 @@
+"""
+Tests of the state used by the GUI worker thread: messages on a queue, progress and cancellation.
+The tests run without tkinter.
+"""
+import os
+import queue
+
+import pytest
+
+import Fasta
+
+RECORDS = "".join(">r" + str(number) + "\nACGTACGT\n" for number in range(20))
+
+
+@pytest.fixture
+def task(sequence):
+    # the GUI posts the messages of a running operation to the main thread through a queue
+    sequence.messages = queue.Queue()
+    return sequence
+
+
+def read_messages(task):
+    messages = []
+    while not task.messages.empty():
+        messages.append(task.messages.get())
+    return messages
+
+
+def test_messages_are_posted_to_the_queue(task, write_file, capsys):
+    file_name = write_file("genome.fasta", RECORDS)
+    task.number_of_Fasta_sequences(file_name)
+    assert read_messages(task)[-1] == ("result", "Number of fasta sequences: 20")
+    assert capsys.readouterr().out == ""
+
+
+def test_progress_counts_every_byte(task, write_file):
+    file_name = write_file("genome.fasta", RECORDS)
+    task.split_multi_Fasta_file(file_name)
+    assert task.bytes_read == os.path.getsize(file_name)
+    assert task.records_read == 20
+
+
+def test_cancelled_operation_removes_its_outputs(task, write_file, output_directory, monkeypatch):
+    file_name = write_file("genome.fasta", RECORDS)
+    count_progress = Fasta.Sequence.count_progress
+
+    # the user presses cancel while the fifth record is read
+    def cancel_after_five_records(self, number_of_bytes, number_of_records=1):
+        if self.records_read == 4:
+            self.cancelled = True
+        count_progress(self, number_of_bytes, number_of_records)
+
+    monkeypatch.setattr(Fasta.Sequence, "count_progress", cancel_after_five_records)
+    with pytest.raises(Fasta.OperationCancelled):
+        task.split_multi_Fasta_file(file_name)
+    assert sorted(os.listdir(output_directory)) == ["r0.fasta", "r1.fasta", "r2.fasta", "r3.fasta"]
+
+    task.remove_output_files()
+    assert os.listdir(output_directory) == []
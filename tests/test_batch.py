@@ -0,0 +1,82 @@
+"""
+Tests of the batch mode: the outputs of every file, the manifest, failures and retries.
+"""
+import json
+import os
+
+import pytest
+
+import Fasta
+
+PROTEIN = ">p\nMVLSPADKTNVKAAWGKVGAHAGEYGAEALERMFLSFPTTKTYFPHF\n"
+
+
+@pytest.fixture
+def batch_directory(tmp_path):
+    directory = tmp_path / "data"
+    (directory / "sub").mkdir(parents=True)
+    (directory / "x.fasta").write_text(">a\nACGT\n")
+    (directory / "sub" / "y.fa").write_text(">b\nGGCC\n>c\nAT\n")
+    (directory / "notes.txt").write_text("not a fasta file\n")
+    return directory
+
+
+def read_manifest(output_directory):
+    manifest = json.loads((output_directory / "batch_manifest.json").read_text())
+    return manifest, {os.path.basename(result["file"]): result for result in manifest["results"]}
+
+
+def list_outputs(output_directory):
+    return sorted(os.path.relpath(os.path.join(directory, name), output_directory)
+                  for directory, _, names in os.walk(output_directory) for name in names)
+
+
+def test_outputs_keep_the_relative_paths(run, batch_directory, output_directory):
+    assert run("batch", batch_directory, "lengths", "--workers", "2") == 0
+    assert list_outputs(output_directory) == ["batch_manifest.json", os.path.join("sub", "y.fa"), "x.fasta"]
+    assert (output_directory / "sub" / "y.fa").read_text() == (">b, sequence length 4 bp\nGGCC\n"
+                                                                ">c, sequence length 2 bp\nAT\n")
+    manifest, results = read_manifest(output_directory)
+    assert (manifest["files"], manifest["succeeded"], manifest["failed"]) == (2, 2, 0)
+    assert results["x.fasta"]["status"] == "ok" and results["x.fasta"]["attempts"] == 1
+
+
+def test_split_writes_a_directory_per_file(run, batch_directory, output_directory):
+    assert run("batch", batch_directory, "split") == 0
+    assert list_outputs(output_directory) == ["batch_manifest.json", os.path.join("sub", "y", "b.fasta"),
+                                              os.path.join("sub", "y", "c.fasta"), os.path.join("x", "a.fasta")]
+
+
+def test_glob_pattern(run, batch_directory, output_directory):
+    assert run("batch", str(batch_directory / "**" / "*.fa"), "lengths") == 0
+    manifest, results = read_manifest(output_directory)
+    assert list(results) == ["y.fa"]
+
+
+def test_failed_file_does_not_stop_the_batch(run, batch_directory, output_directory, capsys):
+    (batch_directory / "p.fasta").write_text(PROTEIN)
+    assert run("batch", batch_directory, "content") == 1
+    assert capsys.readouterr().err.startswith("Batch Error: 1 files failed")
+    manifest, results = read_manifest(output_directory)
+    assert (manifest["succeeded"], manifest["failed"]) == (2, 1)
+    # an error message is not an exception, so the file is not tried again
+    assert results["p.fasta"]["status"] == "failed"
+    assert results["p.fasta"]["attempts"] == 1
+    assert results["p.fasta"]["error"].startswith("Sequence Type Error: ")
+    assert not (output_directory / "p.fasta").exists()
+
+
+def test_exceptions_are_retried(run, batch_directory, output_directory, monkeypatch):
+    # the worker processes are forked, so they run the replaced method too
+    def fail(*arguments, **keyword_arguments):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(Fasta.Sequence, "add_sequence_lengths_to_headers", fail)
+    assert run("batch", batch_directory, "lengths", "--retries", "2") == 1
+    manifest, results = read_manifest(output_directory)
+    assert manifest["failed"] == 2
+    assert results["x.fasta"]["attempts"] == 3
+    assert results["x.fasta"]["error"] == "OSError: disk full"
+    # the directories made for the failed files are removed, the output directory of the batch is kept
+    assert list_outputs(output_directory) == ["batch_manifest.json"]
+    assert not (output_directory / "sub").exists()
@@ -0,0 +1,67 @@
+"""
+Tests of the benchmark suite: the synthetic inputs, the measurements and the baseline comparison.
+"""
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+import benchmark
+
+REPOSITORY = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.mark.parametrize("shape_name", sorted(benchmark.SHAPES))
+def test_generated_files_can_be_indexed(sequence, tmp_path, shape_name):
+    file_name = str(tmp_path / "synthetic.fasta")
+    number_of_records = benchmark.generate_fasta(file_name, 200000, benchmark.SHAPES[shape_name], 1)
+    index = sequence.build_index(file_name)
+    assert len(index) == number_of_records
+    # every record has about the same length, and the file about the asked size
+    assert abs(os.path.getsize(file_name) - 200000) < 200000 * 0.2
+    alphabet = benchmark.SHAPES[shape_name]["alphabet"].encode()
+    for Header, record_sequence in sequence.read_records(file_name):
+        assert not record_sequence.translate(None, alphabet)
+
+
+def test_generated_files_depend_only_on_the_seed(tmp_path):
+    shape = benchmark.SHAPES["many_short_dna_wrapped"]
+    for name, seed in [("first", 1), ("second", 1), ("third", 2)]:
+        benchmark.generate_fasta(str(tmp_path / name), 50000, shape, seed)
+    assert (tmp_path / "first").read_bytes() == (tmp_path / "second").read_bytes()
+    assert (tmp_path / "first").read_bytes() != (tmp_path / "third").read_bytes()
+
+
+def test_slower_operations_are_regressions(tmp_path):
+    baseline_file_name = tmp_path / "baseline.json"
+    baseline_file_name.write_text(json.dumps([{"shape": "a", "operation": "count", "seconds": 1.0},
+                                              {"shape": "a", "operation": "split", "seconds": 1.0}]))
+    results = [{"shape": "a", "operation": "count", "seconds": 1.2},
+               {"shape": "a", "operation": "split", "seconds": 1.3},
+               {"shape": "b", "operation": "count", "seconds": 9.0}]
+    assert benchmark.compare_with_baseline(results, str(baseline_file_name), 0.25) == [
+        "a split: 1.3 s, baseline 1.0 s"]
+
+
+def run_benchmark(tmp_path, *arguments):
+    return subprocess.run([sys.executable, os.path.join(REPOSITORY, "benchmark.py"), "--size-mb", "1",
+                           "--shapes", "many_short_dna_wrapped", "--operations", "count", "GC_content",
+                           "--work-dir", str(tmp_path / "work")] + list(arguments), capture_output=True, text=True)
+
+
+def test_benchmark_run_and_baseline(tmp_path):
+    process = run_benchmark(tmp_path, "--output", str(tmp_path / "results.json"))
+    # GC content needs a single record, so it is skipped for this shape
+    assert process.returncode == 0, process.stderr
+    [result] = json.loads((tmp_path / "results.json").read_text())
+    assert result["shape"] == "many_short_dna_wrapped" and result["operation"] == "count"
+    assert result["MB/s"] > 0 and result["records/s"] > 0 and result["peak_memory_MB"] > 0
+
+    # every operation is slower than a baseline of no time at all
+    result["seconds"] = 0.0
+    (tmp_path / "baseline.json").write_text(json.dumps([result]))
+    process = run_benchmark(tmp_path, "--baseline", str(tmp_path / "baseline.json"))
+    assert process.returncode == 1
+    assert "Regressions compared to the baseline:" in process.stderr
@@ -0,0 +1,102 @@
+"""
+Tests of reading and writing BGZF files and their ".gzi" block index, and of compressed inputs and outputs.
+"""
+import os
+import gzip
+import random
+
+import bgzf
+import Fasta
+
+
+def random_bytes(size, seed=1):
+    generator = random.Random(seed)
+    return bytes(generator.choice(b"ACGTN\n") for _ in range(size))
+
+
+def test_round_trip(tmp_path):
+    data = random_bytes(300000)
+    file_name = str(tmp_path / "data.gz")
+    with bgzf.BgzfWriter(file_name, threads=2) as file:
+        file.write(data[:1000])
+        file.write(data[1000:])
+
+    # any gzip reader can read the blocks
+    with gzip.open(file_name, "rb") as file:
+        assert file.read() == data
+    assert Fasta.get_compression(file_name) == "bgzf"
+
+    for threads in [1, 4]:
+        with bgzf.BgzfReader(file_name, threads) as file:
+            assert file.read() == data
+
+
+def test_block_index(tmp_path):
+    data = random_bytes(300000)
+    file_name = str(tmp_path / "data.gz")
+    with bgzf.BgzfWriter(file_name) as file:
+        file.write(data)
+
+    blocks = bgzf.read_gzi_index(file_name)
+    assert [uncompressed_offset for compressed_offset, uncompressed_offset in blocks] == \
+        list(range(0, len(data), bgzf.BgzfWriter.block_size))
+
+    # seeking starts from the block before the offset
+    with bgzf.BgzfReader(file_name) as file:
+        for offset in [250000, 5, 65280, 199999]:
+            assert file.seek(offset) == offset
+            assert file.read(100) == data[offset:offset + 100]
+
+
+def test_index_written_by_reading(tmp_path):
+    data = random_bytes(200000)
+    file_name = str(tmp_path / "data.gz")
+    with bgzf.BgzfWriter(file_name) as file:
+        file.write(data)
+    blocks = bgzf.read_gzi_index(file_name)
+    os.remove(file_name + ".gzi")
+
+    with bgzf.BgzfReader(file_name) as file:
+        file.read()
+        file.write_index()
+    assert bgzf.read_gzi_index(file_name) == blocks
+
+
+def test_compressed_inputs(run, tmp_path, output_directory, capsys):
+    text = ">s1\nACGT\nAC\n>s2\nGGGG\n"
+    with gzip.open(str(tmp_path / "plain.fasta.gz"), "wb") as file:
+        file.write(text.encode())
+    with bgzf.BgzfWriter(str(tmp_path / "blocked.fasta.gz")) as file:
+        file.write(text.encode())
+
+    for name in ["plain.fasta.gz", "blocked.fasta.gz"]:
+        assert run("count", tmp_path / name) == 0
+        assert "Number of fasta sequences: 2" in capsys.readouterr().out
+    assert Fasta.get_compression(str(tmp_path / "plain.fasta.gz")) == "gzip"
+
+
+def test_compressed_outputs(run, write_file, output_directory):
+    assert run("lengths", write_file("records.fasta", ">s1\nACGT\n>s2\nGG\n"), "--compress") == 0
+    output_file_name = [os.path.join(output_directory, name) for name in os.listdir(output_directory)
+                        if name.endswith(".fasta.gz")][0]
+    assert Fasta.get_compression(output_file_name) == "bgzf"
+    assert os.path.exists(output_file_name + ".gzi")
+    with gzip.open(output_file_name, "rb") as file:
+        assert file.read() == b">s1, sequence length 4 bp\nACGT\n>s2, sequence length 2 bp\nGG\n"
+
+
+def test_block_index_that_can_not_be_saved(run, tmp_path, monkeypatch):
+    file_name = str(tmp_path / "blocked.fasta.gz")
+    with bgzf.BgzfWriter(file_name) as file:
+        file.write(b">s1\nACGT\n>s2\nGG\n")
+    os.remove(file_name + ".gzi")
+
+    # as in a read-only directory, the ".gzi" index can not be written
+    def write_gzi_index(file_name, blocks):
+        raise PermissionError("Permission denied: " + file_name + ".gzi")
+    monkeypatch.setattr(bgzf, "write_gzi_index", write_gzi_index)
+
+    assert run("sort", file_name, "--key", "ID", "--descending") == 0
+    assert not os.path.exists(file_name + ".gzi")
+    with open(tmp_path / "Output" / "blocked.sorted.fasta", "rb") as file:
+        assert file.read() == b">s2\nGG\n>s1\nACGT\n"
@@ -0,0 +1,63 @@
+"""
+Tests of the classification of sequences as DNA, RNA or protein from the letters of the whole sequence.
+"""
+import os
+import random
+
+import pytest
+
+SAMPLE_FILES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "sample_files")
+
+HEMOGLOBIN = (b"MVLSPADKTNVKAAWGKVGAHAGEYGAEALERMFLSFPTTKTYFPHFDLSHGSAQVKGHGKKVADALTNAVAHVDDMPNALSALSDL"
+              b"HAHKLRVDPVNFKLLSHCLLVTLAAHLPAEFTPAVHASLDKFLASVSTVLTSKYR")
+
+
+def classify(sequence, text):
+    # the result is kept for the last sequence object, so every case is a new bytes object
+    sequence.classified_sequence = None
+    return sequence.classify_sequence(bytes(bytearray(text)))
+
+
+@pytest.mark.parametrize("text, sequence_type", [
+    (b"ACGTACGTTTGACCA", "DNA"),
+    (b"ACGUACGUUUGACCA", "RNA"),
+    (HEMOGLOBIN, "protein"),
+    # N-rich DNA, e.g. a scaffold with gaps
+    (b"N" * 500 + b"ACGT" + b"N" * 500, "DNA"),
+    # DNA full of IUPAC ambiguity codes
+    (b"ACGTRYKMSWN", "DNA"),
+    (b"ACGRYKMSWBDHVNNRYACGT" * 10, "DNA"),
+    (b"RYKMSWRYSWACGUU", "RNA"),
+    (b"acgtrykmswn", "DNA"),
+])
+def test_sequence_types(sequence, text, sequence_type):
+    assert classify(sequence, text)[0] == sequence_type
+
+
+def test_confidence(sequence):
+    assert classify(sequence, b"ACGT" * 100) == ("DNA", 1.0)
+    assert classify(sequence, b"EFILPQ" * 100) == ("protein", 1.0)
+    assert 0 < classify(sequence, HEMOGLOBIN)[1] < 1
+    # no letters, or ambiguity codes only, say nothing about the type
+    assert classify(sequence, b"") == ("DNA", 0.0)
+    assert classify(sequence, b"RYKMSW")[1] == 0.0
+
+
+def test_long_sequences_are_sampled(sequence):
+    generator = random.Random(1)
+    dna = bytes(generator.choice(b"ACGTN") for _ in range(1200000))
+    assert classify(sequence, dna) == ("DNA", 1.0)
+    protein = bytes(generator.choice(HEMOGLOBIN) for _ in range(1200000))
+    assert classify(sequence, protein)[0] == "protein"
+
+
+def test_sample_files(sequence):
+    expected = {
+        "protein hemoglobin subunit alpha Equus caballus.fasta": "protein",
+        "RNA human erthropoietin.fasta": "RNA",
+        "Human insulin with unwanted.fasta": "DNA",
+        "multi_fasta_file.fasta": "DNA",
+    }
+    for name, sequence_type in expected.items():
+        for Header, record in sequence.read_records(os.path.join(SAMPLE_FILES, name)):
+            assert classify(sequence, record)[0] == sequence_type, name
@@ -0,0 +1,35 @@
+"""
+Tests of the cleaning of nucleotide and protein sequences with the delete tables of the alphabets.
+"""
+import pytest
+
+import Fasta
+
+NUCLEOTIDES = ">n1\nAC-GT*RYN\nacgu xx\n>n2\n1234\n"
+PROTEINS = ">p1\nMVL*SP-ADB1Z\nxjuo\n"
+
+
+@pytest.mark.parametrize("alphabet", sorted(Fasta.Sequence.alphabets))
+def test_delete_table_keeps_only_the_alphabet(sequence, alphabet):
+    every_byte = bytes(range(256))
+    kept = set(Fasta.Sequence.alphabets[alphabet].encode())
+    [(Header, cleaned)] = sequence.clean_records([(">r", every_byte)], alphabet)
+    assert cleaned == bytes(byte for byte in every_byte if byte in kept)
+
+
+@pytest.mark.parametrize("alphabet, expected", [("IUPAC strict", ">n1\nACGTACGU\n"),
+                                                ("IUPAC ambiguous", ">n1\nACGTRYNACGU\n")])
+def test_clean_nucleotide(run, write_file, output_directory, alphabet, expected):
+    file_name = write_file("genome.fasta", NUCLEOTIDES)
+    assert run("clean", file_name, "--alphabet", alphabet) == 0
+    assert (output_directory / "n1.fasta").read_text() == expected
+    # a record without any character of the alphabet is written with its header only
+    assert (output_directory / "n2.fasta").read_text() == ">n2\n"
+
+
+@pytest.mark.parametrize("alphabet, expected", [("20 amino acids", ">p1\nMVLSPAD\n"),
+                                                ("25 amino acids", ">p1\nMVLSPADBZJUO\n")])
+def test_clean_protein(run, write_file, output_directory, alphabet, expected):
+    file_name = write_file("protein.fasta", PROTEINS)
+    assert run("clean", file_name, "--protein", "--alphabet", alphabet) == 0
+    assert (output_directory / "p1.fasta").read_text() == expected
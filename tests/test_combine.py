@@ -0,0 +1,47 @@
+"""
+Tests of the combination of fasta files: the byte copy, the normalized rewrite and duplicate headers.
+"""
+import gzip
+import os
+
+import pytest
+
+FIRST = ">a1 x\nacgt\nGG"
+SECOND = ">a1 y\nTT\n>b2\nCC\n"
+
+
+@pytest.fixture
+def file_names(write_file):
+    return [write_file("first.fasta", FIRST), write_file("second.fasta", SECOND)]
+
+
+def read_combined(output_directory):
+    return (output_directory / "multifasta file.fasta").read_text()
+
+
+def test_files_are_copied_as_they_are(run, file_names, output_directory):
+    assert run("combine", *file_names) == 0
+    # only the missing newline at the end of the first file is added
+    assert read_combined(output_directory) == FIRST + "\n" + SECOND
+
+
+def test_normalized_records(run, file_names, output_directory):
+    assert run("combine", *file_names, "--normalize") == 0
+    assert read_combined(output_directory) == ">a1 x\nACGTGG\n>a1 y\nTT\n>b2\nCC\n"
+
+
+def test_duplicate_headers_are_renamed(run, file_names, output_directory):
+    assert run("combine", *file_names, "--duplicate-headers", "rename") == 0
+    assert read_combined(output_directory) == ">a1 x\nACGTGG\n>a1_2 y\nTT\n>b2\nCC\n"
+
+
+def test_duplicate_headers_fail(run, file_names, output_directory, capsys):
+    assert run("combine", *file_names, "--duplicate-headers", "error") == 1
+    assert capsys.readouterr().err == "Header Error: Duplicate fasta header: a1\n"
+    assert os.listdir(output_directory) == []
+
+
+def test_compressed_inputs_are_combined(run, write_file, file_names, output_directory):
+    compressed_file_name = write_file("third.fasta.gz", gzip.compress(b">c3\nAAAA\n"))
+    assert run("combine", *file_names, compressed_file_name) == 0
+    assert read_combined(output_directory) == FIRST + "\n" + SECOND + ">c3\nAAAA\n"
@@ -0,0 +1,55 @@
+"""
+Tests of the command line: exit statuses, error messages and the lazy import of tkinter.
+"""
+import os
+import subprocess
+import sys
+
+import pytest
+
+import Fasta
+
+REPOSITORY = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_count(run, write_file, capsys):
+    file_name = write_file("genome.fasta", ">a\nAC\n>b\nGG\n")
+    assert run("count", file_name) == 0
+    assert capsys.readouterr().out == "Number of fasta sequences: 2\n"
+
+
+def test_missing_file_fails(run, tmp_path, capsys):
+    assert run("count", tmp_path / "missing.fasta") == 1
+    assert capsys.readouterr().err.startswith("Input Error: No such file: ")
+
+
+def test_file_that_is_not_fasta_fails(run, write_file, capsys):
+    file_name = write_file("notes.txt", ">a\nAC\n")
+    assert run("count", file_name) == 1
+    assert capsys.readouterr().err.startswith("Input Error: Not a fasta or FASTQ file: ")
+
+
+def test_operation_error_fails(run, write_file, capsys):
+    file_name = write_file("genome.fasta", ">a\nAC\n>b\nGG\n")
+    assert run("content", file_name) == 1
+    assert capsys.readouterr().err.startswith("Sequence Number Error: ")
+
+
+def test_unknown_command_exits_with_usage(run):
+    with pytest.raises(SystemExit) as exit_status:
+        run("bogus")
+    assert exit_status.value.code == 2
+
+
+def test_output_directory_is_made(write_file, tmp_path):
+    file_name = write_file("genome.fasta", ">a\nAC\n")
+    assert Fasta.main(["lengths", file_name, "--output-dir", str(tmp_path / "new" / "outputs")]) == 0
+    assert (tmp_path / "new" / "outputs" / "genome.fasta").exists()
+
+
+def test_command_line_does_not_import_tkinter(write_file, tmp_path):
+    file_name = write_file("genome.fasta", ">a\nAC\n")
+    script = ("import sys, Fasta; Fasta.main(['count', " + repr(file_name) + ", '--output-dir', " +
+              repr(str(tmp_path / "Output")) + "]); print('tkinter' in sys.modules)")
+    result = subprocess.run([sys.executable, "-c", script], cwd=REPOSITORY, capture_output=True, text=True, check=True)
+    assert result.stdout.splitlines()[-1] == "False"
@@ -0,0 +1,47 @@
+"""
+Tests of the shared composition table and the AT and GC contents computed from it.
+"""
+
+RECORDS = ">s1 x\nACGTNN\nGGCC\n>s2\nAAUU\n"
+
+
+def test_composition_counts_every_base(sequence):
+    composition = sequence.get_composition(b"ACGTUNNRYGG")
+    assert {base: composition[base] for base in "ACGTUN"} == {"A": 1, "C": 1, "G": 3, "T": 1, "U": 1, "N": 2}
+    assert composition["length"] == 11
+    assert composition["other"] == 2
+    assert composition["AT"] == 3
+    assert composition["GC"] == 4
+
+
+def test_content_of_an_empty_sequence_is_zero(sequence):
+    composition = sequence.get_composition(b"")
+    assert sequence.get_content(composition, ["G", "C"]) == 0
+
+
+def test_GC_and_AT_content_of_one_record(run, write_file, capsys):
+    file_name = write_file("single.fasta", ">s1\nGGC\nAT\n")
+    assert run("content", file_name) == 0
+    assert capsys.readouterr().out.splitlines() == ["GC content: 0.6"]
+    assert run("content", file_name, "--content-type", "AT") == 0
+    assert capsys.readouterr().out.splitlines() == ["AT content: 0.4"]
+
+
+def test_annotated_contents(run, write_file, output_directory):
+    file_name = write_file("genome.fasta", RECORDS)
+    assert run("content", file_name, "--annotate") == 0
+    assert (output_directory / "genome.fasta").read_text() == (">s1 x, GC content: 0.6\nACGTNNGGCC\n"
+                                                               ">s2, GC content: 0.0\nAAUU\n")
+
+
+def test_AT_content_of_RNA_counts_U(run, write_file, output_directory):
+    file_name = write_file("genome.fasta", RECORDS)
+    assert run("content", file_name, "--annotate", "--content-type", "AT", "--sequence-type", "RNA") == 0
+    assert (output_directory / "genome.fasta").read_text() == (">s1 x, AT content: 0.1\nACGTNNGGCC\n"
+                                                               ">s2, AT content: 1.0\nAAUU\n")
+
+
+def test_protein_has_no_GC_content(run, write_file, capsys):
+    file_name = write_file("protein.fasta", ">p\nMVLSPADKTNVKAAWGKVGAHAGEYGAEALERMFLSFPTTKTYFPHF\n")
+    assert run("content", file_name) == 1
+    assert "Sequence Type Error" in capsys.readouterr().err
@@ -0,0 +1,88 @@
+"""
+Tests of the removal of duplicate sequences, in memory and with the digests partitioned on disk.
+"""
+import os
+import random
+
+import digests
+
+
+def reverse_complement(sequence):
+    return sequence[::-1].translate(str.maketrans("ACGT", "TGCA"))
+
+
+def make_records(number_of_records, seed=1):
+    generator = random.Random(seed)
+    pool = ["".join(generator.choice("ACGT") for _ in range(generator.randrange(1, 30))) for _ in range(300)]
+    records = []
+    for number in range(number_of_records):
+        sequence = generator.choice(pool)
+        if generator.random() < 0.2:
+            sequence = reverse_complement(sequence)
+        if generator.random() < 0.1:
+            sequence = sequence.lower()
+        records.append((">r" + str(number), sequence))
+    return records
+
+
+def format_records(records):
+    return "".join(Header + "\n" + sequence + "\n" for Header, sequence in records)
+
+
+def expected_records(records, with_reverse_complement=False):
+    seen = set()
+    kept = []
+    for Header, sequence in records:
+        key = sequence.upper()
+        if with_reverse_complement:
+            key = min(key, reverse_complement(key))
+        if key not in seen:
+            seen.add(key)
+            kept.append((Header, sequence))
+    return kept
+
+
+def read_output(output_directory, name):
+    with open(os.path.join(output_directory, name), "rb") as file:
+        return file.read().decode()
+
+
+def test_digest_set():
+    digest_set = digests.DigestSet()
+    values = [os.urandom(16) for _ in range(5000)] + [bytes(16)]
+    assert all(digest_set.add(value) for value in values)
+    assert not any(digest_set.add(value) for value in values)
+    assert len(digest_set) == len(values)
+    assert sorted(digest_set) == sorted(values)
+
+
+def test_digest_set_size_limit():
+    digest_set = digests.DigestSet(size_limit=64 * 1024)
+    while not digest_set.full:
+        digest_set.add(os.urandom(16))
+    assert digest_set.get_size() <= 64 * 1024
+
+
+def test_dedupe(run, write_file, output_directory):
+    records = make_records(400)
+    file_name = write_file("records.fasta", format_records(records))
+    assert run("dedupe", file_name) == 0
+    assert read_output(output_directory, "records.unique.fasta") == format_records(expected_records(records))
+
+    assert run("dedupe", file_name, "--reverse-complement") == 0
+    assert read_output(output_directory, "records.unique.fasta") == \
+        format_records(expected_records(records, with_reverse_complement=True))
+
+
+def test_partitions_on_disk_match_memory(run, write_file, output_directory):
+    # without memory for the digests, the digests after the first 512 records are partitioned on disk
+    records = make_records(3000, seed=2)
+    file_name = write_file("records.fasta", format_records(records))
+    for options in [[], ["--reverse-complement"]]:
+        assert run("dedupe", file_name, "--memory-mb", 0, *options) == 0
+        on_disk = read_output(output_directory, "records.unique.fasta")
+        assert run("dedupe", file_name, *options) == 0
+        assert read_output(output_directory, "records.unique.fasta") == on_disk
+        assert on_disk == format_records(expected_records(records, bool(options)))
+    # the partitions are removed
+    assert os.listdir(output_directory) == ["records.unique.fasta"]
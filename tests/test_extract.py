@@ -0,0 +1,108 @@
+"""
+Tests of the ID index and the extraction of records by ID list or regular expression.
+"""
+import os
+import gzip
+
+RECORDS = ">NM_1 first\nACGTA\nCG\n>XR_2\nTTTT\n>NM_3 third\nGGGGG\nCCCCC\nA\n>NM_1 again\nAAA\n"
+
+# the lines of x1 have different widths, so the first line width of an index entry does not tell where x1 ends
+IRREGULAR = ">x1 a\nACGTACGTAC\nCC\nCC\nCC\nCC\n>x2 b\nTT\n"
+
+
+def write_old_index(file_name, entries):
+    """ Writes a ".fai" index as earlier versions or other programs wrote it, stamped as an index of the file."""
+
+    with open(file_name + ".fai", "w") as file:
+        for entry in entries:
+            file.write("\t".join(str(value) for value in entry) + "\n")
+    status = os.stat(file_name)
+    os.utime(file_name + ".fai", ns=(status.st_atime_ns, status.st_mtime_ns))
+
+
+def read_output(output_directory, name):
+    with open(os.path.join(output_directory, name), "rb") as file:
+        return file.read().decode()
+
+
+def test_id_index(sequence, write_file):
+    file_name = write_file("records.fasta", RECORDS)
+    with sequence.load_id_index(file_name) as id_index:
+        assert id_index.number_of_records == 4
+        assert id_index.find("NM_1") == [0, 3]
+        assert id_index.find("NM_3") == [2]
+        assert id_index.find("NM_2") == []
+        assert id_index.get_entry(1) == (27, 4, 4, 5)
+    # the saved index is reused
+    assert os.path.exists(file_name + ".ids")
+    with sequence.load_id_index(file_name) as id_index:
+        assert id_index.find("XR_2") == [1]
+
+
+def test_extract_ids(run, write_file, output_directory, capsys):
+    assert run("extract", write_file("records.fasta", RECORDS), "--id", "NM_3", "--id", "NM_1", "--id", "NM_9") == 0
+    assert read_output(output_directory, "records.subset.fasta") == \
+        ">NM_1 first\nACGTA\nCG\n>NM_3 third\nGGGGG\nCCCCC\nA\n>NM_1 again\nAAA\n"
+    assert "Extracted 3 records, 1 IDs not found" in capsys.readouterr().out
+
+
+def test_extract_id_file(run, write_file, output_directory):
+    ids_file_name = write_file("ids.txt", ">XR_2 with a description\n\nNM_3\n")
+    assert run("extract", write_file("records.fasta", RECORDS), "--ids", ids_file_name) == 0
+    assert read_output(output_directory, "records.subset.fasta") == \
+        ">XR_2\nTTTT\n>NM_3 third\nGGGGG\nCCCCC\nA\n"
+
+
+def test_extract_regex(run, write_file, output_directory):
+    assert run("extract", write_file("records.fasta", RECORDS), "--regex", "^XR_|_3$") == 0
+    assert read_output(output_directory, "records.subset.fasta") == \
+        ">XR_2\nTTTT\n>NM_3 third\nGGGGG\nCCCCC\nA\n"
+
+
+def test_extract_compressed(run, tmp_path, output_directory):
+    file_name = str(tmp_path / "records.fasta.gz")
+    with gzip.open(file_name, "wb") as file:
+        file.write(RECORDS.encode())
+    assert run("extract", file_name, "--id", "NM_3") == 0
+    assert read_output(output_directory, "records.subset.fasta") == ">NM_3 third\nGGGGG\nCCCCC\nA\n"
+
+
+def test_extract_packed_matches_fasta(run, write_file, output_directory):
+    assert run("pack", write_file("records.fasta", RECORDS)) == 0
+    assert run("extract", os.path.join(output_directory, "records.fa2b"), "--regex", "NM") == 0
+    assert read_output(output_directory, "records.subset.fasta") == \
+        ">NM_1 first\nACGTA\nCG\n>NM_3 third\nGGGGG\nCCCCC\nA\n>NM_1 again\nAAA\n"
+
+
+def test_extract_whole_record_with_old_index(run, write_file, output_directory):
+    file_name = write_file("irregular.fasta", IRREGULAR)
+    # the entry of x1 has the width of its first line, as an index written without checking the widths
+    write_old_index(file_name, [("x1", 18, 6, 10, 11), ("x2", 2, 35, 2, 3)])
+    assert run("extract", file_name, "--id", "x1") == 0
+    assert read_output(output_directory, "irregular.subset.fasta") == ">x1 a\nACGTACGTAC\nCC\nCC\nCC\nCC\n"
+
+
+def test_extract_whole_compressed_record_with_old_index(run, tmp_path, output_directory):
+    file_name = str(tmp_path / "irregular.fasta.gz")
+    with gzip.open(file_name, "wb") as file:
+        file.write(IRREGULAR.encode())
+    write_old_index(file_name, [("x1", 18, 6, 10, 11), ("x2", 2, 35, 2, 3)])
+    assert run("extract", file_name, "--id", "x1", "--id", "x2") == 0
+    assert read_output(output_directory, "irregular.subset.fasta") == IRREGULAR
+
+
+def test_extract_irregular_file(run, write_file, capsys):
+    assert run("extract", write_file("irregular.fasta", IRREGULAR), "--id", "x1") == 1
+    assert "Index Error" in capsys.readouterr().err
+
+
+def test_read_record_bytes(sequence, write_file):
+    file_name = write_file("records.fasta", RECORDS + ">empty\n")
+    index = sequence.build_index(file_name)
+    with open(file_name, "rb") as file:
+        data, sequence_start = sequence.read_record_bytes(file, index[2])
+        assert data == b">NM_3 third\nGGGGG\nCCCCC\nA"
+        assert data[sequence_start:] == b"GGGGG\nCCCCC\nA"
+        data, sequence_start = sequence.read_record_bytes(file, index[4])
+        assert data == b">empty"
+        assert data[sequence_start:] == b""
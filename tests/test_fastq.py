@@ -0,0 +1,101 @@
+"""
+Tests of the FASTQ input: the records on the fasta operations, the quality statistics, trimming and conversion.
+"""
+import gzip
+import os
+import zipfile
+
+import pytest
+
+from test_stats_table import read_npy, read_table
+
+READS = "@r1 x\nACGTAC\n+\nIIII#!\n@r2\nGGNN\n+r2\n5555\n"
+
+
+def test_reads_are_records(run, write_file, output_directory, capsys):
+    file_name = write_file("reads.fastq", READS)
+    assert run("count", file_name) == 0
+    assert capsys.readouterr().out == "Number of fasta sequences: 2\n"
+    assert run("lengths", file_name) == 0
+    assert (output_directory / "reads.fasta").read_text() == (">r1 x, sequence length 6 bp\nACGTAC\n"
+                                                              ">r2, sequence length 4 bp\nGGNN\n")
+
+
+@pytest.mark.parametrize("name, content", [("reads.fq", READS.replace("\n", "\r\n").encode()),
+                                           ("reads.fastq.gz", gzip.compress(READS.encode())),
+                                           ("reads.fastq", READS.rstrip("\n").encode() + b"\n\n")])
+def test_line_endings_and_compression(sequence, write_file, name, content):
+    file_name = write_file(name, content)
+    assert list(sequence.read_fastq_records(file_name)) == [(">r1 x", b"ACGTAC", b"IIII#!"),
+                                                            (">r2", b"GGNN", b"5555")]
+
+
+def test_reads_larger_than_a_block(sequence, write_file, monkeypatch):
+    # records are cut by the blocks the file is read in
+    text = "".join("@r" + str(number) + "\n" + "ACGT" * number + "\n+\n" + "I" * 4 * number + "\n"
+                   for number in range(300))
+    file_name = write_file("reads.fastq", text)
+    read = sequence.open_input_file
+
+    def open_with_small_blocks(file_name):
+        file = read(file_name)
+        read_block = file.read
+        file.read = lambda size=-1: read_block(min(size, 1000) if size >= 0 else size)
+        return file
+
+    monkeypatch.setattr(sequence, "open_input_file", open_with_small_blocks)
+    records = list(sequence.read_fastq_records(file_name))
+    assert [record[1] for record in records] == [b"ACGT" * number for number in range(300)]
+
+
+def test_quality_statistics(run, write_file, output_directory, capsys):
+    file_name = write_file("reads.fastq", READS)
+    assert run("fastq-stats", file_name) == 0
+    assert capsys.readouterr().out.startswith("Reads: 2, mean quality: 24.2, Q30: 40.0%\n")
+    assert read_table(output_directory, "reads.read_quality.tsv") == [
+        ["ID", "length", "mean_quality", "Q30_fraction"], ["r1", "6", "27.0", "0.6667"], ["r2", "4", "20.0", "0.0"]]
+    assert read_table(output_directory, "reads.position_quality.tsv") == [
+        ["position", "reads", "mean_quality", "Q30_fraction"]] + [
+        [str(position), "2", "30.0", "0.5"] for position in range(1, 5)] + [["5", "1", "2.0", "0.0"],
+                                                                            ["6", "1", "0.0", "0.0"]]
+
+
+def test_quality_statistics_as_npz(run, write_file, output_directory):
+    file_name = write_file("reads.fastq", READS)
+    assert run("fastq-stats", file_name, "--format", "npz") == 0
+    with zipfile.ZipFile(os.path.join(output_directory, "reads.read_quality.npz")) as archive:
+        columns = {name[:-len(".npy")]: read_npy(archive.read(name)) for name in archive.namelist()}
+    assert columns["ID"] == [b"r1", b"r2"]
+    assert columns["length"] == [6, 4]
+    assert columns["mean_quality"] == [27.0, 20.0]
+
+
+def test_phred_offset(run, write_file, output_directory):
+    # the same qualities with an offset of 64
+    file_name = write_file("reads.fastq", READS.replace("IIII#!", "hhhhB@").replace("5555", "TTTT"))
+    assert run("fastq-stats", file_name, "--phred-offset", "64") == 0
+    assert read_table(output_directory, "reads.read_quality.tsv")[1:] == [["r1", "6", "27.0", "0.6667"],
+                                                                         ["r2", "4", "20.0", "0.0"]]
+
+
+def test_trim(run, write_file, output_directory, capsys):
+    file_name = write_file("reads.fastq", READS + "@r3\nACGTA\n+\n!!I!!\n")
+    assert run("trim", file_name, "--quality", "20", "--min-length", "2") == 0
+    assert capsys.readouterr().out.startswith("Kept 2 of 3 reads\n")
+    assert (output_directory / "reads.trimmed.fastq").read_text() == "@r1 x\nACGT\n+\nIIII\n@r2\nGGNN\n+\n5555\n"
+
+
+def test_fastq_to_fasta(run, write_file, output_directory):
+    file_name = write_file("reads.fastq", READS)
+    assert run("fastq-to-fasta", file_name) == 0
+    assert (output_directory / "reads.fasta").read_text() == ">r1 x\nACGTAC\n>r2\nGGNN\n"
+
+
+@pytest.mark.parametrize("content, message", [
+    ("@r1\nACG\n+\nII\n", "Not a FASTQ record at line 1 of "),
+    ("@r1\nACG\n+\nIII\nr2\nAC\n+\nII\n", "Not a FASTQ record at line 5 of "),
+    ("@r1\nACG\n+\nIII\n@r2\nAC\n", "Incomplete FASTQ record at the end of ")])
+def test_broken_records_fail(run, write_file, capsys, content, message):
+    file_name = write_file("reads.fastq", content)
+    assert run("fastq-to-fasta", file_name) == 1
+    assert capsys.readouterr().err.startswith("FASTQ Error: " + message)
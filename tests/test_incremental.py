@@ -0,0 +1,72 @@
+"""
+Tests of the incremental annotation of fasta files that only grow at their end.
+"""
+import json
+
+import pytest
+
+RECORDS = ">a\nACGT\n>b\nGGCC\n"
+APPENDED = ">c\nTTTTT\n"
+PROTEIN = ">p\nMVLSPADKTNVKAAWGKVGAHAGEYGAEALERMFLSFPTTKTYFPHF\n"
+
+
+@pytest.fixture
+def annotate(run, tmp_path, output_directory):
+    """ Annotates a file incrementally, and returns the output and the number of records read."""
+
+    def annotate_file(file_name, *options):
+        assert run(*(options or ("lengths",)), file_name, "--incremental", "--report", tmp_path / "run.json") == 0
+        report = json.loads((tmp_path / "run.json").read_text())
+        return (output_directory / "genome.fasta").read_text(), report["records"]
+
+    return annotate_file
+
+
+def test_only_appended_records_are_read(annotate, write_file, output_directory):
+    file_name = write_file("genome.fasta", RECORDS)
+    assert annotate(file_name)[1] == 2
+    assert (output_directory / "genome.fasta.checkpoint").exists()
+
+    with open(file_name, "a") as file:
+        file.write(APPENDED)
+    output, records = annotate(file_name)
+    assert records == 1
+    assert output == ">a, sequence length 4 bp\nACGT\n>b, sequence length 4 bp\nGGCC\n>c, sequence length 5 bp\nTTTTT\n"
+
+    # nothing is read when nothing was appended
+    assert annotate(file_name) == (output, 0)
+
+
+def test_changed_input_is_annotated_again(annotate, write_file):
+    file_name = write_file("genome.fasta", RECORDS)
+    annotate(file_name)
+    with open(file_name, "w") as file:
+        file.write(">a\nACGTAA\n>b\nGGCC\n" + APPENDED)
+    output, records = annotate(file_name)
+    assert records == 3
+    assert output.startswith(">a, sequence length 6 bp\n")
+
+
+def test_modified_output_is_written_again(annotate, write_file, output_directory):
+    file_name = write_file("genome.fasta", RECORDS)
+    output = annotate(file_name)[0]
+    (output_directory / "genome.fasta").write_text("edited\n")
+    assert annotate(file_name) == (output, 2)
+
+
+def test_other_settings_are_written_again(annotate, write_file):
+    file_name = write_file("genome.fasta", RECORDS)
+    annotate(file_name, "content", "--annotate")
+    output, records = annotate(file_name, "content", "--annotate", "--content-type", "AT")
+    assert records == 2
+    assert output == ">a, AT content: 0.5\nACGT\n>b, AT content: 0.0\nGGCC\n"
+
+
+def test_appended_protein_keeps_the_output(run, annotate, write_file, output_directory):
+    file_name = write_file("genome.fasta", RECORDS)
+    output = annotate(file_name, "content", "--annotate")[0]
+    with open(file_name, "a") as file:
+        file.write(APPENDED + PROTEIN)
+    assert run("content", file_name, "--annotate", "--incremental") == 1
+    # the output is cut back to the records of the checkpoint
+    assert (output_directory / "genome.fasta").read_text() == output
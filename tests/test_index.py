@@ -0,0 +1,85 @@
+"""
+Tests of the ".fai" index: the entries, the checks of a saved index and the records with lines of different widths.
+"""
+import os
+
+import Fasta
+
+WRAPPED = ">x1 first\nACGTA\nCGTAC\nGT\n>x2\nTTTTT\nGG\n>x3 empty\n"
+
+# a valid fasta file that samtools can not index, as the first record has lines of different widths
+IRREGULAR = ">x1 a\nACGTACGTAC\nCC\nCC\nCC\nCC\n>x2 b\nTT\n"
+
+
+def test_entries(sequence, write_file):
+    file_name = write_file("wrapped.fasta", WRAPPED)
+    index = sequence.build_index(file_name)
+    assert index == [("x1", 12, 10, 5, 6), ("x2", 7, 29, 5, 6), ("x3", 0, 48, 0, 0)]
+    with open(file_name + ".fai") as file:
+        assert file.read() == "x1\t12\t10\t5\t6\nx2\t7\t29\t5\t6\nx3\t0\t48\t0\t0\n"
+    assert sequence.load_index(file_name) == index
+
+
+def test_record_ends(sequence, write_file):
+    file_name = write_file("wrapped.fasta", WRAPPED)
+    with open(file_name, "rb") as file:
+        data = file.read()
+    for entry in sequence.build_index(file_name):
+        sequence_bytes = data[entry[2]:sequence.get_record_end(entry)]
+        assert len(sequence_bytes.replace(b"\n", b"")) == entry[1]
+        assert not sequence_bytes.endswith(b"\n")
+
+
+def test_windows_line_endings(sequence, write_file):
+    file_name = write_file("windows.fasta", WRAPPED.replace("\n", "\r\n"))
+    assert sequence.build_index(file_name)[:2] == [("x1", 12, 11, 5, 7), ("x2", 7, 34, 5, 7)]
+
+
+def test_saved_index_is_checked(sequence, write_file):
+    file_name = write_file("wrapped.fasta", WRAPPED)
+    sequence.build_index(file_name)
+    assert sequence.is_index_valid(file_name, file_name + ".fai")
+
+    with open(file_name, "a") as file:
+        file.write(">x4\nAAA\n")
+    assert not sequence.is_index_valid(file_name, file_name + ".fai")
+    assert [entry[0] for entry in sequence.load_index(file_name)] == ["x1", "x2", "x3", "x4"]
+
+
+def test_different_line_widths(sequence, write_file):
+    file_name = write_file("irregular.fasta", IRREGULAR)
+    try:
+        sequence.build_index(file_name)
+    except Fasta.FastaIndexError as error:
+        assert "x1" in str(error)
+    else:
+        raise AssertionError("the index of a record with lines of different widths was built")
+    assert not os.path.exists(file_name + ".fai")
+
+    # counting the records does not need the widths of the lines
+    assert sequence.count_index_records(file_name) == 2
+    assert not os.path.exists(file_name + ".fai")
+
+
+def test_blank_line_inside_a_record(sequence, write_file):
+    file_name = write_file("blank.fasta", ">x1\nACGT\n\nACGT\n")
+    assert sequence.build_index(file_name, check_line_widths=False) == [("x1", 8, 4, 4, 5)]
+    try:
+        sequence.build_index(file_name)
+    except Fasta.FastaIndexError:
+        pass
+    else:
+        raise AssertionError("the index of a record with a blank line inside was built")
+
+
+def test_count(run, write_file, capsys):
+    assert run("count", write_file("wrapped.fasta", WRAPPED)) == 0
+    assert "Number of fasta sequences: 3" in capsys.readouterr().out
+    assert run("count", write_file("irregular.fasta", IRREGULAR)) == 0
+    assert "Number of fasta sequences: 2" in capsys.readouterr().out
+
+
+def test_index_error_exit(run, write_file, output_directory, capsys):
+    assert run("sort", write_file("irregular.fasta", IRREGULAR)) == 1
+    assert "Index Error" in capsys.readouterr().err
+    assert not os.path.exists(output_directory / "irregular.sorted.fasta")
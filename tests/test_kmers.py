@@ -0,0 +1,94 @@
+"""
+Tests of the canonical k-mer counts: the count table, the process pool and the sorted runs on disk.
+"""
+import collections
+import os
+import random
+import struct
+
+import pytest
+
+import Fasta
+
+COMPLEMENT = str.maketrans("ACGT", "TGCA")
+
+
+def count_canonical_kmers(text, k):
+    """ Counts the canonical k-mers of the sequences of a fasta text one window at a time."""
+
+    counts = collections.Counter()
+    for record in text.split(">")[1:]:
+        bases = "".join(record.split("\n")[1:]).upper().replace("U", "T")
+        for start in range(len(bases) - k + 1):
+            kmer = bases[start:start + k]
+            if set(kmer) <= set("ACGT"):
+                counts[min(kmer, kmer.translate(COMPLEMENT)[::-1])] += 1
+    return counts
+
+
+def read_count_table(file_name):
+    with open(file_name, "rb") as file:
+        data = file.read()
+    magic, k, number_of_kmers = struct.unpack_from("<4sIQ", data)
+    assert magic == b"KMER"
+    values = struct.unpack_from("<" + str(2 * number_of_kmers) + "Q", data, 16)
+    codes = values[0::2]
+    assert list(codes) == sorted(codes)
+    return {"".join("ACGT"[(code >> (2 * position)) & 3] for position in range(k - 1, -1, -1)): count
+            for code, count in zip(codes, values[1::2])}
+
+
+def make_records(seed=1):
+    generator = random.Random(seed)
+    return "".join(">r" + str(number) + "\n" + "".join(generator.choice("ACGTN" if number % 5 else "acgu")
+                                                         for _ in range(generator.randrange(400))) + "\n"
+                   for number in range(60))
+
+
+def test_small_count_table(run, write_file, output_directory, capsys):
+    file_name = write_file("genome.fasta", ">a\nACGTNACGTT\n>b\nGGGAC\n")
+    assert run("kmers", file_name, "-k", "3", "--top", "2") == 0
+    assert capsys.readouterr().out.startswith("Distinct k-mers: 5, total k-mers: 8\n")
+    assert read_count_table(output_directory / "genome.fasta.k3.kmers") == {"ACG": 4, "AAC": 1, "CCC": 1, "GAC": 1,
+                                                                           "GGA": 1}
+    assert (output_directory / "genome.fasta.k3.top.tsv").read_text().splitlines()[:2] == ["kmer\tcount", "ACG\t4"]
+
+
+@pytest.mark.parametrize("k", [1, 5, 21, 31])
+def test_counts_match_a_count_of_every_window(sequence, write_file, output_directory, k):
+    text = make_records()
+    file_name = write_file("genome.fasta", text)
+    sequence.count_kmers(k, file_name=file_name)
+    assert read_count_table(output_directory / ("genome.fasta.k" + str(k) + ".kmers")) == \
+        count_canonical_kmers(text, k)
+
+
+def test_workers_and_runs_on_disk_give_the_same_table(sequence, write_file, output_directory, monkeypatch):
+    file_name = write_file("genome.fasta", make_records(2))
+    table_file_name = output_directory / "genome.fasta.k11.kmers"
+    sequence.count_kmers(11, file_name=file_name)
+    in_memory = table_file_name.read_bytes()
+
+    sequence.count_kmers(11, workers=4, file_name=file_name)
+    assert table_file_name.read_bytes() == in_memory
+
+    # a memory limit of a few k-mers writes many sorted runs, which are merged
+    run_file_names = []
+    write_kmer_run = Fasta.Sequence.write_kmer_run
+
+    def record_run(self, counts, run_file_name):
+        run_file_names.append(run_file_name)
+        write_kmer_run(self, counts, run_file_name)
+
+    monkeypatch.setattr(Fasta.Sequence, "write_kmer_run", record_run)
+    sequence.count_kmers(11, memory_limit=2000, file_name=file_name)
+    assert len(run_file_names) > 2
+    assert table_file_name.read_bytes() == in_memory
+    # the runs are removed after the merge
+    assert sorted(os.listdir(output_directory)) == ["genome.fasta.k11.kmers", "genome.fasta.k11.top.tsv"]
+
+
+def test_protein_has_no_kmers(run, write_file, capsys):
+    file_name = write_file("genome.fasta", ">p\nMVLSPADKTNVKAAWGKVGAHAGEYGAEALERMFLSFPTTKTYFPHF\n")
+    assert run("kmers", file_name, "-k", "3") == 1
+    assert capsys.readouterr().err.startswith("Sequence Type Error: ")
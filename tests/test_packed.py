@@ -0,0 +1,72 @@
+"""
+Tests of the packed sequence files: pack and unpack, reading parts of the records and reading them as fasta files.
+"""
+import os
+import random
+
+import packed
+
+RECORDS = (">s1 soft-masked with N and IUPAC codes\nACGTNNNNacgtRYK\nNNNNNNNNNNNNNNN\nACGTAC\n"
+           ">s2 RNA\nACGUUUAC\n>s3 empty\n>s4 with U and T\nACGTU\n")
+
+
+def test_round_trip(run, write_file, output_directory):
+    file_name = write_file("records.fasta", RECORDS)
+    assert run("pack", file_name) == 0
+    assert run("unpack", output_directory / "records.fa2b") == 0
+    with open(output_directory / "records.fasta", "rb") as file:
+        assert file.read() == RECORDS.encode()
+
+
+def test_parts_of_records(tmp_path):
+    generator = random.Random(1)
+    sequences = [b"".join(generator.choice([b"A", b"C", b"G", b"T", b"N" * 7, b"acg", b"R"])
+                          for _ in range(generator.randrange(0, 300))) for _ in range(20)]
+    file_name = str(tmp_path / "random.fa2b")
+    with packed.PackedFastaWriter(file_name) as writer:
+        for number, sequence in enumerate(sequences):
+            writer.add(">r" + str(number), sequence, 60)
+
+    with packed.PackedFasta(file_name) as store:
+        assert [Header for offset, Header in store.records] == [">r" + str(number) for number in range(20)]
+        for number, sequence in enumerate(sequences):
+            assert store.get_sequence(number) == sequence
+            assert store.get_sequence(number, keep_case=False) == sequence.upper()
+            for _ in range(10):
+                start = generator.randrange(len(sequence) + 1)
+                end = generator.randrange(start, len(sequence) + 1)
+                assert store.get_sequence(number, start, end) == sequence[start:end]
+            info = store.get_record_info(number)
+            assert info["length"] == len(sequence)
+            assert info["line_width"] == 60
+            assert info["composition"]["N"] == sequence.upper().count(b"N")
+
+
+def test_operations_read_packed_files(run, write_file, output_directory, capsys):
+    file_name = write_file("records.fasta", RECORDS)
+    assert run("pack", file_name) == 0
+    capsys.readouterr()
+    assert run("count", file_name) == 0
+    assert run("count", output_directory / "records.fa2b") == 0
+    fasta_count, packed_count = capsys.readouterr().out.splitlines()
+    assert fasta_count == packed_count == "Number of fasta sequences: 4"
+
+    assert run("lengths", output_directory / "records.fa2b") == 0
+    with open(output_directory / "records.fasta", "rb") as file:
+        Headers = [line for line in file.read().decode().splitlines() if line.startswith(">")]
+    assert Headers[1] == ">s2 RNA, sequence length 8 bp"
+
+
+def test_protein_is_not_packed(run, write_file, output_directory, capsys):
+    assert run("pack", write_file("protein.fasta", ">p1\nMKLVWQE\n")) == 1
+    assert "Sequence Type Error" in capsys.readouterr().err
+    assert not os.path.exists(output_directory / "protein.fa2b")
+    assert not os.path.exists(output_directory / "protein.fa2b.part")
+
+
+def test_irregular_line_widths_are_packed(run, write_file, output_directory):
+    # the first line width is kept, so the sequence is restored with lines of that width
+    assert run("pack", write_file("irregular.fasta", ">x1\nACGTACGTAC\nCC\nCC\n>x2\nTT\n")) == 0
+    assert run("unpack", output_directory / "irregular.fa2b") == 0
+    with open(output_directory / "irregular.fasta", "rb") as file:
+        assert file.read() == b">x1\nACGTACGTAC\nCCCC\n>x2\nTT\n"
@@ -0,0 +1,79 @@
+"""
+Tests of the single-pass pipeline of clean, length, content and filter stages.
+"""
+import os
+import json
+
+RECORDS = ">n1 first\nACGTXX\nGGCC\n>n2\nATAT\n>n3 third\nGGGGGCCCCC\n"
+
+
+def write_spec(write_file, spec):
+    return write_file("spec.json", json.dumps(spec))
+
+
+def read_output(output_directory, name):
+    with open(os.path.join(output_directory, name), "rb") as file:
+        return file.read().decode()
+
+
+def test_stages_in_one_pass(run, write_file, output_directory):
+    spec = write_spec(write_file, {"stages": [{"stage": "clean"}, {"stage": "length"},
+                                              {"stage": "content", "content_type": "GC"},
+                                              {"stage": "filter", "min_length": 5},
+                                              {"stage": "write", "line_width": 4}]})
+    assert run("pipeline", write_file("records.fasta", RECORDS), "--spec", spec) == 0
+    assert read_output(output_directory, "records.pipeline.fasta") == (
+        ">n1 first, sequence length 8 bp, GC content: 0.75\nACGT\nGGCC\n"
+        ">n3 third, sequence length 10 bp, GC content: 1.0\nGGGG\nGCCC\nCC\n")
+
+
+def test_filter(run, write_file, output_directory):
+    spec = write_spec(write_file, [{"stage": "filter", "max_GC": 0.5, "types": ["DNA"]}])
+    assert run("pipeline", write_file("records.fasta", RECORDS), "--spec", spec) == 0
+    assert read_output(output_directory, "records.pipeline.fasta") == ">n2\nATAT\n"
+
+
+def test_split_names_come_from_the_original_headers(run, write_file, output_directory):
+    spec = write_spec(write_file, [{"stage": "length"}, {"stage": "split"}])
+    assert run("pipeline", write_file("records.fasta", RECORDS), "--spec", spec) == 0
+    assert sorted(os.listdir(output_directory)) == ["n1.fasta", "n2.fasta", "n3.fasta"]
+    assert read_output(output_directory, "n2.fasta") == ">n2, sequence length 4 bp\nATAT\n"
+
+
+def test_shards(run, write_file, output_directory):
+    spec = write_spec(write_file, [{"stage": "split", "records_per_file": 2}])
+    assert run("pipeline", write_file("records.fasta", RECORDS), "--spec", spec) == 0
+    assert sorted(os.listdir(output_directory)) == ["records_0001.fasta", "records_0002.fasta"]
+    assert read_output(output_directory, "records_0002.fasta") == ">n3 third\nGGGGGCCCCC\n"
+
+
+def test_protein_stops_the_pipeline(run, write_file, output_directory, capsys):
+    # the records before the protein are written before the content stage reaches it, and are removed again
+    file_name = write_file("mixed.fasta", RECORDS + ">p1\nMKLWVQEEH\n")
+    for output in [{"stage": "write"}, {"stage": "split"}, {"stage": "split", "records_per_file": 1}]:
+        spec = write_spec(write_file, [{"stage": "content"}, output])
+        assert run("pipeline", file_name, "--spec", spec) == 1
+        assert "Sequence Type Error" in capsys.readouterr().err
+        assert not os.path.exists(output_directory) or os.listdir(output_directory) == []
+
+
+def test_wrong_options(run, write_file, output_directory, capsys):
+    file_name = write_file("records.fasta", RECORDS)
+    for spec in [[{"stage": "filter", "min_length": "5"}], [{"stage": "filter", "types": "DNA"}],
+                 [{"stage": "clean", "alphabet": "unknown"}], [{"stage": "length", "unknown": 1}],
+                 [{"stage": "sort"}], [{"stage": "write", "line_width": 0}],
+                 [{"stage": "write", "records_per_file": 2}]]:
+        assert run("pipeline", file_name, "--spec", write_spec(write_file, spec)) == 1
+        assert "Pipeline Error" in capsys.readouterr().err
+        assert not os.path.exists(output_directory) or os.listdir(output_directory) == []
+
+
+def test_malformed_specs(run, write_file, output_directory, capsys):
+    file_name = write_file("records.fasta", RECORDS)
+    for spec in [{"stage": "clean"}, {"stages": {"stage": "clean"}}, {"stages": [], "output": "x"}, {}, "clean",
+                 ["clean"]]:
+        assert run("pipeline", file_name, "--spec", write_spec(write_file, spec)) == 1
+        assert "Pipeline Error" in capsys.readouterr().err
+    assert run("pipeline", file_name, "--spec", write_file("spec.json", "[{")) == 1
+    assert "Pipeline Error" in capsys.readouterr().err
+    assert not os.path.exists(output_directory) or os.listdir(output_directory) == []
@@ -0,0 +1,48 @@
+"""
+Tests of the streaming record parser: headers and sequences, byte ranges and record boundaries.
+"""
+import gzip
+
+RECORDS = ">s1 first\nacgt\nNNAC\n\n>s2\n>s3 third\r\nGGTT\r\n"
+
+
+def test_records_are_read_one_at_a_time(sequence, write_file):
+    file_name = write_file("genome.fasta", RECORDS)
+    records = sequence.read_records(file_name)
+    assert next(records) == (">s1 first", b"ACGTNNAC")
+    assert list(records) == [(">s2", b""), (">s3 third", b"GGTT")]
+
+
+def test_records_keep_their_case(sequence, write_file):
+    file_name = write_file("genome.fasta", RECORDS)
+    assert next(sequence.read_records(file_name, keep_case=True)) == (">s1 first", b"acgtNNAC")
+
+
+def test_sequence_before_the_first_header(sequence, write_file):
+    file_name = write_file("genome.fasta", "ACGT\n>s1\nGG\n")
+    assert list(sequence.read_records(file_name)) == [("", b"ACGT"), (">s1", b"GG")]
+
+
+def test_last_line_without_newline(sequence, write_file):
+    file_name = write_file("genome.fasta", ">s1\nAC\nGT")
+    assert list(sequence.read_records(file_name)) == [(">s1", b"ACGT")]
+
+
+def test_compressed_file_is_read_as_plain(sequence, write_file):
+    file_name = write_file("genome.fasta.gz", gzip.compress(RECORDS.encode()))
+    plain_file_name = write_file("genome.fasta", RECORDS)
+    assert list(sequence.read_records(file_name)) == list(sequence.read_records(plain_file_name))
+
+
+def test_byte_ranges_read_every_record_once(sequence, write_file):
+    text = "".join(">r" + str(number) + "\n" + "ACGT" * number + "\n" for number in range(50))
+    file_name = write_file("genome.fasta", text)
+    whole = list(sequence.read_records(file_name))
+    for number_of_chunks in [1, 2, 7, 50, 200]:
+        boundaries = sequence.find_record_boundaries(file_name, number_of_chunks)
+        assert boundaries[0] == 0 and boundaries[-1] == len(text)
+        assert all(text[boundary] == ">" for boundary in boundaries[:-1])
+        records = []
+        for start, end in zip(boundaries, boundaries[1:]):
+            records.extend(sequence.read_records(file_name, start, end))
+        assert records == whole
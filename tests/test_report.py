@@ -0,0 +1,60 @@
+"""
+Tests of the JSON run reports and the cProfile statistics of the commands.
+"""
+import json
+import pstats
+
+import Fasta
+
+RECORDS = ">a\nACGT\n>b\nGGCC\n"
+
+
+def test_run_report(run, write_file, tmp_path):
+    file_name = write_file("genome.fasta", RECORDS)
+    report_file_name = tmp_path / "run.json"
+    assert run("lengths", file_name, "--report", report_file_name) == 0
+    report = json.loads(report_file_name.read_text())
+    assert report["operation"] == "lengths"
+    assert sorted(report["stages"]) == sorted(Fasta.Fasta.report_stages)
+    assert report["stages"]["write"]["calls"] == 2
+    assert report["input_files"] == [file_name]
+    assert report["bytes_in"] == len(RECORDS)
+    assert report["records"] == 2
+    assert report["output_files"] == 1
+    assert report["bytes_out"] == len(">a, sequence length 4 bp\nACGT\n>b, sequence length 4 bp\nGGCC\n")
+    assert report["failed"] is False and report["cancelled"] is False
+    assert report["wall_seconds"] > 0 and report["peak_traced_memory_bytes"] > 0
+
+
+def test_report_of_the_workers(run, write_file, tmp_path):
+    file_name = write_file("genome.fasta", RECORDS * 50)
+    report_file_name = tmp_path / "run.json"
+    assert run("lengths", file_name, "--workers", "2", "--no-cache", "--report", report_file_name) == 0
+    report = json.loads(report_file_name.read_text())
+    # the stages measured in the workers are added to the report
+    assert report["records"] == 100
+    assert report["stages"]["compute"]["calls"] >= 100
+    assert report["worker_cpu_seconds"] > 0
+
+
+def test_report_is_printed(run, write_file, capsys):
+    file_name = write_file("genome.fasta", RECORDS)
+    assert run("count", file_name, "--report", "-") == 0
+    output = capsys.readouterr().out
+    assert output.startswith("Number of fasta sequences: 2\n")
+    assert json.loads(output[output.index("{"):])["operation"] == "count"
+
+
+def test_report_of_a_failed_operation(run, write_file, tmp_path):
+    file_name = write_file("genome.fasta", RECORDS)
+    report_file_name = tmp_path / "run.json"
+    assert run("content", file_name, "--report", report_file_name) == 1
+    assert json.loads(report_file_name.read_text())["failed"] is True
+
+
+def test_profile(run, write_file, tmp_path):
+    file_name = write_file("genome.fasta", RECORDS)
+    profile_file_name = tmp_path / "run.prof"
+    assert run("lengths", file_name, "--profile", profile_file_name) == 0
+    statistics = pstats.Stats(str(profile_file_name))
+    assert any(function[2] == "add_sequence_lengths_to_headers" for function in statistics.stats)
@@ -0,0 +1,115 @@
+"""
+Tests of the external merge sort of records by length, GC content and ID.
+"""
+import os
+import gzip
+import random
+
+
+def make_records(number_of_records, seed=1):
+    """ Returns random records with repeated IDs, lengths and GC contents, so the order of equal keys is tested."""
+
+    generator = random.Random(seed)
+    records = []
+    for number in range(number_of_records):
+        Header = ">id" + str(generator.randrange(number_of_records // 3 + 1)) + " record " + str(number)
+        sequence = "".join(generator.choice("ACGT") for _ in range(generator.randrange(1, 12)))
+        records.append((Header, sequence))
+    return records
+
+
+def format_records(records, line_width=5):
+    return "".join(Header + "\n" + "".join(sequence[start:start + line_width] + "\n"
+                                           for start in range(0, len(sequence), line_width))
+                   for Header, sequence in records)
+
+
+def sort_key(key):
+    if key == "length":
+        return lambda record: len(record[1])
+    if key == "GC":
+        return lambda record: (record[1].count("G") + record[1].count("C")) / len(record[1])
+    return lambda record: record[0][1:].split()[0]
+
+
+def read_output(output_directory, name):
+    with open(os.path.join(output_directory, name), "rb") as file:
+        return file.read().decode()
+
+
+def test_sort_keys(run, write_file, output_directory):
+    records = make_records(200)
+    file_name = write_file("records.fasta", format_records(records))
+    for key in ["length", "GC", "ID"]:
+        for descending in [False, True]:
+            assert run("sort", file_name, "--key", key, *(["--descending"] if descending else [])) == 0
+            # sorted is stable, so records with the same key stay in file order, as in the sort of Fasta.py
+            expected = sorted(records, key=sort_key(key), reverse=descending)
+            assert read_output(output_directory, "records.sorted.fasta") == format_records(expected)
+
+
+def test_spilled_runs_match_in_memory_sort(run, write_file, tmp_path):
+    # with no memory for the keys, every 1000 keys are written to disk as a sorted run
+    file_name = write_file("records.fasta", format_records(make_records(2500)))
+    for key in ["length", "GC", "ID"]:
+        assert run("sort", file_name, "--key", key, "--memory-mb", 0) == 0
+        spilled = read_output(tmp_path / "Output", "records.sorted.fasta")
+        assert run("sort", file_name, "--key", key) == 0
+        assert read_output(tmp_path / "Output", "records.sorted.fasta") == spilled
+    # the runs are removed
+    assert [name for name in os.listdir(tmp_path / "Output") if name.startswith("sort_")] == []
+
+
+def test_sort_compressed_and_packed(run, write_file, tmp_path, output_directory):
+    records = make_records(100)
+    expected = format_records(sorted(records, key=sort_key("GC")))
+
+    file_name = str(tmp_path / "compressed.fasta.gz")
+    with gzip.open(file_name, "wb") as file:
+        file.write(format_records(records).encode())
+    assert run("sort", file_name, "--key", "GC") == 0
+    assert read_output(output_directory, "compressed.sorted.fasta") == expected
+
+    assert run("pack", write_file("packed.fasta", format_records(records))) == 0
+    assert run("sort", os.path.join(output_directory, "packed.fa2b"), "--key", "GC") == 0
+    assert read_output(output_directory, "packed.sorted.fasta") == expected
+
+
+def test_sort_whole_irregular_record_with_old_index(sequence, run, write_file, output_directory):
+    # the first record has lines of different widths, and its index entry has the width of its first line,
+    # as an index written without checking the widths. Sorting must not cut its last lines.
+    records = [(">x1 a", "ACGTACGTACCCCCCCCC")] + make_records(1500)
+    text = ">x1 a\nACGTACGTAC\nCC\nCC\nCC\nCC\n" + format_records(records[1:])
+    file_name = write_file("irregular.fasta", text)
+    index = sequence.build_index(file_name, check_line_widths=False)
+    assert index[0] == ("x1", 18, 6, 10, 11)
+    with open(file_name + ".fai", "w") as file:
+        for entry in index:
+            file.write("\t".join(str(value) for value in entry) + "\n")
+    status = os.stat(file_name)
+    os.utime(file_name + ".fai", ns=(status.st_atime_ns, status.st_mtime_ns))
+
+    for memory in [512, 0]:
+        assert run("sort", file_name, "--key", "length", "--descending", "--memory-mb", memory) == 0
+        output = read_output(output_directory, "irregular.sorted.fasta")
+        assert output.startswith(">x1 a\nACGTACGTAC\nCC\nCC\nCC\nCC\n>")
+        assert len(output) == len(text)
+
+
+def test_sort_irregular_file_without_index(run, write_file, output_directory, capsys):
+    file_name = write_file("irregular.fasta", ">x1 a\nACGTACGTAC\nCC\nCC\nCC\nCC\n>x2 b\nTT\n")
+    assert run("sort", file_name) == 1
+    assert "Index Error" in capsys.readouterr().err
+    assert not os.path.exists(os.path.join(output_directory, "irregular.sorted.fasta"))
+
+
+def test_sort_fastq_is_rejected(run, write_file, capsys):
+    assert run("sort", write_file("reads.fastq", "@r1\nACGT\n+\nIIII\n")) == 1
+    assert "Input Error" in capsys.readouterr().err
+
+
+def test_sort_read_runs(sequence, tmp_path):
+    items = [(3, 0), (5, 2), (5, 7)]
+    file_name = str(tmp_path / "run")
+    sequence.write_sort_run(items, file_name)
+    assert list(sequence.read_sort_run(file_name, int)) == items
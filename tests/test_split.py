@@ -0,0 +1,56 @@
+"""
+Tests of the split of a multi-fasta file into one file per record or into shards.
+"""
+import gzip
+import os
+
+RECORDS = "".join(">r" + str(number) + " description\n" + "ACGT" * (number + 1) + "\n" for number in range(10))
+
+
+def read_shards(output_directory):
+    names = sorted(os.listdir(output_directory))
+    return names, [(output_directory / name).read_text() for name in names]
+
+
+def test_one_file_per_record(run, write_file, output_directory):
+    file_name = write_file("genome.fasta", RECORDS)
+    assert run("split", file_name) == 0
+    names = sorted(os.listdir(output_directory))
+    assert names == sorted("r" + str(number) + ".fasta" for number in range(10))
+    assert (output_directory / "r3.fasta").read_text() == ">r3 description\n" + "ACGT" * 4 + "\n"
+
+
+def test_shards_by_record_count(run, write_file, output_directory):
+    file_name = write_file("genome.fasta", RECORDS)
+    assert run("split", file_name, "--records-per-file", "4") == 0
+    names, contents = read_shards(output_directory)
+    assert names == ["genome_0001.fasta", "genome_0002.fasta", "genome_0003.fasta"]
+    assert [content.count(">") for content in contents] == [4, 4, 2]
+    assert "".join(contents) == RECORDS
+
+
+def test_shards_by_size(run, write_file, output_directory):
+    file_name = write_file("genome.fasta", RECORDS)
+    assert run("split", file_name, "--bytes-per-file", "60") == 0
+    names, contents = read_shards(output_directory)
+    assert "".join(contents) == RECORDS
+    # a shard is larger than the limit only if it holds a single record
+    for content in contents:
+        assert len(content) <= 60 or content.count(">") == 1
+    assert len(names) > 3
+
+
+def test_shards_with_line_width(run, write_file, output_directory):
+    file_name = write_file("genome.fasta", ">r1\nACGTACGTAC\n>r2\nGG\n")
+    assert run("split", file_name, "--records-per-file", "10", "--line-width", "4") == 0
+    assert (output_directory / "genome_0001.fasta").read_text() == ">r1\nACGT\nACGT\nAC\n>r2\nGG\n"
+
+
+def test_compressed_shards(run, write_file, output_directory):
+    file_name = write_file("genome.fasta", RECORDS)
+    assert run("split", file_name, "--records-per-file", "5", "--compress") == 0
+    names = sorted(name for name in os.listdir(output_directory) if name.endswith(".gz"))
+    assert names == ["genome_0001.fasta.gz", "genome_0002.fasta.gz"]
+    assert b"".join(gzip.decompress((output_directory / name).read_bytes()) for name in names) == RECORDS.encode()
+    # no temporary files are left
+    assert not [name for name in os.listdir(output_directory) if name.endswith(".part")]
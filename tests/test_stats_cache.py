@@ -0,0 +1,97 @@
+"""
+Tests of the statistics cache: repeated runs read the cache, changed files are read again,
+the least recently used files are evicted and the connection is closed when the command ends.
+"""
+import sqlite3
+
+import pytest
+
+import Fasta
+
+FASTA = ">one\nACGTACGTGG\n>two\nAATTAATT\n"
+
+
+def read_cached_paths(output_directory):
+    connection = sqlite3.connect(str(output_directory / "stats_cache.sqlite"))
+    try:
+        return [row[0] for row in connection.execute("SELECT path FROM files ORDER BY id")]
+    finally:
+        connection.close()
+
+
+def test_repeated_run_reads_the_cache(run, write_file, output_directory, monkeypatch):
+    file_name = write_file("genome.fasta", FASTA)
+    assert run("content", file_name, "--annotate") == 0
+    first_output = (output_directory / "genome.fasta").read_bytes()
+    assert read_cached_paths(output_directory) == [file_name]
+
+    # a second run must not compute the statistics again
+    def fail(*arguments):
+        raise AssertionError("the statistics were computed again")
+
+    monkeypatch.setattr(Fasta.Sequence, "get_record_stats", fail)
+    assert run("content", file_name, "--annotate") == 0
+    assert (output_directory / "genome.fasta").read_bytes() == first_output
+
+
+def test_changed_file_is_read_again(sequence, write_file):
+    file_name = write_file("genome.fasta", FASTA)
+    cache = sequence.open_stats_cache()
+    cache.begin_file(file_name)
+    cache.add(dict.fromkeys(Fasta.StatsCache.columns, 0))
+    cache.commit_file()
+    assert cache.read(file_name) is not None
+
+    with open(file_name, "a") as file:
+        file.write(">three\nGGGG\n")
+    assert cache.read(file_name) is None
+
+
+def test_least_recently_used_file_is_evicted(tmp_path, write_file):
+    cache = Fasta.StatsCache(str(tmp_path / "cache.sqlite"), size_limit=1)
+    try:
+        file_names = [write_file("genome" + str(number) + ".fasta", FASTA) for number in range(3)]
+        for file_name in file_names:
+            cache.begin_file(file_name)
+            for _ in range(1000):
+                cache.add(dict.fromkeys(Fasta.StatsCache.columns, 0))
+            cache.commit_file()
+        # only the most recently used file is kept
+        assert cache.read(file_names[0]) is None
+        assert cache.read(file_names[1]) is None
+        assert list(cache.read(file_names[2]))
+    finally:
+        cache.close()
+
+
+def test_cache_is_closed_when_the_command_ends(run, write_file, monkeypatch):
+    closed = []
+    close = Fasta.StatsCache.close
+
+    def record_close(cache):
+        closed.append(cache)
+        close(cache)
+
+    monkeypatch.setattr(Fasta.StatsCache, "close", record_close)
+    file_name = write_file("genome.fasta", FASTA)
+    assert run("content", file_name, "--annotate") == 0
+    assert len(closed) == 1
+
+
+def test_cache_is_closed_when_the_command_fails(run, write_file, monkeypatch):
+    closed = []
+    close = Fasta.StatsCache.close
+
+    def record_close(cache):
+        closed.append(cache)
+        close(cache)
+
+    def fail(*arguments):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(Fasta.StatsCache, "close", record_close)
+    monkeypatch.setattr(Fasta.Sequence, "write_annotated_records", fail)
+    file_name = write_file("genome.fasta", FASTA)
+    with pytest.raises(OSError):
+        run("content", file_name, "--annotate")
+    assert len(closed) == 1
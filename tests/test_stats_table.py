@@ -0,0 +1,81 @@
+"""
+Tests of the per-record statistics tables, as tab separated files and as NumPy ".npz" archives.
+"""
+import io
+import os
+import ast
+import struct
+import zipfile
+
+import npz
+
+RECORDS = "ACGTNN\n>a\tx description\nGGCC\n>b y\nAAUU\n>c\nMKLWV\n>d\n"
+
+ROWS = [
+    ["", "6", "DNA", "1", "1", "1", "1", "0", "2", "0.3333", "0.3333"],
+    ["a", "4", "DNA", "0", "2", "2", "0", "0", "0", "1.0", "0.0"],
+    ["b", "4", "RNA", "2", "0", "0", "0", "2", "0", "0.0", "1.0"],
+    ["c", "5", "protein", "0", "0", "0", "0", "0", "0", "0.0", "0.0"],
+    ["d", "0", "DNA", "0", "0", "0", "0", "0", "0", "0", "0"],
+]
+
+
+def read_npy(data):
+    """ Reads a one-dimensional ".npy" array of little-endian numbers or bytes strings without NumPy."""
+
+    header_length = struct.unpack("<H", data[8:10])[0]
+    header = ast.literal_eval(data[10:10 + header_length].decode("latin1"))
+    values = data[10 + header_length:]
+    number_of_rows = header["shape"][0]
+    if header["descr"].startswith("|S"):
+        width = int(header["descr"][2:])
+        return [values[start:start + width].rstrip(b"\0") for start in range(0, width * number_of_rows, width)]
+    typecode = {"<u8": "Q", "<f8": "d"}[header["descr"]]
+    return list(struct.unpack("<" + str(number_of_rows) + typecode, values))
+
+
+def read_table(output_directory, name):
+    with open(os.path.join(output_directory, name)) as file:
+        return [line.rstrip("\n").split("\t") for line in file]
+
+
+def test_tsv_table(run, write_file, output_directory):
+    file_name = write_file("records.fasta", RECORDS)
+    for attempt in range(2):
+        # the second table is made from the statistics cache
+        assert run("lengths", file_name, "--table", "tsv") == 0
+        table = read_table(output_directory, "records.stats.tsv")
+        assert table[0] == ["ID", "length", "type", "A", "C", "G", "T", "U", "N", "GC", "AT"]
+        # the sequence before the first header has its own row, with an empty ID
+        assert table[1:] == ROWS
+
+
+def test_npz_table(run, write_file, output_directory):
+    file_name = write_file("records.fasta", RECORDS)
+    assert run("content", file_name, "--table", "tsv") == 0
+    table = read_table(output_directory, "records.stats.tsv")
+    assert run("content", file_name, "--table", "npz", "--compress") == 0
+
+    with zipfile.ZipFile(os.path.join(output_directory, "records.stats.npz")) as archive:
+        assert all(info.compress_type == zipfile.ZIP_DEFLATED for info in archive.infolist())
+        columns = {name[:-len(".npy")]: read_npy(archive.read(name)) for name in archive.namelist()}
+    assert columns["ID"] == [row[0].encode() for row in table[1:]]
+    assert columns["type"] == [row[2].encode() for row in table[1:]]
+    for column, name in enumerate(table[0][3:9], 3):
+        assert columns[name] == [int(row[column]) for row in table[1:]]
+    assert [round(value, 4) for value in columns["GC"]] == [float(row[9]) for row in table[1:]]
+
+
+def test_npz_writer_columns_larger_than_the_buffers(tmp_path):
+    rows = [[b"id" + str(number).encode(), number, number / 7] for number in range(150000)]
+    buffer = io.BytesIO()
+    writer = npz.NpzWriter(buffer, [("ID", "S"), ("number", "Q"), ("fraction", "d")], str(tmp_path))
+    for row in rows:
+        writer.add(row)
+    writer.close()
+    with zipfile.ZipFile(buffer) as archive:
+        assert read_npy(archive.read("ID.npy")) == [row[0] for row in rows]
+        assert read_npy(archive.read("number.npy")) == [row[1] for row in rows]
+        assert read_npy(archive.read("fraction.npy")) == [row[2] for row in rows]
+    # the temporary column files are removed
+    assert os.listdir(tmp_path) == []
@@ -0,0 +1,76 @@
+"""
+Tests of the GC content and GC skew of sliding windows, against a count of every window.
+"""
+import json
+import random
+import struct
+
+import pytest
+
+RECORDS = ">s1 d\nGGGGCCCCAT\nATNN\n>s2\nGC\n"
+
+
+def count_windows(sequence, window, step):
+    """ Counts the G and C bases of every window again, as the windows are defined."""
+
+    start = 0
+    while start < len(sequence):
+        end = min(start + window, len(sequence))
+        G_count = sequence.count(b"G", start, end)
+        C_count = sequence.count(b"C", start, end)
+        GC_skew = (G_count - C_count) / (G_count + C_count) if G_count + C_count else 0.0
+        yield start, end, (G_count + C_count) / (end - start), GC_skew
+        # the windows stop at the first one that reaches the end of the sequence
+        if start + window >= len(sequence):
+            break
+        start += step
+
+
+@pytest.mark.parametrize("window, step", [(1, 1), (5, 5), (7, 3), (10, 1), (3, 10), (100, 7), (1000, 1000)])
+def test_windows_from_cumulative_counts(sequence, window, step):
+    generator = random.Random(window * 1000 + step)
+    for length in [0, 1, 2, 9, 10, 11, 99, 100, 101, 517]:
+        bases = "".join(generator.choice("ACGTN") for _ in range(length)).encode()
+        windows = list(sequence.get_GC_windows(bases, window, step))
+        expected = list(count_windows(bases, window, step))
+        assert [window_range[:2] for window_range in windows] == [window_range[:2] for window_range in expected]
+        for (_, _, GC_content, GC_skew), (_, _, expected_content, expected_skew) in zip(windows, expected):
+            assert GC_content == pytest.approx(expected_content)
+            assert GC_skew == pytest.approx(expected_skew)
+
+
+def test_bed_windows(run, write_file, output_directory):
+    file_name = write_file("genome.fasta", RECORDS)
+    assert run("windows", file_name, "--window", "4", "--step", "2") == 0
+    assert (output_directory / "genome.fasta.gc_windows.bed").read_text() == (
+        "s1\t0\t4\t1.0\t1.0\n"
+        "s1\t2\t6\t1.0\t0.0\n"
+        "s1\t4\t8\t1.0\t-1.0\n"
+        "s1\t6\t10\t0.5\t-1.0\n"
+        "s1\t8\t12\t0.0\t0.0\n"
+        "s1\t10\t14\t0.0\t0.0\n"
+        "s2\t0\t2\t1.0\t0.0\n")
+
+
+def test_binary_windows(run, write_file, output_directory):
+    file_name = write_file("genome.fasta", RECORDS)
+    assert run("windows", file_name, "--window", "4", "--step", "2", "--format", "binary") == 0
+    data = (output_directory / "genome.fasta.gc_windows.bin").read_bytes()
+    assert struct.unpack("<14f", data) == (1.0, 1.0, 1.0, 0.0, 1.0, -1.0, 0.5, -1.0, 0.0, 0.0, 0.0, 0.0, 1.0, 0.0)
+    description = json.loads((output_directory / "genome.fasta.gc_windows.bin.json").read_text())
+    assert description["windows"] == 7
+    assert [(record["name"], record["first_window"], record["windows"]) for record in description["records"]] == [
+        ("s1", 0, 6), ("s2", 6, 1)]
+
+
+def test_invalid_window_fails(run, write_file, capsys):
+    file_name = write_file("genome.fasta", RECORDS)
+    assert run("windows", file_name, "--window", "0") == 1
+    assert capsys.readouterr().err.startswith("Window Error: ")
+
+
+def test_protein_has_no_windows(run, write_file, output_directory, capsys):
+    file_name = write_file("genome.fasta", ">p\nMVLSPADKTNVKAAWGKVGAHAGEYGAEALERMFLSFPTTKTYFPHF\n")
+    assert run("windows", file_name) == 1
+    assert capsys.readouterr().err.startswith("Sequence Type Error: ")
+    assert not list(output_directory.iterdir())
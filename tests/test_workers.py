@@ -0,0 +1,39 @@
+"""
+Tests of the per-record statistics on a process pool: the outputs are the same as with one worker.
+"""
+import random
+
+import pytest
+
+
+def make_records(number_of_records, seed=1):
+    generator = random.Random(seed)
+    lines = []
+    for number in range(number_of_records):
+        sequence = "".join(generator.choice("ACGTN") for _ in range(generator.randrange(300)))
+        lines.append(">r" + str(number) + " record " + str(number) + "\n")
+        lines.extend(sequence[start:start + 60] + "\n" for start in range(0, len(sequence), 60))
+    return "".join(lines)
+
+
+@pytest.mark.parametrize("command", [["lengths"],
+                                     ["content", "--annotate"],
+                                     ["content", "--annotate", "--content-type", "AT"]])
+def test_workers_write_the_same_output(run, write_file, output_directory, command):
+    file_name = write_file("genome.fasta", make_records(200))
+    assert run(*command, file_name, "--workers", "1", "--no-cache") == 0
+    serial_output = (output_directory / "genome.fasta").read_bytes()
+    (output_directory / "genome.fasta").unlink()
+
+    assert run(*command, file_name, "--workers", "4", "--no-cache") == 0
+    assert (output_directory / "genome.fasta").read_bytes() == serial_output
+    assert serial_output.count(b">") == 200
+
+
+def test_protein_record_fails_on_the_workers(run, write_file, output_directory, capsys):
+    protein = "MVLSPADKTNVKAAWGKVGAHAGEYGAEALERMFLSFPTTKTYFPHF"
+    file_name = write_file("genome.fasta", (">n\nACGT\n>p\n" + protein + "\n") * 30)
+    assert run("content", file_name, "--annotate", "--workers", "4", "--no-cache") == 1
+    assert "Sequence Type Error" in capsys.readouterr().err
+    # the partial output is removed
+    assert not (output_directory / "genome.fasta").exists()